@@ -33,7 +33,7 @@ from .config import (
 from .utils import (
     extract_json_array, copy_db, cleanup_db,
     slack_ts_to_iso, is_night_hours, extract_domain,
-    score_result, format_time_ago,
+    score_result, score_results, max_score, format_time_ago,
 )
 
 # Cache exports
@@ -41,16 +41,20 @@ from .cache import (
     load_custom_prompts, save_custom_prompts,
     get_prompt, set_custom_prompt, reset_prompt, get_all_prompts,
     save_prep_cache_to_disk, load_prep_cache_from_disk,
-    get_meeting_cache, set_meeting_cache,
-    is_cache_valid, has_cached_data, get_cached_data,
+    get_meeting_cache, set_meeting_cache, set_meeting_cache_batch,
+    is_cache_valid, has_cached_data, get_cached_data, get_cache_state,
     cleanup_old_caches, get_all_cached_meetings, clear_meeting_cache,
+    record_source_hit, get_source_hit_count,
+    load_source_hit_counts, save_source_hit_counts,
     _meeting_prep_cache, _meeting_prep_cache_lock,
-    _calendar_cache, _hub_cache,
+    calendar_cache_ttl,
+    _calendar_cache, _calendar_refresh_lock, _hub_cache,
 )
 
 # Slack exports
 from .slack import (
-    get_slack_tokens, reset_slack_tokens, slack_api_call,
+    get_slack_tokens, reset_slack_tokens, reset_slack_counts,
+    slack_api_call, get_slack_self_user_id,
     slack_get_users, slack_get_unread_counts, slack_ts_to_iso,
     slack_get_conversations_fast, slack_get_conversations_with_unread,
     slack_get_conversation_history_direct,
@@ -74,6 +78,7 @@ from .atlassian import (
 # Google exports
 from .google_services import (
     authenticate_google, get_google_credentials,
+    load_google_token, save_google_token, calendar_service,
     get_calendar_events_standalone, get_meeting_by_id, get_meeting_info,
     search_google_drive,
     get_oauth_url, handle_oauth_callback,
@@ -6,8 +6,9 @@ import time
 import threading
 
 from .config import (
-    logger, PREP_CACHE_FILE, PROMPTS_FILE,
-    PREP_CACHE_TTL, SUMMARY_CACHE_TTL, DEFAULT_PROMPTS
+    logger, PREP_CACHE_FILE, PROMPTS_FILE, SOURCE_HITS_FILE,
+    PREP_CACHE_TTL, SUMMARY_CACHE_TTL, DEFAULT_PROMPTS,
+    CACHE_TTL, CALENDAR_CACHE_MIN_TTL, CALENDAR_CACHE_MAX_TTL,
 )
 
 # =============================================================================
@@ -18,12 +19,17 @@ from .config import (
 _meeting_prep_cache = {}
 _meeting_prep_cache_lock = threading.Lock()
 
+# How often each prep source has been served to the client: {source: count}
+_source_hit_counts = {}
+_source_hit_counts_lock = threading.Lock()
+
 # Custom prompts cache
 _custom_prompts = {}
 _custom_prompts_lock = threading.Lock()
 
 # Calendar cache
 _calendar_cache = {"data": None, "timestamp": 0}
+_calendar_refresh_lock = threading.Lock()  # Single-flight guard for calendar refreshes
 
 # Hub cache
 _hub_cache = {
@@ -140,19 +146,24 @@ def load_prep_cache_from_disk():
         logger.error(f"Error loading prep cache: {e}")
 
 
+def _new_meeting_entry():
+    """Create an empty cache entry for a meeting."""
+    return {
+        'jira': {'data': None, 'timestamp': 0},
+        'confluence': {'data': None, 'timestamp': 0},
+        'slack': {'data': None, 'timestamp': 0},
+        'gmail': {'data': None, 'timestamp': 0},
+        'drive': {'data': None, 'timestamp': 0},
+        'summary': {'data': None, 'timestamp': 0},
+        'meeting_info': None
+    }
+
+
 def get_meeting_cache(meeting_id):
     """Get or create cache entry for a meeting."""
     with _meeting_prep_cache_lock:
         if meeting_id not in _meeting_prep_cache:
-            _meeting_prep_cache[meeting_id] = {
-                'jira': {'data': None, 'timestamp': 0},
-                'confluence': {'data': None, 'timestamp': 0},
-                'slack': {'data': None, 'timestamp': 0},
-                'gmail': {'data': None, 'timestamp': 0},
-                'drive': {'data': None, 'timestamp': 0},
-                'summary': {'data': None, 'timestamp': 0},
-                'meeting_info': None
-            }
+            _meeting_prep_cache[meeting_id] = _new_meeting_entry()
         return _meeting_prep_cache[meeting_id]
 
 
@@ -160,15 +171,7 @@ def set_meeting_cache(meeting_id, source, data):
     """Set cache data for a meeting source."""
     with _meeting_prep_cache_lock:
         if meeting_id not in _meeting_prep_cache:
-            _meeting_prep_cache[meeting_id] = {
-                'jira': {'data': None, 'timestamp': 0},
-                'confluence': {'data': None, 'timestamp': 0},
-                'slack': {'data': None, 'timestamp': 0},
-                'gmail': {'data': None, 'timestamp': 0},
-                'drive': {'data': None, 'timestamp': 0},
-                'summary': {'data': None, 'timestamp': 0},
-                'meeting_info': None
-            }
+            _meeting_prep_cache[meeting_id] = _new_meeting_entry()
         _meeting_prep_cache[meeting_id][source] = {
             'data': data,
             'timestamp': time.time()
@@ -177,6 +180,25 @@ def set_meeting_cache(meeting_id, source, data):
     save_prep_cache_to_disk()
 
 
+def set_meeting_cache_batch(meeting_id, batch):
+    """Set cache data for several sources of a meeting with a single disk write.
+    
+    Args:
+        meeting_id: Meeting ID
+        batch: Dict of {source: data}
+    """
+    now = time.time()
+    with _meeting_prep_cache_lock:
+        if meeting_id not in _meeting_prep_cache:
+            _meeting_prep_cache[meeting_id] = _new_meeting_entry()
+        for source, data in batch.items():
+            _meeting_prep_cache[meeting_id][source] = {
+                'data': data,
+                'timestamp': now
+            }
+    save_prep_cache_to_disk()
+
+
 def is_cache_valid(meeting_id, source):
     """Check if cache for a meeting/source is still valid (within TTL)."""
     with _meeting_prep_cache_lock:
@@ -189,6 +211,29 @@ def is_cache_valid(meeting_id, source):
         return (time.time() - cache.get('timestamp', 0)) < ttl
 
 
+def get_cache_state(meeting_id, sources):
+    """Check TTL validity and presence of cached data for several sources at once.
+    
+    Args:
+        meeting_id: Meeting ID
+        sources: Iterable of source names
+        
+    Returns:
+        tuple: ({source: valid within TTL}, {source: has any cached data})
+    """
+    now = time.time()
+    valid = {}
+    present = {}
+    with _meeting_prep_cache_lock:
+        entry = _meeting_prep_cache.get(meeting_id) or {}
+        for source in sources:
+            cache = entry.get(source) or {}
+            present[source] = cache.get('data') is not None
+            ttl = SUMMARY_CACHE_TTL if source == 'summary' else PREP_CACHE_TTL
+            valid[source] = present[source] and (now - cache.get('timestamp', 0)) < ttl
+    return valid, present
+
+
 def has_cached_data(meeting_id, source):
     """Check if there's any cached data (regardless of TTL)."""
     with _meeting_prep_cache_lock:
@@ -207,19 +252,48 @@ def get_cached_data(meeting_id, source):
         return cache.get('data')
 
 
+def record_source_hit(source):
+    """Count a source's prep data being served to the client (used to order prefetch work)."""
+    with _source_hit_counts_lock:
+        _source_hit_counts[source] = _source_hit_counts.get(source, 0) + 1
+
+
+def get_source_hit_count(source):
+    """Get how many times a source's prep data has been served to the client."""
+    with _source_hit_counts_lock:
+        return _source_hit_counts.get(source, 0)
+
+
+def load_source_hit_counts():
+    """Load source hit counts from disk."""
+    global _source_hit_counts
+    try:
+        if os.path.exists(SOURCE_HITS_FILE):
+            with open(SOURCE_HITS_FILE, 'r') as f:
+                loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    with _source_hit_counts_lock:
+                        _source_hit_counts = loaded
+    except Exception as e:
+        logger.error(f"Error loading source hit counts: {e}")
+
+
+def save_source_hit_counts():
+    """Save source hit counts to disk."""
+    try:
+        with _source_hit_counts_lock:
+            counts = dict(_source_hit_counts)
+        with open(SOURCE_HITS_FILE, 'w') as f:
+            json.dump(counts, f, indent=2)
+    except Exception as e:
+        logger.error(f"Error saving source hit counts: {e}")
+
+
 def set_meeting_info(meeting_id, title, attendees, attendee_emails, description):
     """Store meeting metadata for future refreshes."""
     with _meeting_prep_cache_lock:
         if meeting_id not in _meeting_prep_cache:
-            _meeting_prep_cache[meeting_id] = {
-                'jira': {'data': None, 'timestamp': 0},
-                'confluence': {'data': None, 'timestamp': 0},
-                'slack': {'data': None, 'timestamp': 0},
-                'gmail': {'data': None, 'timestamp': 0},
-                'drive': {'data': None, 'timestamp': 0},
-                'summary': {'data': None, 'timestamp': 0},
-                'meeting_info': None
-            }
+            _meeting_prep_cache[meeting_id] = _new_meeting_entry()
         _meeting_prep_cache[meeting_id]['meeting_info'] = {
             'title': title,
             'attendees': attendees,
@@ -283,6 +357,31 @@ def clear_meeting_cache(meeting_id):
             del _meeting_prep_cache[meeting_id]
     save_prep_cache_to_disk()
 
+# =============================================================================
+# Calendar Cache
+# =============================================================================
+
+def calendar_cache_ttl(events):
+    """Pick how long a calendar response stays fresh, based on the next meeting.
+    
+    Roughly ten seconds per minute until the next meeting starts, so polling
+    backs off when the day is quiet and tightens as a meeting approaches.
+    While a meeting is in progress the TTL never exceeds CACHE_TTL, so the
+    hub stops showing it as current soon after it ends.
+    """
+    if events.get("error"):
+        return CACHE_TTL
+    calendar_events = events.get("events", [])
+    upcoming = [e['minutes_until'] for e in calendar_events if e.get('minutes_until', 0) > 0]
+    if upcoming:
+        ttl = max(CALENDAR_CACHE_MIN_TTL, min(CALENDAR_CACHE_MAX_TTL, min(upcoming) * 10))
+    else:
+        ttl = CALENDAR_CACHE_MAX_TTL
+    if events.get("in_meeting") or any(e.get('is_current') for e in calendar_events):
+        ttl = min(ttl, CACHE_TTL)
+    return ttl
+
+
 # =============================================================================
 # Initialize
 # =============================================================================
@@ -290,3 +389,4 @@ def clear_meeting_cache(meeting_id):
 # Load caches on module import
 load_custom_prompts()
 load_prep_cache_from_disk()
+load_source_hit_counts()
@@ -4,6 +4,7 @@ import os
 import sys
 import glob
 import logging
+import threading
 
 # =============================================================================
 # Logging Setup
@@ -31,6 +32,8 @@ MCP_CONFIG_PATH = os.path.expanduser("~/.devsai/mcp.json")
 CACHE_DIR = CONFIG_DIR
 PREP_CACHE_FILE = os.path.join(CACHE_DIR, "prep_cache.json")
 PROMPTS_FILE = os.path.join(CACHE_DIR, "custom_prompts.json")
+SOURCE_HITS_FILE = os.path.join(CACHE_DIR, "source_hits.json")
+SLACK_USERS_FILE = os.path.join(CACHE_DIR, "slack_users.json")
 USER_CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
 
 # Load user configuration
@@ -47,6 +50,30 @@ def load_user_config():
 
 USER_CONFIG = load_user_config()
 
+_user_config_lock = threading.Lock()
+
+
+def update_user_config(updates):
+    """Merge updates into config.json and write it atomically.
+    
+    The file is re-read under a lock so concurrent writers (and edits made
+    since startup) are not lost, and written to a temp file that replaces
+    config.json so a crash can't leave it truncated. Raises on write errors.
+    
+    Returns:
+        The config dict as written
+    """
+    import json
+    with _user_config_lock:
+        config = load_user_config()
+        config.update(updates)
+        tmp_path = USER_CONFIG_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_path, USER_CONFIG_FILE)
+        USER_CONFIG.update(updates)
+        return config
+
 # =============================================================================
 # Hub Model Configuration
 # =============================================================================
@@ -59,15 +86,12 @@ def get_hub_model():
 
 def set_hub_model(model):
     """Set the AI model for hub operations and persist to config."""
-    global _hub_model, USER_CONFIG
-    import json
+    global _hub_model
     
     _hub_model = model
-    USER_CONFIG['hubModel'] = model
     
     try:
-        with open(USER_CONFIG_FILE, 'w') as f:
-            json.dump(USER_CONFIG, f, indent=2)
+        update_user_config({'hubModel': model})
     except Exception as e:
         logger.error(f"Failed to save hub model config: {e}")
 
@@ -162,10 +186,17 @@ except ImportError:
 # =============================================================================
 
 CACHE_TTL = 30  # Calendar cache TTL in seconds
+CALENDAR_CACHE_MIN_TTL = 5  # Calendar cache TTL floor when a meeting is about to start
+CALENDAR_CACHE_MAX_TTL = 120  # Calendar cache TTL ceiling when no meeting is close
 HUB_CACHE_TTL = 60  # Hub data cache TTL in seconds
 PREP_CACHE_TTL = 1800  # Meeting prep cache TTL (30 minutes)
 SUMMARY_CACHE_TTL = 2700  # AI summary cache TTL (45 minutes)
 SLACK_USERS_CACHE_TTL = 300  # Slack users cache TTL (5 minutes)
+SLACK_USERS_DISK_TTL = 86400  # Max age of the on-disk Slack users copy used at startup (24 hours)
+SLACK_COUNTS_CACHE_TTL = 5  # Slack client.counts cache TTL in seconds
+SLACK_CONV_INFO_CACHE_TTL = 900  # Slack conversations.info cache TTL (15 minutes)
+SLACK_THREAD_REPLIES_CACHE_TTL = 30  # Slack thread replies cache TTL in seconds
+AUTH_STATUS_CACHE_TTL = 30  # Service auth status cache TTL in seconds
 PREFETCH_INTERVAL = 600  # Prefetch loop interval (10 minutes)
 MAX_ACTIVITY_LOG = 50  # Max prefetch activity log entries
 
@@ -1,8 +1,12 @@
 """Google Calendar and Google Drive integration for BriefDesk."""
 
 import os
+import json
 import pickle
 import glob
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 from .config import (
@@ -12,6 +16,17 @@ from .config import (
     get_oauth_credentials_config, GOOGLE_CLIENT_ID
 )
 
+# Last loaded token and the TOKEN_PATH mtime it was read at
+_token_cache = {'mtime': None, 'creds': None}
+_token_cache_lock = threading.Lock()
+
+# Idle Calendar API services as (creds, service). Each service keeps its own
+# keep-alive HTTPS connections, which are not thread-safe, so a service is
+# handed to one caller at a time and returned here afterwards.
+_calendar_service_pool = []
+_calendar_service_pool_lock = threading.Lock()
+CALENDAR_SERVICE_POOL_SIZE = 4
+
 # =============================================================================
 # Authentication
 # =============================================================================
@@ -42,8 +57,7 @@ def authenticate_google():
 
     creds = flow.run_local_server(port=0)
 
-    with open(TOKEN_PATH, 'wb') as token:
-        pickle.dump(creds, token)
+    save_google_token(creds)
 
     print("Success! Token saved.")
     return True
@@ -100,8 +114,7 @@ def handle_oauth_callback(code, redirect_uri='http://localhost:18765/oauth/callb
         flow.fetch_token(code=code)
         creds = flow.credentials
 
-        with open(TOKEN_PATH, 'wb') as token:
-            pickle.dump(creds, token)
+        save_google_token(creds)
 
         # Export credentials for Gmail and GDrive MCPs to share authentication
         _export_credentials_for_gmail_mcp(creds)
@@ -226,6 +239,82 @@ def _export_credentials_for_gdrive_mcp(creds):
         logger.warning(f"Failed to export credentials for GDrive MCP: {e}")
 
 
+def save_google_token(creds):
+    """Write creds to TOKEN_PATH as authorized-user JSON.
+    
+    Written to a temp file that replaces the token, so a concurrent
+    load_google_token() never reads a half-written file.
+    """
+    tmp_path = TOKEN_PATH + '.tmp'
+    with open(tmp_path, 'w') as token:
+        token.write(creds.to_json())
+    os.replace(tmp_path, TOKEN_PATH)
+
+
+def _read_google_token():
+    """Read the credentials in TOKEN_PATH, migrating a pickled token to JSON."""
+    with open(TOKEN_PATH, 'rb') as token:
+        data = token.read()
+    if data.lstrip().startswith(b'{'):
+        return Credentials.from_authorized_user_info(json.loads(data))
+    
+    # Tokens saved by older versions are pickled Credentials
+    creds = pickle.loads(data)
+    try:
+        save_google_token(creds)
+        logger.info("Migrated pickled Google token to JSON")
+    except Exception as e:
+        logger.warning(f"Failed to migrate pickled Google token: {e}")
+    return creds
+
+
+def load_google_token():
+    """Load the Google credentials from TOKEN_PATH.
+    
+    The parsed credentials are reused until the file's mtime changes, so
+    polling endpoints don't re-read and parse the token on every request.
+    Raises whatever reading or parsing raises for a missing or corrupt file.
+    """
+    global _token_cache
+    try:
+        mtime = os.path.getmtime(TOKEN_PATH)
+    except OSError:
+        mtime = None
+    
+    with _token_cache_lock:
+        cache = _token_cache
+        if mtime is not None and cache['mtime'] == mtime:
+            return cache['creds']
+        
+        creds = _read_google_token()
+        if mtime is not None:
+            _token_cache = {'mtime': mtime, 'creds': creds}
+        return creds
+
+
+@contextmanager
+def calendar_service(creds):
+    """Borrow a Calendar API service for creds, building one if none is idle.
+    
+    Reusing services reuses their open TLS connections instead of
+    handshaking with Google on every calendar request. Idle services built
+    for other (older) credentials are dropped.
+    """
+    service = None
+    with _calendar_service_pool_lock:
+        _calendar_service_pool[:] = [entry for entry in _calendar_service_pool if entry[0] is creds]
+        if _calendar_service_pool:
+            service = _calendar_service_pool.pop()[1]
+    if service is None:
+        service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+    try:
+        yield service
+    finally:
+        with _calendar_service_pool_lock:
+            if len(_calendar_service_pool) < CALENDAR_SERVICE_POOL_SIZE:
+                _calendar_service_pool.append((creds, service))
+
+
 def get_google_credentials():
     """Get valid Google credentials, refreshing if needed."""
     if not GOOGLE_API_AVAILABLE:
@@ -235,14 +324,12 @@ def get_google_credentials():
         return None
 
     try:
-        with open(TOKEN_PATH, 'rb') as token:
-            creds = pickle.load(token)
+        creds = load_google_token()
 
         if creds and creds.expired and creds.refresh_token:
             try:
                 creds.refresh(Request())
-                with open(TOKEN_PATH, 'wb') as token:
-                    pickle.dump(creds, token)
+                save_google_token(creds)
             except Exception as e:
                 logger.error(f"Error refreshing credentials: {e}")
                 return None
@@ -316,6 +403,24 @@ def disconnect_google():
 # Calendar
 # =============================================================================
 
+# Partial-response projection: only the event fields BriefDesk reads
+CALENDAR_EVENT_FIELDS = (
+    'id,summary,start,end,hangoutLink,htmlLink,location,description,'
+    'attendees(displayName,email)'
+)
+
+_ZOOM_LINK_RE = re.compile(r'https://[^\s]*zoom\.us/[^\s<>"\']+')
+_TEAMS_LINK_RE = re.compile(r'https://teams\.microsoft\.com/[^\s<>"\']+')
+
+def _format_attendees(event, limit=10):
+    """Build the attendee list (name falls back to email) for an event."""
+    attendees = []
+    for a in event.get('attendees', ())[:limit]:
+        email = a.get('email', '')
+        attendees.append({'name': a.get('displayName', email), 'email': email})
+    return attendees
+
+
 def get_calendar_events_standalone(minutes_ahead=120, limit=5):
     """Get upcoming calendar events."""
     if not GOOGLE_API_AVAILABLE:
@@ -326,20 +431,20 @@ def get_calendar_events_standalone(minutes_ahead=120, limit=5):
         return []
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        
         now = datetime.utcnow()
         time_min = now.isoformat() + 'Z'
         time_max = (now + timedelta(minutes=minutes_ahead)).isoformat() + 'Z'
         
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=time_min,
-            timeMax=time_max,
-            maxResults=limit,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        with calendar_service(creds) as service:
+            events_result = service.events().list(
+                calendarId='primary',
+                timeMin=time_min,
+                timeMax=time_max,
+                maxResults=limit,
+                singleEvents=True,
+                orderBy='startTime',
+                fields=f'items({CALENDAR_EVENT_FIELDS})'
+            ).execute()
         
         events = []
         for event in events_result.get('items', []):
@@ -364,15 +469,14 @@ def get_calendar_events_standalone(minutes_ahead=120, limit=5):
                 # Check for Zoom/Teams in description or location
                 for field in ['description', 'location']:
                     text = event.get(field, '')
-                    if 'zoom.us' in text.lower():
-                        import re
-                        match = re.search(r'https://[^\s]*zoom\.us/[^\s<>"\']+', text)
+                    text_lower = text.lower()
+                    if 'zoom.us' in text_lower:
+                        match = _ZOOM_LINK_RE.search(text)
                         if match:
                             join_link = match.group(0)
                             break
-                    elif 'teams.microsoft.com' in text.lower():
-                        import re
-                        match = re.search(r'https://teams\.microsoft\.com/[^\s<>"\']+', text)
+                    elif 'teams.microsoft.com' in text_lower:
+                        match = _TEAMS_LINK_RE.search(text)
                         if match:
                             join_link = match.group(0)
                             break
@@ -387,11 +491,8 @@ def get_calendar_events_standalone(minutes_ahead=120, limit=5):
                 'end': end.get('dateTime', ''),
                 'join_link': join_link,
                 'location': event.get('location', ''),
-                'description': event.get('description', '')[:500] if event.get('description') else '',
-                'attendees': [
-                    {'name': a.get('displayName', a.get('email', '')), 'email': a.get('email', '')}
-                    for a in event.get('attendees', [])[:10]
-                ]
+                'description': (event.get('description') or '')[:500],
+                'attendees': _format_attendees(event)
             })
         
         return events
@@ -411,8 +512,12 @@ def get_meeting_by_id(event_id):
         return None
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        event = service.events().get(calendarId='primary', eventId=event_id).execute()
+        with calendar_service(creds) as service:
+            event = service.events().get(
+                calendarId='primary',
+                eventId=event_id,
+                fields=CALENDAR_EVENT_FIELDS
+            ).execute()
         
         start = event.get('start', {})
         end = event.get('end', {})
@@ -424,11 +529,8 @@ def get_meeting_by_id(event_id):
             'end': end.get('dateTime', end.get('date', '')),
             'join_link': event.get('hangoutLink', event.get('htmlLink', '')),
             'location': event.get('location', ''),
-            'description': event.get('description', '')[:500] if event.get('description') else '',
-            'attendees': [
-                {'name': a.get('displayName', a.get('email', '')), 'email': a.get('email', '')}
-                for a in event.get('attendees', [])[:10]
-            ]
+            'description': (event.get('description') or '')[:500],
+            'attendees': _format_attendees(event)
         }
     
     except Exception as e:
@@ -471,53 +573,52 @@ def search_google_drive(query, max_results=5):
     if not words:
         return []
     
+    # One case-insensitive alternation matches any word in a single C-level pass
+    words_re = re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
+    
     results = []
     seen_paths = set()
     
     try:
         for drive_path in GOOGLE_DRIVE_PATHS:
-            if not os.path.exists(drive_path):
-                continue
-            
-            # Walk through the directory
+            # os.walk yields nothing for a missing root (errors go to onerror),
+            # so no separate exists() stat is needed per drive
             for root, dirs, files in os.walk(drive_path):
                 # Skip hidden directories
                 dirs[:] = [d for d in dirs if not d.startswith('.')]
                 
-                for filename in files:
+                # Filter the whole directory listing against the query at once
+                for filename in filter(words_re.search, files):
                     # Skip hidden files
                     if filename.startswith('.'):
                         continue
                     
-                    # Check if any word matches the filename
-                    filename_lower = filename.lower()
-                    if any(word in filename_lower for word in words):
-                        full_path = os.path.join(root, filename)
-                        
-                        if full_path in seen_paths:
-                            continue
-                        seen_paths.add(full_path)
-                        
-                        try:
-                            stat = os.stat(full_path)
-                            modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        except:
-                            modified = ''
-                        
-                        # Determine if it's from shared drives
-                        is_shared = 'Shared drives' in full_path or 'SharedDrives' in full_path
-                        
-                        results.append({
-                            'title': filename,
-                            'path': full_path,
-                            'url': f'file://{full_path}',
-                            'modified': modified,
-                            'type': 'drive',
-                            'is_shared': is_shared
-                        })
-                        
-                        if len(results) >= max_results:
-                            return results
+                    full_path = os.path.join(root, filename)
+                    
+                    if full_path in seen_paths:
+                        continue
+                    seen_paths.add(full_path)
+                    
+                    try:
+                        stat = os.stat(full_path)
+                        modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    except:
+                        modified = ''
+                    
+                    # Determine if it's from shared drives
+                    is_shared = 'Shared drives' in full_path or 'SharedDrives' in full_path
+                    
+                    results.append({
+                        'title': filename,
+                        'path': full_path,
+                        'url': f'file://{full_path}',
+                        'modified': modified,
+                        'type': 'drive',
+                        'is_shared': is_shared
+                    })
+                    
+                    if len(results) >= max_results:
+                        return results
     
     except Exception as e:
         logger.error(f"Error searching Google Drive: {e}")
@@ -1,9 +1,19 @@
 """Browser history and bookmarks search for Safari, Chrome, Helium, and Dia."""
 
+import atexit
+import heapq
 import json
 import os
 import plistlib
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import (
     logger,
@@ -16,167 +26,475 @@ from .config import (
     DIA_HISTORY,
     DIA_BOOKMARKS,
 )
-from .utils import copy_db, cleanup_db, extract_domain, score_result
+from .utils import copy_db, cleanup_db, extract_domain, max_score, score_results
 
 
 # =============================================================================
 # Bookmark Search Functions
 # =============================================================================
 
-def search_chrome_bookmarks(query):
-    """Search Chrome bookmarks for matching entries."""
-    results = []
-    if not os.path.exists(CHROME_BOOKMARKS):
-        return results
-    
-    try:
-        with open(CHROME_BOOKMARKS, "r") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logger.error(f"Error reading Chrome bookmarks: {e}")
-        return results
-    
-    query_words = query.split()
+def _walk_dict_tree(root):
+    """
+    Iterate over every dict nested in a parsed JSON/plist tree.
     
-    def traverse(node):
+    Uses an explicit stack instead of recursion and yields dicts in the
+    same depth-first order a recursive traversal would.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
         if isinstance(node, dict):
-            if node.get("type") == "url":
-                title = node.get("name", "")
-                url = node.get("url", "")
-                title_lower = title.lower()
-                url_lower = url.lower()
-                domain = extract_domain(url)
-                
-                if (query in title_lower or 
-                    query in url_lower or 
-                    query in domain or
-                    any(w in title_lower for w in query_words)):
-                    results.append({"title": title, "url": url, "type": "bookmark"})
-            for v in node.values():
-                traverse(v)
+            yield node
+            stack.extend(reversed(list(node.values())))
         elif isinstance(node, list):
-            for item in node:
-                traverse(item)
+            stack.extend(reversed(node))
+
+
+def _load_json_file(path):
+    """Parse a JSON file, using orjson when it is installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Parsed bookmark entries per file:
+# {path: ((mtime_ns, size), [(title, url, title_lower, url_lower, domain), ...])}
+_bookmark_index = {}
+
+
+def _get_bookmark_entries(bookmarks_path, parse_entries):
+    """
+    Get the (title, url, title_lower, url_lower, domain) entries of a bookmarks file.
     
-    traverse(data)
-    return results
+    Entries are parsed once and kept in memory until the file's mtime or
+    size changes, so keystroke-driven searches skip reading and walking
+    the bookmark tree. Titles and URLs are lowercased here, once per file
+    change, rather than on every search.
+    
+    Returns:
+        List of entries, or None if the file does not exist. Parse errors
+        from parse_entries propagate to the caller.
+    """
+    try:
+        st = os.stat(bookmarks_path)
+    except OSError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+    
+    cached = _bookmark_index.get(bookmarks_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    entries = [
+        (title, url, title.lower(), url.lower(), extract_domain(url))
+        for title, url in parse_entries(bookmarks_path)
+    ]
+    _bookmark_index[bookmarks_path] = (signature, entries)
+    return entries
 
 
-def search_helium_bookmarks(query):
-    """Search Helium bookmarks for matching entries."""
-    results = []
-    if not os.path.exists(HELIUM_BOOKMARKS):
-        return results
+def _match_bookmark_entries(entries, query):
+    """
+    Return bookmark results for the entries that match the query.
     
+    Titles match on the full query or any query word; URLs and domains
+    match on the full query only. Matching is case-insensitive.
+    """
+    query_lower = query.lower()
+    title_terms = [query_lower] + query_lower.split()
+    results = []
+    for title, url, title_lower, url_lower, domain in entries:
+        matched = query_lower in url_lower or query_lower in domain
+        if not matched:
+            for term in title_terms:
+                if term in title_lower:
+                    matched = True
+                    break
+        if matched:
+            results.append({"title": title, "url": url, "type": "bookmark"})
+    return results
+
+
+def _parse_chromium_bookmarks(bookmarks_path):
+    """Yield (title, url) for every bookmark in a Chromium Bookmarks file."""
+    for node in _walk_dict_tree(_load_json_file(bookmarks_path)):
+        if node.get("type") == "url":
+            yield node.get("name", ""), node.get("url", "")
+
+
+def _parse_safari_bookmarks(bookmarks_path):
+    """Yield (title, url) for every bookmark in Safari's Bookmarks.plist."""
+    with open(bookmarks_path, "rb") as f:
+        plist = plistlib.load(f)
+    for node in _walk_dict_tree(plist):
+        if node.get("URLString"):
+            title = node.get("URIDictionary", {}).get("title", "") or node.get("Title", "")
+            yield title, node.get("URLString", "")
+
+
+def _search_chromium_bookmarks(bookmarks_path, query, browser_name="Chrome"):
+    """
+    Generic Chromium-based bookmark search (Chrome, Helium, Dia).
+    These browsers share the same JSON Bookmarks file format.
+    """
     try:
-        with open(HELIUM_BOOKMARKS, "r") as f:
-            data = json.load(f)
+        entries = _get_bookmark_entries(bookmarks_path, _parse_chromium_bookmarks)
     except (json.JSONDecodeError, IOError) as e:
-        logger.error(f"Error reading Helium bookmarks: {e}")
-        return results
-    
-    query_words = query.split()
-    
-    def traverse(node):
-        if isinstance(node, dict):
-            if node.get("type") == "url":
-                title = node.get("name", "")
-                url = node.get("url", "")
-                title_lower = title.lower()
-                url_lower = url.lower()
-                domain = extract_domain(url)
-                
-                if (query in title_lower or 
-                    query in url_lower or 
-                    query in domain or
-                    any(w in title_lower for w in query_words)):
-                    results.append({"title": title, "url": url, "type": "bookmark"})
-            for v in node.values():
-                traverse(v)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item)
+        logger.error(f"Error reading {browser_name} bookmarks: {e}")
+        return []
     
-    traverse(data)
-    return results
+    if entries is None:
+        return []
+    return _match_bookmark_entries(entries, query)
+
+
+def search_chrome_bookmarks(query):
+    """Search Chrome bookmarks for matching entries."""
+    return _search_chromium_bookmarks(CHROME_BOOKMARKS, query, "Chrome")
+
+
+def search_helium_bookmarks(query):
+    """Search Helium bookmarks for matching entries."""
+    return _search_chromium_bookmarks(HELIUM_BOOKMARKS, query, "Helium")
 
 
 def search_dia_bookmarks(query):
     """Search Dia bookmarks for matching entries."""
-    results = []
-    if not os.path.exists(DIA_BOOKMARKS):
-        return results
-    
+    return _search_chromium_bookmarks(DIA_BOOKMARKS, query, "Dia")
+
+
+def search_safari_bookmarks(query):
+    """Search Safari bookmarks (plist format) for matching entries."""
     try:
-        with open(DIA_BOOKMARKS, "r") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logger.error(f"Error reading Dia bookmarks: {e}")
-        return results
+        entries = _get_bookmark_entries(SAFARI_BOOKMARKS, _parse_safari_bookmarks)
+    except (plistlib.InvalidFileException, IOError) as e:
+        logger.error(f"Error reading Safari bookmarks: {e}")
+        return []
     
-    query_words = query.split()
+    if entries is None:
+        return []
+    return _match_bookmark_entries(entries, query)
+
+
+# =============================================================================
+# History Snapshots and Full-Text Index
+# =============================================================================
+
+# FTS5 index over Chromium's urls table (external content, substring matching)
+_CHROMIUM_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS urls_fts
+    USING fts5(url, title, content='urls', content_rowid='id', tokenize='trigram');
+    INSERT INTO urls_fts(urls_fts) VALUES('rebuild');
+"""
+
+# FTS5 index over Safari's distinct (history item, visit title) pairs
+_SAFARI_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS history_fts
+    USING fts5(url, title, history_item UNINDEXED, tokenize='trigram');
+    INSERT INTO history_fts(url, title, history_item)
+    SELECT DISTINCT hi.url, hv.title, hi.id
+    FROM history_items hi
+    JOIN history_visits hv ON hi.id = hv.history_item
+    WHERE hv.title IS NOT NULL AND hv.title != '';
+"""
+
+# Trigram tokenizer can only match terms of at least this many characters
+FTS_MIN_TERM_LENGTH = 3
+
+# Memory-map up to 256 MB of each snapshot so repeat searches skip read() calls
+HISTORY_MMAP_SIZE = 268435456
+
+# Page cache per snapshot connection, in KiB (SQLite's default is 2 MB)
+HISTORY_CACHE_SIZE_KB = 8000
+
+# Per-database snapshot state:
+# {db_path: {'lock', 'signature', 'path', 'conn', 'indexed', 'building'}}
+_history_snapshots = {}
+_history_snapshots_lock = threading.Lock()
+_fts_supported = True
+
+
+def _db_signature(db_path):
+    """Return (mtime, size) of a database and its WAL file, or None if missing."""
+    signature = []
+    for suffix in ("", "-wal"):
+        try:
+            st = os.stat(db_path + suffix)
+        except OSError:
+            if not suffix:
+                return None
+            signature.append(None)
+            continue
+        signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _get_snapshot_entry(db_path):
+    """Get (or create) the snapshot state for a database path."""
+    with _history_snapshots_lock:
+        entry = _history_snapshots.get(db_path)
+        if entry is None:
+            entry = {
+                'lock': threading.Lock(),
+                'signature': None,
+                'path': None,
+                'conn': None,
+                'indexed': False,
+                'building': None,
+            }
+            _history_snapshots[db_path] = entry
+        return entry
+
+
+def _replace_snapshot(entry, tmp_path, indexed):
+    """
+    Swap in a new snapshot file for a database, closing the old one.
     
-    def traverse(node):
-        if isinstance(node, dict):
-            if node.get("type") == "url":
-                title = node.get("name", "")
-                url = node.get("url", "")
-                title_lower = title.lower()
-                url_lower = url.lower()
-                domain = extract_domain(url)
-                
-                # Match against query, title, URL, or domain
-                if (query in title_lower or 
-                    query in url_lower or 
-                    query in domain or
-                    any(w in title_lower for w in query_words)):
-                    results.append({"title": title, "url": url, "type": "bookmark"})
-            for v in node.values():
-                traverse(v)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item)
+    Must be called with entry['lock'] held. The connection is kept open
+    across searches and shared between threads under that lock.
+    """
+    if entry['conn'] is not None:
+        entry['conn'].close()
+        entry['conn'] = None
+    cleanup_db(entry['path'])
+    entry['path'] = tmp_path
+    entry['indexed'] = indexed
+    
+    conn = sqlite3.connect(tmp_path, check_same_thread=False)
+    conn.execute(f"PRAGMA mmap_size={HISTORY_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{HISTORY_CACHE_SIZE_KB}")
+    # ORDER BY visit_count/last_visit sorts use temp b-trees; keep them off disk
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Snapshots are never written after they are swapped in
+    conn.execute("PRAGMA query_only=1")
+    entry['conn'] = conn
+
+
+def _cleanup_history_snapshots():
+    """Close every snapshot connection and delete its copy (run at exit)."""
+    with _history_snapshots_lock:
+        entries = list(_history_snapshots.values())
+    for entry in entries:
+        with entry['lock']:
+            if entry['conn'] is not None:
+                entry['conn'].close()
+                entry['conn'] = None
+            cleanup_db(entry['path'])
+            entry['path'] = None
+            entry['signature'] = None
+            entry['indexed'] = False
+
+
+atexit.register(_cleanup_history_snapshots)
+
+
+def _start_history_index_build(entry, db_path, signature, fts_sql):
+    """
+    Start a background index build for a snapshot signature.
     
-    traverse(data)
-    return results
+    Must be called with entry['lock'] held and no build running for the
+    database; entry['building'] records the signature being built.
+    """
+    entry['building'] = signature
+    threading.Thread(
+        target=_build_history_index,
+        args=(db_path, signature, fts_sql),
+        daemon=True,
+    ).start()
 
 
-def search_safari_bookmarks(query):
-    """Search Safari bookmarks (plist format) for matching entries."""
-    results = []
-    if not os.path.exists(SAFARI_BOOKMARKS):
-        return results
+def _build_history_index(db_path, signature, fts_sql):
+    """
+    Build a full-text indexed copy of a history database in the background.
     
+    The indexed copy replaces the plain snapshot only if the source database
+    has not changed since the snapshot was taken; otherwise it is discarded.
+    Only one build runs per database: if searches moved the snapshot on while
+    this one ran, a single build for the latest snapshot starts when it ends.
+    """
+    global _fts_supported
+    entry = _get_snapshot_entry(db_path)
+    tmp_path = copy_db(db_path)
     try:
-        with open(SAFARI_BOOKMARKS, "rb") as f:
-            plist = plistlib.load(f)
-    except (plistlib.InvalidFileException, IOError) as e:
-        logger.error(f"Error reading Safari bookmarks: {e}")
-        return results
+        if not tmp_path or _db_signature(db_path) != signature:
+            return
+        
+        try:
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.executescript(fts_sql)
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            if 'fts5' in str(e) or 'tokenizer' in str(e):
+                logger.warning(f"SQLite FTS5 unavailable, using LIKE for history search: {e}")
+                _fts_supported = False
+            else:
+                logger.error(f"Error indexing history {db_path}: {e}")
+            return
+        except sqlite3.Error as e:
+            logger.error(f"Error indexing history {db_path}: {e}")
+            return
+        
+        with entry['lock']:
+            if entry['signature'] == signature:
+                _replace_snapshot(entry, tmp_path, indexed=True)
+                tmp_path = None
+                logger.debug(f"History index ready for {db_path}")
+    finally:
+        cleanup_db(tmp_path)
+        with entry['lock']:
+            entry['building'] = None
+            latest = entry['signature']
+            if latest is not None and latest != signature and not entry['indexed'] and _fts_supported:
+                _start_history_index_build(entry, db_path, latest, fts_sql)
+
+
+def _query_history_snapshot(db_path, fts_sql, run_query):
+    """
+    Run a query against an up-to-date snapshot of a browser history database.
     
-    query_words = query.split()
+    The database is only copied when its mtime/size changes, and the
+    snapshot's connection (memory-mapped) is reused until then. A full-text
+    index is built for the snapshot in a background thread (one at a time per
+    database); until it is ready, run_query is told to fall back to LIKE scans.
     
-    def traverse(node):
-        if isinstance(node, dict):
-            if node.get("URLString"):
-                title = node.get("URIDictionary", {}).get("title", "") or node.get("Title", "")
-                url = node.get("URLString", "")
-                title_lower = title.lower()
-                url_lower = url.lower()
-                domain = extract_domain(url)
-                
-                if (query in title_lower or 
-                    query in url_lower or 
-                    query in domain or
-                    any(w in title_lower for w in query_words)):
-                    results.append({"title": title, "url": url, "type": "bookmark"})
-            for v in node.values():
-                traverse(v)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item)
+    Args:
+        db_path: Path to the live browser history database
+        fts_sql: Script that creates and fills the FTS5 index on a copy
+        run_query: Callable (conn, indexed) -> rows
+    
+    Returns:
+        The rows returned by run_query, or None if the database is unavailable.
+    """
+    entry = _get_snapshot_entry(db_path)
+    with entry['lock']:
+        signature = _db_signature(db_path)
+        if signature is None:
+            return None
+        
+        if entry['signature'] != signature or entry['conn'] is None:
+            tmp_path = copy_db(db_path)
+            if not tmp_path:
+                return None
+            entry['signature'] = signature
+            _replace_snapshot(entry, tmp_path, indexed=False)
+        
+        # A running build hands off to the latest snapshot when it finishes,
+        # so a database that changes on every visit never has overlapping builds
+        if not entry['indexed'] and _fts_supported and entry['building'] is None:
+            _start_history_index_build(entry, db_path, signature, fts_sql)
+        
+        return run_query(entry['conn'], entry['indexed'])
+
+
+def _split_history_terms(query):
+    """Split a query into the terms every matching history entry must contain."""
+    words = [w.strip() for w in query.split() if len(w.strip()) > 1]
+    return words if len(words) > 1 else [query]
+
+
+def _fts_match_expression(terms):
+    """Build an FTS5 MATCH expression requiring every term as a substring."""
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _can_use_fts(indexed, terms):
+    """Check whether a search can be answered from the trigram index."""
+    return indexed and all(len(term) >= FTS_MIN_TERM_LENGTH for term in terms)
+
+
+# =============================================================================
+# History Search Statements
+# =============================================================================
+
+_CHROMIUM_HISTORY_SQL = """
+    SELECT url, title, visit_count, last_visit_time
+    FROM urls
+    WHERE {where}
+    AND title != ''
+    AND length(title) > 2
+    ORDER BY visit_count DESC, last_visit_time DESC
+    LIMIT 20
+"""
+
+_SAFARI_HISTORY_SQL = """
+    SELECT hi.url, hv.title, hi.visit_count, MAX(hv.visit_time) as last_visit
+    FROM history_items hi
+    LEFT JOIN history_visits hv ON hi.id = hv.history_item
+    WHERE {where}
+    AND hv.title IS NOT NULL
+    AND hv.title != ''
+    AND length(hv.title) > 2
+    GROUP BY hi.url
+    ORDER BY hi.visit_count DESC, last_visit DESC
+    LIMIT 20
+"""
+
+# schema -> (statement template, per-term LIKE clause, FTS clause)
+_HISTORY_QUERIES = {
+    'chromium': (
+        _CHROMIUM_HISTORY_SQL,
+        "(url LIKE ? OR title LIKE ?)",
+        "id IN (SELECT rowid FROM urls_fts WHERE urls_fts MATCH ?)",
+    ),
+    'safari': (
+        _SAFARI_HISTORY_SQL,
+        "(hi.url LIKE ? OR hv.title LIKE ?)",
+        "(hv.history_item, hv.title) IN "
+        "(SELECT history_item, title FROM history_fts WHERE history_fts MATCH ?)",
+    ),
+}
+
+# Rendered SQL keyed by (schema, number of LIKE terms); 0 terms means the FTS query.
+# Keeping the SQL text stable lets each snapshot connection reuse its prepared statements.
+_STMT_CACHE = {}
+
+
+def _history_statement(schema, terms, indexed):
+    """
+    Get the SQL and bound parameters for a history search.
+    
+    Args:
+        schema: 'chromium' or 'safari'
+        terms: Terms every matching entry must contain (url or title)
+        indexed: Whether the snapshot has a full-text index
     
-    traverse(plist)
+    Returns:
+        Tuple of (sql, params)
+    """
+    use_fts = _can_use_fts(indexed, terms)
+    key = (schema, 0 if use_fts else len(terms))
+    sql = _STMT_CACHE.get(key)
+    if sql is None:
+        template, like_clause, fts_clause = _HISTORY_QUERIES[schema]
+        where_sql = fts_clause if use_fts else " AND ".join([like_clause] * len(terms))
+        sql = template.format(where=where_sql)
+        _STMT_CACHE[key] = sql
+    
+    if use_fts:
+        return sql, (_fts_match_expression(terms),)
+    
+    params = []
+    for term in terms:
+        pattern = f"%{term}%"
+        params.extend([pattern, pattern])
+    return sql, params
+
+
+def _history_rows_to_results(rows):
+    """Convert (url, title, visit_count, last_visit) rows to result dicts."""
+    results = []
+    for url, title, visit_count, _ in rows or []:
+        if title and not title.startswith("http"):
+            results.append({
+                "title": title, 
+                "url": url, 
+                "type": "history",
+                "visit_count": visit_count or 0
+            })
     return results
 
 
@@ -189,66 +507,18 @@ def _search_chromium_history(db_path, query, browser_name="Chrome"):
     Generic Chromium-based history search (Chrome, Helium, Dia).
     These browsers use the same SQLite schema with a 'urls' table.
     """
-    results = []
-    tmp_path = copy_db(db_path)
-    if not tmp_path:
-        return results
+    terms = _split_history_terms(query)
+    
+    def run_query(conn, indexed):
+        return conn.execute(*_history_statement('chromium', terms, indexed)).fetchall()
     
     try:
-        conn = sqlite3.connect(tmp_path)
-        cursor = conn.cursor()
-        
-        # Split query into words for better matching
-        words = [w.strip() for w in query.split() if len(w.strip()) > 1]
-        
-        if len(words) > 1:
-            # Multi-word query: match entries containing ALL words
-            where_clauses = []
-            params = []
-            for word in words:
-                where_clauses.append("(url LIKE ? OR title LIKE ?)")
-                params.extend([f"%{word}%", f"%{word}%"])
-            
-            where_sql = " AND ".join(where_clauses)
-            sql = f"""
-                SELECT url, title, visit_count, last_visit_time
-                FROM urls
-                WHERE {where_sql}
-                AND title != ''
-                AND length(title) > 2
-                ORDER BY visit_count DESC, last_visit_time DESC
-                LIMIT 20
-            """
-            cursor.execute(sql, params)
-        else:
-            # Single word query
-            query_pattern = f"%{query}%"
-            cursor.execute("""
-                SELECT url, title, visit_count, last_visit_time
-                FROM urls
-                WHERE (url LIKE ? OR title LIKE ?)
-                AND title != ''
-                AND length(title) > 2
-                ORDER BY visit_count DESC, last_visit_time DESC
-                LIMIT 20
-            """, (query_pattern, query_pattern))
-        
-        for url, title, visit_count, _ in cursor.fetchall():
-            if title and not title.startswith("http"):
-                results.append({
-                    "title": title, 
-                    "url": url, 
-                    "type": "history",
-                    "visit_count": visit_count or 0
-                })
-        
-        conn.close()
+        rows = _query_history_snapshot(db_path, _CHROMIUM_FTS_SQL, run_query)
     except sqlite3.Error as e:
         logger.error(f"Error searching {browser_name} history: {e}")
-    finally:
-        cleanup_db(tmp_path)
+        return []
     
-    return results
+    return _history_rows_to_results(rows)
 
 
 def search_chrome_history(query):
@@ -271,78 +541,160 @@ def search_safari_history(query):
     Search Safari browser history.
     Safari uses a different schema with history_items and history_visits tables.
     """
-    results = []
-    tmp_path = copy_db(SAFARI_HISTORY)
-    if not tmp_path:
-        return results
+    terms = _split_history_terms(query)
+    
+    def run_query(conn, indexed):
+        return conn.execute(*_history_statement('safari', terms, indexed)).fetchall()
     
     try:
-        conn = sqlite3.connect(tmp_path)
-        cursor = conn.cursor()
-        
-        # Split query into words for better matching
-        words = [w.strip() for w in query.split() if len(w.strip()) > 1]
-        
-        if len(words) > 1:
-            # Multi-word query: match entries containing ALL words
-            where_clauses = []
-            params = []
-            for word in words:
-                where_clauses.append("(hi.url LIKE ? OR hv.title LIKE ?)")
-                params.extend([f"%{word}%", f"%{word}%"])
-            
-            where_sql = " AND ".join(where_clauses)
-            sql = f"""
-                SELECT hi.url, hv.title, hi.visit_count, MAX(hv.visit_time) as last_visit
-                FROM history_items hi
-                LEFT JOIN history_visits hv ON hi.id = hv.history_item
-                WHERE {where_sql}
-                AND hv.title IS NOT NULL
-                AND hv.title != ''
-                AND length(hv.title) > 2
-                GROUP BY hi.url
-                ORDER BY hi.visit_count DESC, last_visit DESC
-                LIMIT 20
-            """
-            cursor.execute(sql, params)
-        else:
-            # Single word query
-            query_pattern = f"%{query}%"
-            cursor.execute("""
-                SELECT hi.url, hv.title, hi.visit_count, MAX(hv.visit_time) as last_visit
-                FROM history_items hi
-                LEFT JOIN history_visits hv ON hi.id = hv.history_item
-                WHERE (hi.url LIKE ? OR hv.title LIKE ?)
-                AND hv.title IS NOT NULL
-                AND hv.title != ''
-                AND length(hv.title) > 2
-                GROUP BY hi.url
-                ORDER BY hi.visit_count DESC, last_visit DESC
-                LIMIT 20
-            """, (query_pattern, query_pattern))
-        
-        for url, title, visit_count, _ in cursor.fetchall():
-            if title and not title.startswith("http"):
-                results.append({
-                    "title": title, 
-                    "url": url, 
-                    "type": "history",
-                    "visit_count": visit_count or 0
-                })
-        
-        conn.close()
+        rows = _query_history_snapshot(SAFARI_HISTORY, _SAFARI_FTS_SQL, run_query)
     except sqlite3.Error as e:
         logger.error(f"Error searching Safari history: {e}")
-    finally:
-        cleanup_db(tmp_path)
+        return []
     
-    return results
+    return _history_rows_to_results(rows)
 
 
 # =============================================================================
 # Combined Search
 # =============================================================================
 
+# Shared pool for fanning out per-browser searches (file reads and SQLite
+# queries release the GIL, so sources are searched concurrently)
+SEARCH_MAX_WORKERS = 8
+_search_executor = ThreadPoolExecutor(
+    max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="history-search"
+)
+
+
+# Recent aggregated results: {(kind, query, limit, safari_enabled): (signature, results)}
+SEARCH_RESULT_CACHE_SIZE = 256
+_search_result_cache = OrderedDict()
+_search_result_cache_lock = threading.Lock()
+
+
+def _search_sources_signature():
+    """Return the (mtime, size) of every bookmark and history file searched."""
+    signature = []
+    for path in (CHROME_BOOKMARKS, HELIUM_BOOKMARKS, DIA_BOOKMARKS, SAFARI_BOOKMARKS):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    for path in (CHROME_HISTORY, HELIUM_HISTORY, DIA_HISTORY, SAFARI_HISTORY):
+        signature.append(_db_signature(path))
+    return tuple(signature)
+
+
+def _get_cached_search(key, signature):
+    """Return a copy of cached results for key if the sources are unchanged."""
+    with _search_result_cache_lock:
+        cached = _search_result_cache.get(key)
+        if cached is None or cached[0] != signature:
+            return None
+        _search_result_cache.move_to_end(key)
+        return [dict(r) for r in cached[1]]
+
+
+def _set_cached_search(key, signature, results):
+    """Store a copy of results for key, evicting the least recently used entry."""
+    with _search_result_cache_lock:
+        _search_result_cache[key] = (signature, [dict(r) for r in results])
+        _search_result_cache.move_to_end(key)
+        while len(_search_result_cache) > SEARCH_RESULT_CACHE_SIZE:
+            _search_result_cache.popitem(last=False)
+
+
+def _iter_source_results(search_functions, query, status):
+    """
+    Run search functions concurrently on the shared pool and yield their results.
+    
+    Results are yielded in search_functions order (so ranking ties stay
+    stable) as soon as each source finishes, so a consumer that stops early
+    does not wait for slower sources. A failing source is logged, skipped,
+    and recorded by setting status['complete'] to False.
+    """
+    futures = [(fn, _search_executor.submit(fn, query)) for fn in search_functions]
+    for search_fn, future in futures:
+        try:
+            source_results = future.result()
+        except Exception as e:
+            logger.warning(f"Error in {search_fn.__name__}: {e}")
+            status['complete'] = False
+            continue
+        yield from source_results
+
+
+def _run_searches(search_functions, query, prefer_bookmarks=False, exclude_url=None):
+    """
+    Run search functions concurrently, deduplicating every result by URL.
+    
+    Args:
+        search_functions: Source search callables taking the query
+        query: Normalized search query
+        prefer_bookmarks: Let a later bookmark replace an earlier result for the same URL
+        exclude_url: URL to drop from the results entirely
+    
+    Returns:
+        Tuple of (unique, complete): unique maps url -> result in first-seen
+        order, complete is False if any source failed
+    """
+    status = {'complete': True}
+    unique = {}
+    for r in _iter_source_results(search_functions, query, status):
+        url = r.get('url', '')
+        if url == exclude_url:
+            continue
+        if url not in unique or (prefer_bookmarks and r.get('type') == 'bookmark'):
+            unique[url] = r
+    return unique, status['complete']
+
+
+def _iter_unique_results(search_functions, query, status):
+    """
+    Lazily yield results deduplicated by URL (first result per URL wins).
+    
+    Unlike _run_searches this streams, so _top_results can stop pulling
+    once the best possible results have been found.
+    """
+    seen = set()
+    for r in _iter_source_results(search_functions, query, status):
+        url = r.get('url', '')
+        if url not in seen:
+            seen.add(url)
+            yield r
+
+
+def _top_results(candidates, query, query_words, limit, best_score=None):
+    """
+    Select the `limit` highest-scoring results in a single pass.
+    
+    Uses a bounded heap (O(N log limit)) instead of sorting every candidate;
+    ties keep their original order, matching a stable sort. If best_score
+    (the highest score any candidate can reach) is given, stops consuming
+    candidates once `limit` results have reached it, since later ones can
+    only tie and ties keep the earlier result.
+    """
+    if limit <= 0:
+        return []
+    
+    # Min-heap of (score, -position, result): the root is the weakest kept result
+    heap = []
+    scored = score_results(candidates, query, query_words)
+    for position, (score, r) in enumerate(scored):
+        item = (score, -position, r)
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, item)
+        
+        if best_score is not None and len(heap) == limit and heap[0][0] >= best_score:
+            break
+    
+    return [r for _, _, r in sorted(heap, reverse=True)]
+
+
 def search_history(query, limit=10, safari_enabled=False):
     """
     Search all browser history and bookmarks.
@@ -363,11 +715,16 @@ def search_history(query, limit=10, safari_enabled=False):
     if not query:
         return []
     
+    # Reuse results while no bookmark/history file has changed
+    cache_key = ('history', query, limit, safari_enabled)
+    signature = _search_sources_signature()
+    cached = _get_cached_search(cache_key, signature)
+    if cached is not None:
+        return cached
+    
     # Split query into words for multi-word matching
     query_words = [w for w in query.split() if len(w) > 1]
     
-    results = []
-    
     # Search all sources (Safari only if explicitly enabled -- requires FDA)
     search_functions = [
         search_chrome_bookmarks,
@@ -380,38 +737,21 @@ def search_history(query, limit=10, safari_enabled=False):
     if safari_enabled:
         search_functions.extend([search_safari_bookmarks, search_safari_history])
     
-    for search_fn in search_functions:
-        try:
-            results.extend(search_fn(query))
-        except Exception as e:
-            logger.warning(f"Error in {search_fn.__name__}: {e}")
-    
-    # Filter out BriefDesk's own page (its title changes dynamically, causing false matches)
-    results = [r for r in results if r.get('url', '') != 'http://127.0.0.1:8765/start.html']
-    
-    # Dedupe by URL, keeping bookmarks over history (bookmarks are more intentional)
-    seen = {}
-    for r in results:
-        url = r.get('url', '')
-        if url not in seen:
-            seen[url] = r
-        elif r.get('type') == 'bookmark':
-            # Prefer bookmarks over history
-            seen[url] = r
-    
-    unique = list(seen.values())
-    
-    # Score and sort results
-    for r in unique:
-        r['_score'] = score_result(r, query, query_words)
-    
-    unique.sort(key=lambda x: -x['_score'])
-    
-    # Remove internal score before returning
-    for r in unique:
-        del r['_score']
-    
-    return unique[:limit]
+    # Dedupe by URL, keeping bookmarks over history (bookmarks are more intentional),
+    # and drop BriefDesk's own page (its title changes dynamically, causing false matches)
+    unique, complete = _run_searches(
+        search_functions, query,
+        prefer_bookmarks=True,
+        exclude_url='http://127.0.0.1:8765/start.html',
+    )
+    
+    top = _top_results(
+        unique.values(), query, query_words, limit,
+        best_score=max_score(query_words, visit_counts=True),
+    )
+    if complete:
+        _set_cached_search(cache_key, signature, top)
+    return top
 
 
 def search_bookmarks(query, limit=10, safari_enabled=False):
@@ -433,9 +773,13 @@ def search_bookmarks(query, limit=10, safari_enabled=False):
     if not query:
         return []
     
-    query_words = [w for w in query.split() if len(w) > 1]
+    cache_key = ('bookmarks', query, limit, safari_enabled)
+    signature = _search_sources_signature()
+    cached = _get_cached_search(cache_key, signature)
+    if cached is not None:
+        return cached
     
-    results = []
+    query_words = [w for w in query.split() if len(w) > 1]
     
     search_functions = [
         search_chrome_bookmarks,
@@ -445,31 +789,15 @@ def search_bookmarks(query, limit=10, safari_enabled=False):
     if safari_enabled:
         search_functions.append(search_safari_bookmarks)
     
-    for search_fn in search_functions:
-        try:
-            results.extend(search_fn(query))
-        except Exception as e:
-            logger.warning(f"Error in {search_fn.__name__}: {e}")
-    
-    # Dedupe by URL
-    seen = {}
-    for r in results:
-        url = r.get('url', '')
-        if url not in seen:
-            seen[url] = r
-    
-    unique = list(seen.values())
-    
-    # Score and sort
-    for r in unique:
-        r['_score'] = score_result(r, query, query_words)
-    
-    unique.sort(key=lambda x: -x['_score'])
-    
-    for r in unique:
-        del r['_score']
-    
-    return unique[:limit]
+    # Dedupe by URL while streaming; stop once the top results cannot improve
+    status = {'complete': True}
+    top = _top_results(
+        _iter_unique_results(search_functions, query, status), query, query_words, limit,
+        best_score=max_score(query_words, visit_counts=False),
+    )
+    if status['complete']:
+        _set_cached_search(cache_key, signature, top)
+    return top
 
 
 def search_browser_history(query, limit=10, safari_enabled=False):
@@ -491,9 +819,13 @@ def search_browser_history(query, limit=10, safari_enabled=False):
     if not query:
         return []
     
-    query_words = [w for w in query.split() if len(w) > 1]
+    cache_key = ('browser_history', query, limit, safari_enabled)
+    signature = _search_sources_signature()
+    cached = _get_cached_search(cache_key, signature)
+    if cached is not None:
+        return cached
     
-    results = []
+    query_words = [w for w in query.split() if len(w) > 1]
     
     search_functions = [
         search_chrome_history,
@@ -503,28 +835,12 @@ def search_browser_history(query, limit=10, safari_enabled=False):
     if safari_enabled:
         search_functions.append(search_safari_history)
     
-    for search_fn in search_functions:
-        try:
-            results.extend(search_fn(query))
-        except Exception as e:
-            logger.warning(f"Error in {search_fn.__name__}: {e}")
-    
-    # Dedupe by URL
-    seen = {}
-    for r in results:
-        url = r.get('url', '')
-        if url not in seen:
-            seen[url] = r
-    
-    unique = list(seen.values())
-    
-    # Score and sort
-    for r in unique:
-        r['_score'] = score_result(r, query, query_words)
-    
-    unique.sort(key=lambda x: -x['_score'])
-    
-    for r in unique:
-        del r['_score']
-    
-    return unique[:limit]
+    # Dedupe by URL while streaming; stop once the top results cannot improve
+    status = {'complete': True}
+    top = _top_results(
+        _iter_unique_results(search_functions, query, status), query, query_words, limit,
+        best_score=max_score(query_words, visit_counts=True),
+    )
+    if status['complete']:
+        _set_cached_search(cache_key, signature, top)
+    return top
@@ -4,12 +4,15 @@ import json
 import os
 import threading
 import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .config import logger, PREFETCH_INTERVAL, MAX_ACTIVITY_LOG
+from .config import logger, PREFETCH_INTERVAL, MAX_ACTIVITY_LOG, AUTH_STATUS_CACHE_TTL, MCP_CONFIG_PATH
 from .cache import (
-    get_meeting_cache, set_meeting_cache, is_cache_valid,
-    has_cached_data, save_prep_cache_to_disk, cleanup_old_caches,
-    set_meeting_info,
+    get_meeting_cache, set_meeting_cache, set_meeting_cache_batch, is_cache_valid,
+    get_cache_state, save_prep_cache_to_disk, cleanup_old_caches,
+    set_meeting_info, get_source_hit_count, save_source_hit_counts,
     _meeting_prep_cache, _meeting_prep_cache_lock
 )
 from .google_services import get_calendar_events_standalone, is_google_authenticated
@@ -28,7 +31,7 @@ _prefetch_status = {
     'meetings_in_queue': 0,
     'meetings_processed': 0,
     'last_cycle_start': None,
-    'activity_log': []
+    'activity_log': deque(maxlen=MAX_ACTIVITY_LOG)
 }
 _prefetch_status_lock = threading.Lock()
 
@@ -36,9 +39,26 @@ _prefetch_status_lock = threading.Lock()
 _prefetch_thread = None
 _prefetch_running = False
 
+# Set to wake the loop early from its idle wait (on stop or force mode)
+_prefetch_wake_event = threading.Event()
+
 # Force aggressive prefetch mode (can be toggled via API)
 _force_aggressive_prefetch = False
 
+# Sources cached for each meeting
+PREP_SOURCES = ('jira', 'confluence', 'slack', 'gmail', 'drive', 'summary')
+
+# Bounded pool for per-meeting source fetches (caps concurrent CLI/MCP calls)
+PREFETCH_MAX_WORKERS = 3
+_fetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch-source")
+
+# Cached check_services_auth result, keyed by the mtimes of the auth files
+_auth_status_cache = {'signature': None, 'timestamp': 0, 'data': None}
+_auth_status_cache_lock = threading.Lock()
+
+# Atlassian token scan result, keyed by the token files' (path, mtime) pairs
+_atlassian_auth_cache = {'signature': None, 'authenticated': False}
+
 # CLI function references (set via configure_cli_functions)
 _call_cli_for_source = None
 _call_cli_for_meeting_summary = None
@@ -96,9 +116,8 @@ def add_prefetch_activity(activity_type, message, meeting=None, source=None, sta
             'status': status,
             'items': items
         }
-        _prefetch_status['activity_log'].insert(0, entry)
-        # Keep only last N entries
-        _prefetch_status['activity_log'] = _prefetch_status['activity_log'][:MAX_ACTIVITY_LOG]
+        # Newest first; the deque's maxlen drops the oldest entries
+        _prefetch_status['activity_log'].appendleft(entry)
 
 
 def update_prefetch_status(**kwargs):
@@ -118,19 +137,108 @@ def get_prefetch_status():
         dict: Copy of the current prefetch status
     """
     with _prefetch_status_lock:
-        return dict(_prefetch_status)
+        status = dict(_prefetch_status)
+        status['activity_log'] = list(_prefetch_status['activity_log'])
+        return status
 
 
 # =============================================================================
 # Service Authentication Check
 # =============================================================================
 
+# Files and directories whose changes can flip a service's auth status
+MCP_AUTH_PATH = os.path.expanduser('~/.mcp-auth')
+LOCAL_MCP_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.devsai.json')
+GMAIL_MCP_DIR = os.path.expanduser('~/.gmail-mcp')
+GDRIVE_TOKEN_PATH = os.path.expanduser('~/.local/share/briefdesk/google_drive_token.json')
+GDRIVE_MCP_PATH = os.path.expanduser('~/.local/share/briefdesk/gdrive-mcp/dist/index.js')
+
+
+def _auth_files_signature():
+    """Get the mtimes of the auth-related paths (0 for missing ones)."""
+    signature = []
+    for path in (MCP_AUTH_PATH, LOCAL_MCP_CONFIG_PATH, MCP_CONFIG_PATH,
+                 GMAIL_MCP_DIR, GDRIVE_TOKEN_PATH, GDRIVE_MCP_PATH):
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(0)
+    return tuple(signature)
+
+
+def _atlassian_token_files():
+    """List mcp-remote token files under ~/.mcp-auth with their mtimes.
+    
+    Returns:
+        tuple: Sorted (path, mtime_ns) pairs for every *_tokens.json file
+    """
+    token_files = []
+    try:
+        subdirs = [entry for entry in os.scandir(MCP_AUTH_PATH) if entry.is_dir()]
+    except OSError:
+        return ()
+    for subdir in subdirs:
+        try:
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith('_tokens.json'):
+                    token_files.append((entry.path, entry.stat().st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(sorted(token_files))
+
+
+def _has_access_token(token_path):
+    """Check whether a token file holds a non-empty access_token."""
+    try:
+        with open(token_path, 'rb') as tf:
+            data = tf.read()
+        # Cheap substring check skips parsing files that cannot hold a token
+        if b'"access_token"' not in data:
+            return False
+        return bool(json.loads(data).get('access_token'))
+    except Exception:
+        return False
+
+
+def _check_atlassian_auth():
+    """Check for a valid mcp-remote token, parsing token files only when they change."""
+    token_files = _atlassian_token_files()
+    with _auth_status_cache_lock:
+        if _atlassian_auth_cache['signature'] == token_files:
+            return _atlassian_auth_cache['authenticated']
+    
+    authenticated = any(_has_access_token(token_path) for token_path, _ in token_files)
+    
+    with _auth_status_cache_lock:
+        _atlassian_auth_cache.update(signature=token_files, authenticated=authenticated)
+    return authenticated
+
+
 def check_services_auth():
     """Check which services are authenticated (for prefetch to avoid triggering OAuth).
     
+    The result is reused for AUTH_STATUS_CACHE_TTL seconds while none of the
+    auth files or directories have changed.
+    
     Returns:
         dict: Authentication status for each service (atlassian, slack, gmail, drive)
     """
+    signature = _auth_files_signature()
+    now = time.time()
+    with _auth_status_cache_lock:
+        if (_auth_status_cache['data'] is not None
+                and _auth_status_cache['signature'] == signature
+                and now - _auth_status_cache['timestamp'] < AUTH_STATUS_CACHE_TTL):
+            return dict(_auth_status_cache['data'])
+    
+    auth_status = _scan_services_auth()
+    with _auth_status_cache_lock:
+        _auth_status_cache.update(signature=signature, timestamp=now, data=auth_status)
+    return dict(auth_status)
+
+
+def _scan_services_auth():
+    """Scan config and token files for each service's auth status."""
     auth_status = {
         'atlassian': False,
         'slack': False,
@@ -139,32 +247,12 @@ def check_services_auth():
     }
     
     # Check Atlassian auth by looking for mcp-remote tokens
-    mcp_auth_path = os.path.expanduser('~/.mcp-auth')
-    if os.path.exists(mcp_auth_path):
-        # Look in mcp-remote subdirectories for tokens.json files
-        for subdir in os.listdir(mcp_auth_path):
-            subdir_path = os.path.join(mcp_auth_path, subdir)
-            if os.path.isdir(subdir_path):
-                for f in os.listdir(subdir_path):
-                    if f.endswith('_tokens.json'):
-                        token_path = os.path.join(subdir_path, f)
-                        try:
-                            with open(token_path, 'r') as tf:
-                                token_data = json.load(tf)
-                                # Check if token is valid (has access_token)
-                                if token_data.get('access_token'):
-                                    auth_status['atlassian'] = True
-                                    break
-                        except Exception:
-                            pass
-            if auth_status['atlassian']:
-                break
+    auth_status['atlassian'] = _check_atlassian_auth()
     
     # Check Slack auth by looking for token in local .devsai.json config
-    local_config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.devsai.json')
     try:
-        if os.path.exists(local_config_path):
-            with open(local_config_path, 'r') as f:
+        if os.path.exists(LOCAL_MCP_CONFIG_PATH):
+            with open(LOCAL_MCP_CONFIG_PATH, 'r') as f:
                 local_config = json.load(f).get('mcpServers', {})
                 slack_config = local_config.get('slack', {})
                 env = slack_config.get('env', {})
@@ -183,19 +271,16 @@ def check_services_auth():
                 auth_status['slack'] = True
     
     # Check Gmail auth - look for both credentials and tokens
-    gmail_dir = os.path.expanduser('~/.gmail-mcp')
-    if os.path.exists(gmail_dir):
+    if os.path.exists(GMAIL_MCP_DIR):
         # Check for gcp-oauth.keys.json (OAuth client) and credentials.json (user tokens)
-        has_creds = os.path.exists(os.path.join(gmail_dir, 'gcp-oauth.keys.json'))
-        has_tokens = os.path.exists(os.path.join(gmail_dir, 'credentials.json'))
+        has_creds = os.path.exists(os.path.join(GMAIL_MCP_DIR, 'gcp-oauth.keys.json'))
+        has_tokens = os.path.exists(os.path.join(GMAIL_MCP_DIR, 'credentials.json'))
         if has_creds and has_tokens:
             auth_status['gmail'] = True
     
     # Check Google Drive MCP auth - gdrive MCP token in briefdesk config
     # If token exists, we use API mode; otherwise fallback to local filesystem search
-    gdrive_token_path = os.path.expanduser('~/.local/share/briefdesk/google_drive_token.json')
-    gdrive_mcp_path = os.path.expanduser('~/.local/share/briefdesk/gdrive-mcp/dist/index.js')
-    if os.path.exists(gdrive_token_path) and os.path.exists(gdrive_mcp_path):
+    if os.path.exists(GDRIVE_TOKEN_PATH) and os.path.exists(GDRIVE_MCP_PATH):
         auth_status['drive'] = True  # API mode available
     # Note: drive=False just means local fallback, drive still works
     
@@ -206,11 +291,71 @@ def check_services_auth():
 # Meeting Data Prefetch
 # =============================================================================
 
-def prefetch_meeting_data(meeting):
+def _prefetch_source(source, title, attendees_str, description, attendee_emails):
+    """Fetch a single source for a meeting.
+    
+    Runs on the prefetch pool; errors are logged and returned as empty results.
+    
+    Returns:
+        list: Items to cache for the source, or None if prefetch was stopped
+    """
+    if not _prefetch_running:
+        return None
+    try:
+        update_prefetch_status(current_source=source)
+        add_prefetch_activity('fetch_start', f'Fetching {source}...', meeting=title, source=source, status='info')
+        logger.info(f"[Prefetch] Starting {source}...")
+        
+        # All sources use CLI (Drive uses find command, others use MCPs)
+        # Drive gets longer timeout since file search can take time
+        timeout = 90 if source == 'drive' else 60
+        result = _call_cli_for_source(source, title, attendees_str, description, timeout=timeout, attendee_emails=attendee_emails)
+        
+        if isinstance(result, list):
+            logger.info(f"[Prefetch] {source} for '{title[:30]}': {len(result)} items")
+            add_prefetch_activity('fetch_complete', f'{source}: {len(result)} items', 
+                                 meeting=title, source=source, status='success', items=len(result))
+            return result
+        else:
+            logger.warning(f"[Prefetch] {source} returned non-list: {type(result)}")
+            error_msg = result.get('error', 'Unknown error') if isinstance(result, dict) else str(type(result))
+            add_prefetch_activity('fetch_error', f'{source}: {error_msg}', 
+                                 meeting=title, source=source, status='error')
+            return []
+    except Exception as e:
+        logger.error(f"[Prefetch] Error fetching {source}: {e}")
+        logger.error(f"[Prefetch] Traceback: {traceback.format_exc()}")
+        add_prefetch_activity('fetch_error', f'{source}: {str(e)[:50]}', 
+                             meeting=title, source=source, status='error')
+        return []
+
+
+def _meeting_attendees(meeting):
+    """Get a meeting's attendee emails and display string, computed once per meeting dict.
+    
+    Returns:
+        tuple: (list of attendee emails, comma-separated names of the first 5 attendees)
+    """
+    if '_attendee_fields' not in meeting:
+        emails = []
+        names = []
+        for a in meeting.get('attendees', []):
+            email = a.get('email', '')
+            if email:
+                emails.append(email)
+            if len(names) < 5:
+                names.append(a.get('name', email))
+        meeting['_attendee_fields'] = (emails, ', '.join(names))
+    return meeting['_attendee_fields']
+
+
+def prefetch_meeting_data(meeting, validity=None):
     """Pre-fetch all data for a single meeting.
     
     Args:
         meeting: Meeting dict with id, title, attendees, description
+        validity: Optional {source: cache valid} snapshot already taken by the
+            caller; checked against the cache when omitted
     """
     global _prefetch_running
     
@@ -221,10 +366,7 @@ def prefetch_meeting_data(meeting):
     
     logger.info(f"[Prefetch] Starting prefetch for: {title[:50]}... (meeting_id={meeting_id})")
     
-    attendees = meeting.get('attendees', [])
-    attendee_emails = [a.get('email', '') for a in attendees if a.get('email')]
-    attendee_names = [a.get('name', a.get('email', '')) for a in attendees]
-    attendees_str = ', '.join(attendee_names[:5])
+    attendee_emails, attendees_str = _meeting_attendees(meeting)
     description = meeting.get('description', '')[:200] if meeting.get('description') else ''
     
     # Store meeting info for future refreshes (when meeting not in calendar view)
@@ -237,77 +379,62 @@ def prefetch_meeting_data(meeting):
                 f"slack={auth_status.get('slack')}, gmail={auth_status.get('gmail')}, "
                 f"drive={drive_mode}")
     
+    if validity is None:
+        validity = {source: is_cache_valid(meeting_id, source) for source in PREP_SOURCES}
+    
     # Determine which sources we can safely fetch
     sources_to_fetch = []
     
     # Drive doesn't need OAuth, always fetch
     for source in ['drive']:
-        if not is_cache_valid(meeting_id, source):
+        if not validity.get(source):
             sources_to_fetch.append(source)
     
     # Only fetch these if authenticated (to avoid OAuth popups)
     if auth_status.get('atlassian'):
         for source in ['jira', 'confluence']:
-            if not is_cache_valid(meeting_id, source):
+            if not validity.get(source):
                 sources_to_fetch.append(source)
     else:
         logger.info("[Prefetch] Skipping Jira/Confluence - not authenticated")
     
     if auth_status.get('slack'):
-        if not is_cache_valid(meeting_id, 'slack'):
+        if not validity.get('slack'):
             sources_to_fetch.append('slack')
     else:
         logger.info("[Prefetch] Skipping Slack - not authenticated")
     
     if auth_status.get('gmail'):
-        if not is_cache_valid(meeting_id, 'gmail'):
+        if not validity.get('gmail'):
             sources_to_fetch.append('gmail')
     else:
         logger.info("[Prefetch] Skipping Gmail - not authenticated")
     
-    # Fetch sources SEQUENTIALLY to avoid overloading CLI/MCP servers
-    logger.info(f"[Prefetch] Sources to fetch (sequential): {sources_to_fetch}")
+    # Most-read sources first, so an interrupted cycle still covers what users open
+    sources_to_fetch.sort(key=get_source_hit_count, reverse=True)
     
-    for source in sources_to_fetch:
-        if not _prefetch_running:
-            break
-        try:
-            update_prefetch_status(current_source=source)
-            add_prefetch_activity('fetch_start', f'Fetching {source}...', meeting=title, source=source, status='info')
-            logger.info(f"[Prefetch] Starting {source}...")
-            
-            # All sources use CLI (Drive uses find command, others use MCPs)
-            # Drive gets longer timeout since file search can take time
-            timeout = 90 if source == 'drive' else 60
-            result = _call_cli_for_source(source, title, attendees_str, description, timeout=timeout, attendee_emails=attendee_emails)
-            
-            if isinstance(result, list):
-                logger.info(f"[Prefetch] {source} for '{title[:30]}': {len(result)} items")
-                set_meeting_cache(meeting_id, source, result)
-                add_prefetch_activity('fetch_complete', f'{source}: {len(result)} items', 
-                                     meeting=title, source=source, status='success', items=len(result))
-            else:
-                logger.warning(f"[Prefetch] {source} returned non-list: {type(result)}")
-                set_meeting_cache(meeting_id, source, [])
-                error_msg = result.get('error', 'Unknown error') if isinstance(result, dict) else str(type(result))
-                add_prefetch_activity('fetch_error', f'{source}: {error_msg}', 
-                                     meeting=title, source=source, status='error')
-        except Exception as e:
-            import traceback
-            logger.error(f"[Prefetch] Error fetching {source}: {e}")
-            logger.error(f"[Prefetch] Traceback: {traceback.format_exc()}")
-            set_meeting_cache(meeting_id, source, [])
-            add_prefetch_activity('fetch_error', f'{source}: {str(e)[:50]}', 
-                                 meeting=title, source=source, status='error')
-        
-        # Small delay between sources to avoid overwhelming CLI
-        time.sleep(2)
+    # Fetch sources concurrently; the bounded pool avoids overloading CLI/MCP servers
+    logger.info(f"[Prefetch] Sources to fetch (max {PREFETCH_MAX_WORKERS} concurrent): {sources_to_fetch}")
+    
+    futures = {
+        _fetch_pool.submit(_prefetch_source, source, title,
+                           attendees_str, description, attendee_emails): source
+        for source in sources_to_fetch
+    }
+    # Collect results and write them to the cache (and disk) once
+    batch = {}
+    for future in as_completed(futures):
+        result = future.result()
+        if result is not None:
+            batch[futures[future]] = result
+    if batch:
+        set_meeting_cache_batch(meeting_id, batch)
     
     update_prefetch_status(current_source=None)
     
     # Only fetch summary if we have some data sources authenticated
     if auth_status.get('atlassian') or auth_status.get('slack') or auth_status.get('gmail'):
-        if not is_cache_valid(meeting_id, 'summary'):
+        if not validity.get('summary'):
             try:
                 result = _call_cli_for_meeting_summary(title, attendees_str, attendee_emails, description, timeout=120)
                 if result.get('status') == 'success':
@@ -342,6 +469,9 @@ def set_force_aggressive_prefetch(action):
     else:
         _force_aggressive_prefetch = not _force_aggressive_prefetch
     
+    if _force_aggressive_prefetch:
+        _prefetch_wake_event.set()
+    
     logger.info(f"[Prefetch] Force aggressive mode: {_force_aggressive_prefetch}")
 
 
@@ -354,6 +484,11 @@ def get_force_aggressive_prefetch():
 # Background Prefetch Loop
 # =============================================================================
 
+def _meeting_priority(meeting):
+    """Sort key that prefetches sooner and larger meetings first."""
+    return (meeting.get('start') or '', -len(meeting.get('attendees') or []))
+
+
 def background_prefetch_loop():
     """Background loop that pre-fetches data for upcoming meetings."""
     global _prefetch_running
@@ -383,13 +518,13 @@ def background_prefetch_loop():
                 # Auth not ready yet (common on fresh install — prefetch starts
                 # before the user completes Google OAuth).  Retry quickly.
                 print("[Prefetch] Google auth not ready yet, retrying in 30s...", flush=True)
-                for _ in range(30):
-                    if not _prefetch_running:
-                        break
-                    time.sleep(1)
+                _prefetch_wake_event.wait(timeout=30)
+                _prefetch_wake_event.clear()
                 continue
 
             if events:
+                # Imminent meetings first, larger meetings first among equal start times
+                events.sort(key=_meeting_priority)
                 print(f"[Prefetch] Found {len(events)} upcoming meetings to prefetch", flush=True)
                 add_prefetch_activity('cycle_start', f'Found {len(events)} meetings [{mode}]', status='info')
                 update_prefetch_status(
@@ -409,6 +544,9 @@ def background_prefetch_loop():
                     meeting_id = meeting.get('id') or meeting.get('title')
                     meeting_title = meeting.get('title', 'unknown')
                     
+                    # One locked snapshot of every source's cache state
+                    validity, present = get_cache_state(meeting_id, PREP_SOURCES)
+                    
                     # During day: only fetch if data is MISSING (not just expired)
                     # During night/weekend: refresh expired data too (full refresh)
                     # Force mode: refresh everything regardless of TTL
@@ -417,23 +555,17 @@ def background_prefetch_loop():
                         needs_fetch = True
                     elif is_night:
                         # Night/weekend mode: refresh if TTL expired
-                        needs_fetch = not all(
-                            is_cache_valid(meeting_id, source)
-                            for source in ['jira', 'confluence', 'slack', 'gmail', 'drive', 'summary']
-                        )
+                        needs_fetch = not all(validity.values())
                     else:
                         # Day mode: only fetch if data is completely missing
-                        needs_fetch = not all(
-                            has_cached_data(meeting_id, source)
-                            for source in ['jira', 'confluence', 'slack', 'gmail', 'drive', 'summary']
-                        )
+                        needs_fetch = not all(present.values())
                     
                     if needs_fetch:
                         has_uncached_meetings = True
                         print(f"[Prefetch] Processing meeting {meetings_processed_total + 1}: {meeting_title[:40]}", flush=True)
                         update_prefetch_status(current_meeting=meeting_title, running=True)
                         add_prefetch_activity('meeting_start', 'Processing meeting', meeting=meeting_title, status='info')
-                        prefetch_meeting_data(meeting)
+                        prefetch_meeting_data(meeting, validity)
                         meetings_processed_total += 1
                         update_prefetch_status(meetings_processed=meetings_processed_total)
                         add_prefetch_activity('meeting_complete', 'Completed', meeting=meeting_title, status='success')
@@ -458,6 +590,7 @@ def background_prefetch_loop():
                 
                 update_prefetch_status(current_meeting=None, running=False)
                 cleanup_old_caches()
+                save_source_hit_counts()
                 
                 # Wait times: shorter at night for faster refresh cycles
                 if has_uncached_meetings:
@@ -474,14 +607,12 @@ def background_prefetch_loop():
             print(f"[Prefetch] Error in prefetch loop: {e}", flush=True)
             wait_time = 60
         
-        # Wait before next prefetch cycle (can be interrupted by force mode)
-        for _ in range(wait_time):
-            if not _prefetch_running:
-                break
-            if _force_aggressive_prefetch:
-                print("[Prefetch] Force mode detected, starting new cycle immediately", flush=True)
-                break
-            time.sleep(1)
+        # Wait before next prefetch cycle (woken early by stop or force mode)
+        if _prefetch_running and not _force_aggressive_prefetch:
+            _prefetch_wake_event.wait(timeout=wait_time)
+        _prefetch_wake_event.clear()
+        if _prefetch_running and _force_aggressive_prefetch:
+            print("[Prefetch] Force mode detected, starting new cycle immediately", flush=True)
     
     print("[Prefetch] Background prefetch thread stopped", flush=True)
 
@@ -504,6 +635,7 @@ def start_prefetch_thread():
     _ensure_cli_configured()
     
     _prefetch_running = True
+    _prefetch_wake_event.clear()
     _prefetch_thread = threading.Thread(target=background_prefetch_loop, daemon=True)
     _prefetch_thread.start()
     print("[Prefetch] Started background prefetch thread", flush=True)
@@ -513,6 +645,7 @@ def stop_prefetch_thread():
     """Stop the background prefetch thread."""
     global _prefetch_running
     _prefetch_running = False
+    _prefetch_wake_event.set()
     print("[Prefetch] Stop signal sent to prefetch thread", flush=True)
 
 
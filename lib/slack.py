@@ -1,14 +1,31 @@
 """Slack integration functions for BriefDesk."""
 
+import csv
+import io
+import json
+import os
+import re
+import threading
 import time
-from datetime import datetime
+from collections import ChainMap, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import requests as slack_requests
 except ImportError:
     slack_requests = None
 
-from .config import logger, SLACK_USERS_CACHE_TTL, SLACK_WORKSPACE
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .config import (
+    logger, SLACK_USERS_CACHE_TTL, SLACK_USERS_DISK_TTL, SLACK_USERS_FILE,
+    SLACK_COUNTS_CACHE_TTL, SLACK_CONV_INFO_CACHE_TTL, SLACK_THREAD_REPLIES_CACHE_TTL,
+    SLACK_WORKSPACE,
+)
+from .utils import slack_ts_to_iso
 
 # =============================================================================
 # CSV Parsing and Formatting Utilities
@@ -19,38 +36,18 @@ def parse_slack_csv(csv_text):
     if not csv_text:
         return []
     
-    lines = csv_text.strip().split('\n')
-    if len(lines) < 2:
+    reader = csv.reader(io.StringIO(csv_text.strip()))
+    try:
+        headers = [h.strip().lower() for h in next(reader)]
+    except StopIteration:
         return []
     
-    # Parse header
-    headers = lines[0].split(',')
     results = []
-    
-    for line in lines[1:]:
-        if not line.strip():
+    for row in reader:
+        # Skip blank lines and truncated rows, as Slack occasionally emits both
+        if len(row) < len(headers):
             continue
-        # Simple CSV parsing (doesn't handle all edge cases but works for most)
-        values = []
-        current = ''
-        in_quotes = False
-        for char in line:
-            if char == '"' and not in_quotes:
-                in_quotes = True
-            elif char == '"' and in_quotes:
-                in_quotes = False
-            elif char == ',' and not in_quotes:
-                values.append(current.strip().strip('"'))
-                current = ''
-            else:
-                current += char
-        values.append(current.strip().strip('"'))
-        
-        if len(values) >= len(headers):
-            item = {}
-            for i, h in enumerate(headers):
-                item[h.lower()] = values[i] if i < len(values) else ''
-            results.append(item)
+        results.append({h: v.strip() for h, v in zip(headers, row)})
     
     return results
 
@@ -61,8 +58,11 @@ def format_slack_channel(channel, sender_name=''):
         return ''
     
     # Remove leading # if present
-    ch = channel.lstrip('#')
-    
+    return _format_stripped_slack_channel(channel.lstrip('#'), sender_name)
+
+
+def _format_stripped_slack_channel(ch, sender_name=''):
+    """Format a channel name that has already had its leading # removed."""
     # DM channels start with D or are user IDs (U...)
     if ch.startswith('D') or ch.startswith('U'):
         # It's a DM - show as "DM with [name]" or just "DM"
@@ -78,17 +78,30 @@ def format_slack_channel(channel, sender_name=''):
     return f"#{ch}"
 
 
+# Group DM names look like "mpdm-alice--bob--carol-1"
+_MPDM_NAME_RE = re.compile(r'^mpdm-(.*)-1$')
+
+
+def _clean_mpdm_name(name):
+    """Strip the mpdm- prefix and trailing -1 from a group DM name."""
+    match = _MPDM_NAME_RE.match(name)
+    if match:
+        return match.group(1)
+    return name[len('mpdm-'):] if name.startswith('mpdm-') else name
+
+
+# Message permalink template; message IDs drop their dot (1769817144.201689 -> p1769817144201689)
+_SLACK_URL_FMT = 'https://{ws}.slack.com/archives/{ch}/p{ts}'.format
+_DOT_STRIP = str.maketrans('', '', '.')
+
+
 def build_slack_url(channel_id, msg_id):
     """Build a Slack URL to a specific message."""
     if not channel_id or not msg_id:
         return None
     
     # Remove # prefix from channel
-    ch = channel_id.lstrip('#')
-    # Remove dot from message ID (1769817144.201689 -> p1769817144201689)
-    msg_ts = msg_id.replace('.', '')
-    
-    return f"https://{SLACK_WORKSPACE}.slack.com/archives/{ch}/p{msg_ts}"
+    return _SLACK_URL_FMT(ws=SLACK_WORKSPACE, ch=channel_id.lstrip('#'), ts=msg_id.translate(_DOT_STRIP))
 
 
 def format_slack_message(m):
@@ -96,11 +109,17 @@ def format_slack_message(m):
     realname = m.get('realname', '')
     username = m.get('username', '')
     sender = realname or username
-    channel_raw = m.get('channel', '').lstrip('#')
-    channel_display = format_slack_channel(m.get('channel', ''), sender)
+    channel = m.get('channel', '')
+    channel_raw = channel.lstrip('#')
+    channel_display = _format_stripped_slack_channel(channel_raw, sender) if channel else ''
     msg_id = m.get('msgid', '')
     thread_ts = m.get('threadts', '')
     
+    # Same URL as build_slack_url, without re-stripping the channel
+    slack_url = None
+    if channel_raw and msg_id:
+        slack_url = _SLACK_URL_FMT(ws=SLACK_WORKSPACE, ch=channel_raw, ts=msg_id.translate(_DOT_STRIP))
+    
     return {
         'title': m.get('text', '')[:100], 
         'channel': channel_display,
@@ -110,7 +129,7 @@ def format_slack_message(m):
         'time': m.get('time', ''), 
         'from': sender,
         'username': username,  # Added for @username lookups
-        'slack_url': build_slack_url(channel_raw, msg_id)
+        'slack_url': slack_url
     }
 
 # =============================================================================
@@ -118,7 +137,52 @@ def format_slack_message(m):
 # =============================================================================
 
 _slack_tokens = None
-_slack_users_cache = {'data': None, 'timestamp': 0}
+# Request headers derived from the configured tokens, built on first API call
+_slack_headers = None
+_slack_users_cache = {'data': None, 'by_username': None, 'timestamp': 0}
+
+# conversations.info responses by channel ID: {channel_id: (timestamp, response)}.
+# Channel metadata (name, is_im, user) rarely changes within a session.
+_slack_conv_info_cache = {}
+
+# users.info results for users missing from the users cache:
+# {user_id: (timestamp, user_info or None if Slack could not resolve it)}
+_slack_user_info_cache = {}
+
+# users.info errors meaning the ID will not resolve, as opposed to a failed request
+_SLACK_UNKNOWN_USER_ERRORS = ('user_not_found', 'user_not_visible')
+
+# Recently opened threads' formatted conversations.replies results, least
+# recently used first: {(channel_id, thread_ts, limit): (timestamp, messages)}
+SLACK_THREAD_REPLIES_CACHE_SIZE = 64
+_slack_thread_replies_cache = OrderedDict()
+_slack_thread_replies_cache_lock = threading.Lock()
+
+# users.list pages that came with an ETag, for conditional refetches:
+# {cursor: (etag, users_map_page, next_cursor)}
+_slack_users_pages = {}
+
+# Shared read-only default for missing client.counts entries
+_EMPTY = {}
+
+# Single-flight flag for the background users refresh
+_slack_users_refreshing = False
+_slack_users_refresh_lock = threading.Lock()
+
+# client.counts results are near-static over a few seconds and requested by
+# several UI paths per render
+_slack_counts_cache = {'data': None, 'timestamp': 0}
+
+# Authenticated user's ID from auth.test (fixed for the lifetime of a token)
+_slack_self_user_id = None
+
+# Pool for fanning out independent Slack API calls (threads wait on socket I/O)
+SLACK_MAX_WORKERS = 8
+_slack_executor = ThreadPoolExecutor(max_workers=SLACK_MAX_WORKERS, thread_name_prefix="slack-api")
+
+# Shared HTTP session so Slack API calls reuse pooled keep-alive connections
+_slack_session = None
+_slack_session_lock = threading.Lock()
 
 # =============================================================================
 # Token Management
@@ -158,15 +222,94 @@ def get_slack_tokens():
 
 
 def reset_slack_tokens():
-    """Reset cached tokens (for re-loading after config change)."""
-    global _slack_tokens
+    """Reset cached tokens, per-workspace caches and HTTP session (for re-loading after config change)."""
+    global _slack_tokens, _slack_headers, _slack_session, _slack_self_user_id, _slack_users_cache
     _slack_tokens = None
+    _slack_headers = None
+    # The users map (in memory and on disk) belongs to the old token's workspace
+    _slack_users_cache = {'data': None, 'by_username': None, 'timestamp': 0}
+    try:
+        os.remove(SLACK_USERS_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"[Slack] Error removing users cache: {e}")
+    _slack_conv_info_cache.clear()
+    _slack_user_info_cache.clear()
+    _slack_users_pages.clear()
+    with _slack_thread_replies_cache_lock:
+        _slack_thread_replies_cache.clear()
+    reset_slack_counts()
+    _slack_self_user_id = None
+    with _slack_session_lock:
+        if _slack_session is not None:
+            _slack_session.close()
+        _slack_session = None
+
+
+def reset_slack_counts():
+    """Drop cached client.counts so the next call refetches unread state."""
+    global _slack_counts_cache
+    _slack_counts_cache = {'data': None, 'timestamp': 0}
 
 # =============================================================================
 # API Calls
 # =============================================================================
 
-def slack_api_call(method, params=None, post_data=None, xoxc_token=None, xoxd_token=None):
+def _get_slack_session():
+    """Get the shared requests session for Slack API calls, creating it on first use.
+    
+    Connections to slack.com are pooled and kept alive between calls, and
+    idempotent requests are retried on transient 5xx responses.
+    """
+    global _slack_session
+    with _slack_session_lock:
+        if _slack_session is None:
+            session = slack_requests.Session()
+            adapter = slack_requests.adapters.HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=slack_requests.adapters.Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=(500, 502, 503, 504),
+                    raise_on_status=False,
+                ),
+            )
+            session.mount('https://', adapter)
+            _slack_session = session
+        return _slack_session
+
+
+def _build_slack_headers():
+    """Build request headers from the configured tokens and cache them.
+    
+    Returns None (and caches nothing) when no token is configured.
+    """
+    global _slack_headers
+    tokens = get_slack_tokens()
+    
+    if tokens.get('xoxp'):
+        # OAuth mode: single xoxp- user token
+        headers = {
+            'Authorization': f'Bearer {tokens["xoxp"]}',
+            'Content-Type': 'application/json; charset=utf-8',
+        }
+    elif tokens.get('xoxc'):
+        # Legacy mode: xoxc + xoxd session tokens
+        headers = {
+            'Authorization': f'Bearer {tokens["xoxc"]}',
+            'Content-Type': 'application/json; charset=utf-8',
+            'Cookie': f'd={tokens["xoxd"]}'
+        }
+    else:
+        return None
+    
+    _slack_headers = headers
+    return headers
+
+
+def slack_api_call(method, params=None, post_data=None, xoxc_token=None, xoxd_token=None, etag=None):
     """Make a direct Slack API call using requests library.
     
     Supports both OAuth (xoxp-) and legacy (xoxc/xoxd) authentication.
@@ -177,9 +320,13 @@ def slack_api_call(method, params=None, post_data=None, xoxc_token=None, xoxd_to
         post_data: POST body dict (will use POST if provided)
         xoxc_token: Optional override xoxc token (for testing)
         xoxd_token: Optional override xoxd token (for testing)
+        etag: ETag from a previous response to send as If-None-Match, or ''
+            to only collect the ETag; the response's ETag is returned under
+            '_etag'. None (the default) skips ETag handling.
     
     Returns:
-        Parsed JSON response or error dict
+        Parsed JSON response or error dict; {'ok': True, 'not_modified': True}
+        when the server answers 304 to a conditional request
     """
     if not slack_requests:
         return {'ok': False, 'error': 'requests library not installed'}
@@ -192,34 +339,33 @@ def slack_api_call(method, params=None, post_data=None, xoxc_token=None, xoxd_to
             'Cookie': f'd={xoxd_token}'
         }
     else:
-        tokens = get_slack_tokens()
-        
-        if tokens.get('xoxp'):
-            # OAuth mode: single xoxp- user token
-            headers = {
-                'Authorization': f'Bearer {tokens["xoxp"]}',
-                'Content-Type': 'application/json; charset=utf-8',
-            }
-        elif tokens.get('xoxc'):
-            # Legacy mode: xoxc + xoxd session tokens
-            headers = {
-                'Authorization': f'Bearer {tokens["xoxc"]}',
-                'Content-Type': 'application/json; charset=utf-8',
-                'Cookie': f'd={tokens["xoxd"]}'
-            }
-        else:
+        headers = _slack_headers or _build_slack_headers()
+        if not headers:
             return {'ok': False, 'error': 'No Slack token configured'}
     
     url = f'https://slack.com/api/{method}'
+    if etag:
+        headers = {**headers, 'If-None-Match': etag}
     
     try:
+        session = _get_slack_session()
         if post_data:
-            response = slack_requests.post(url, params=params, json=post_data, headers=headers, timeout=30)
+            response = session.post(url, params=params, json=post_data, headers=headers, timeout=30)
         else:
-            response = slack_requests.get(url, params=params, headers=headers, timeout=30)
+            response = session.get(url, params=params, headers=headers, timeout=30)
         
+        if etag and response.status_code == 304:
+            return {'ok': True, 'not_modified': True}
         response.raise_for_status()
-        return response.json()
+        if orjson is not None:
+            result = orjson.loads(response.content)
+        else:
+            result = response.json()
+        if etag is not None:
+            response_etag = response.headers.get('ETag')
+            if isinstance(response_etag, str) and isinstance(result, dict):
+                result['_etag'] = response_etag
+        return result
     except slack_requests.exceptions.HTTPError as e:
         return {'ok': False, 'error': f'HTTP {e.response.status_code}: {e.response.reason}'}
     except slack_requests.exceptions.RequestException as e:
@@ -228,6 +374,20 @@ def slack_api_call(method, params=None, post_data=None, xoxc_token=None, xoxd_to
         return {'ok': False, 'error': str(e)}
 
 
+def get_slack_self_user_id():
+    """Get the authenticated user's ID, calling auth.test only once per token.
+    
+    Returns:
+        User ID string, or None if auth.test fails (retried on the next call)
+    """
+    global _slack_self_user_id
+    if _slack_self_user_id is None:
+        auth_result = slack_api_call('auth.test')
+        if auth_result.get('ok'):
+            _slack_self_user_id = auth_result.get('user_id')
+    return _slack_self_user_id
+
+
 def is_using_oauth_token():
     """Check if we're using an OAuth (xoxp-) token vs legacy session tokens.
     
@@ -241,44 +401,221 @@ def is_using_oauth_token():
 # =============================================================================
 
 def slack_get_users():
-    """Get all workspace users with caching."""
-    global _slack_users_cache
+    """Get all workspace users with caching.
+    
+    After a restart the last complete fetch is served from disk (up to
+    SLACK_USERS_DISK_TTL old). Otherwise a cold cache is filled with the first
+    users.list page and the remaining pages are fetched in a background thread.
+    Once filled, an expired copy is returned immediately while a background
+    thread refreshes it, so callers wait for at most one page.
+    """
+    cache = _slack_users_cache
+    if not cache['data']:
+        # After a restart, serve the last full fetch from disk while it refreshes
+        saved = _load_slack_users_from_disk()
+        if saved:
+            _store_slack_users(saved['users'], saved['timestamp'])
+            cache = _slack_users_cache
+    
+    if cache['data']:
+        if (time.time() - cache['timestamp']) >= SLACK_USERS_CACHE_TTL:
+            _start_users_refresh()
+        return cache['data']
+    
+    now = time.time()
+    users_map, cursor = _fetch_users_page()
+    _store_slack_users(users_map, now)
+    if cursor:
+        _start_users_refresh(cursor=cursor, users_map=users_map, timestamp=now)
+    elif users_map:
+        _save_slack_users_to_disk(users_map, now)
+    return users_map
+
+
+def _slack_user_entry(user):
+    """Reduce a Slack user object to the fields used for display and lookups."""
+    return {
+        'id': user.get('id'),
+        'name': user.get('real_name') or user.get('name', ''),
+        'username': user.get('name', ''),
+        'display_name': user.get('profile', {}).get('display_name', ''),
+        'avatar': user.get('profile', {}).get('image_48', '')
+    }
+
+
+def _lookup_slack_users(user_ids):
+    """Resolve individual users with concurrent users.info calls.
+    
+    Used for IDs missing from the users cache (cold cache or new members),
+    so names show up without waiting on users.list pagination. Results are
+    cached for SLACK_USERS_CACHE_TTL, including IDs Slack reports as unknown
+    (e.g. external or removed users), so those are looked up once per TTL.
     
+    Returns:
+        {user_id: user_info} for the users that resolved
+    """
     now = time.time()
-    if _slack_users_cache['data'] and (now - _slack_users_cache['timestamp']) < SLACK_USERS_CACHE_TTL:
-        return _slack_users_cache['data']
+    found = {}
+    futures = []
+    for user_id in user_ids:
+        cached = _slack_user_info_cache.get(user_id)
+        if cached and (now - cached[0]) < SLACK_USERS_CACHE_TTL:
+            if cached[1] is not None:
+                found[user_id] = cached[1]
+        else:
+            futures.append((user_id, _slack_executor.submit(slack_api_call, 'users.info', {'user': user_id})))
+    
+    for user_id, future in futures:
+        result = future.result()
+        if result.get('ok') and result.get('user'):
+            entry = _slack_user_entry(result['user'])
+            _slack_user_info_cache[user_id] = (now, entry)
+            found[user_id] = entry
+        elif result.get('ok') or result.get('error') in _SLACK_UNKNOWN_USER_ERRORS:
+            # Remember the miss; transport errors are left uncached and retried
+            _slack_user_info_cache[user_id] = (now, None)
+    
+    return found
+
+
+def _fetch_users_page(cursor=None):
+    """Fetch one users.list page.
+    
+    Returns:
+        Tuple of ({user_id: user_info}, next_cursor); next_cursor is None on
+        the last page or on error
+    """
+    # 1000 is the largest page users.list accepts
+    params = {'limit': 1000}
+    if cursor:
+        params['cursor'] = cursor
+    
+    # Revalidate pages seen before so an unchanged page skips the download and parse
+    cached = _slack_users_pages.get(cursor)
+    result = slack_api_call('users.list', params, etag=cached[0] if cached else '')
+    
+    if cached and result.get('not_modified'):
+        return cached[1], cached[2]
+    if not result.get('ok') or result.get('not_modified'):
+        return {}, None
     
     users_map = {}
-    cursor = None
+    for user in result.get('members', []):
+        users_map[user.get('id')] = _slack_user_entry(user)
+    
+    # Check for pagination
+    next_cursor = result.get('response_metadata', {}).get('next_cursor') or None
+    if result.get('_etag'):
+        _slack_users_pages[cursor] = (result['_etag'], users_map, next_cursor)
+    return users_map, next_cursor
+
+
+def _fetch_slack_users(cursor=None):
+    """Fetch workspace users from users.list, following pagination from cursor."""
+    users_map = {}
     
     while True:
-        params = {'limit': 200}
-        if cursor:
-            params['cursor'] = cursor
-        
-        result = slack_api_call('users.list', params)
-        
-        if not result.get('ok'):
-            break
-        
-        for user in result.get('members', []):
-            user_id = user.get('id')
-            users_map[user_id] = {
-                'id': user_id,
-                'name': user.get('real_name') or user.get('name', ''),
-                'username': user.get('name', ''),
-                'display_name': user.get('profile', {}).get('display_name', ''),
-                'avatar': user.get('profile', {}).get('image_48', '')
-            }
-        
-        # Check for pagination
-        cursor = result.get('response_metadata', {}).get('next_cursor')
+        page, cursor = _fetch_users_page(cursor)
+        users_map.update(page)
         if not cursor:
             break
     
-    _slack_users_cache = {'data': users_map, 'timestamp': now}
     return users_map
 
+
+def _store_slack_users(users_map, timestamp):
+    """Replace the users cache (and its username index) in one assignment."""
+    global _slack_users_cache
+    _slack_users_cache = {
+        'data': users_map,
+        'by_username': _index_users_by_username(users_map),
+        'timestamp': timestamp,
+    }
+
+
+def _load_slack_users_from_disk():
+    """Load the users map saved by the last full fetch.
+    
+    Returns:
+        {'timestamp': float, 'users': {...}}, or None if missing, unreadable
+        or older than SLACK_USERS_DISK_TTL
+    """
+    try:
+        if not os.path.exists(SLACK_USERS_FILE):
+            return None
+        with open(SLACK_USERS_FILE, 'rb') as f:
+            raw = f.read()
+        saved = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if not isinstance(saved, dict) or not saved.get('users'):
+            return None
+        if (time.time() - saved.get('timestamp', 0)) >= SLACK_USERS_DISK_TTL:
+            return None
+        return saved
+    except Exception as e:
+        logger.error(f"[Slack] Error loading users cache: {e}")
+        return None
+
+
+def _save_slack_users_to_disk(users_map, timestamp):
+    """Save a complete users map to disk, replacing the previous copy atomically."""
+    try:
+        tmp_path = SLACK_USERS_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'timestamp': timestamp, 'users': users_map}, f)
+        os.replace(tmp_path, SLACK_USERS_FILE)
+    except Exception as e:
+        logger.error(f"[Slack] Error saving users cache: {e}")
+
+
+def _start_users_refresh(cursor=None, users_map=None, timestamp=None):
+    """Update the users cache in a background thread unless one is already running.
+    
+    With a cursor, the remaining pages after it are merged into users_map;
+    otherwise every page is refetched.
+    """
+    global _slack_users_refreshing
+    with _slack_users_refresh_lock:
+        if _slack_users_refreshing:
+            return
+        _slack_users_refreshing = True
+    threading.Thread(
+        target=_refresh_users_in_background, args=(cursor, users_map, timestamp),
+        daemon=True, name="slack-users-refresh"
+    ).start()
+
+
+def _refresh_users_in_background(cursor=None, users_map=None, timestamp=None):
+    """Thread target for _start_users_refresh."""
+    global _slack_users_refreshing
+    try:
+        if cursor:
+            merged = dict(users_map)
+            merged.update(_fetch_slack_users(cursor))
+            _store_slack_users(merged, timestamp)
+            _save_slack_users_to_disk(merged, timestamp)
+        else:
+            now = time.time()
+            refreshed = _fetch_slack_users()
+            # Keep serving the stale users if the refresh came back empty
+            if refreshed:
+                _store_slack_users(refreshed, now)
+                _save_slack_users_to_disk(refreshed, now)
+    except Exception as e:
+        logger.error(f"[Slack] Background users refresh failed: {e}")
+    finally:
+        with _slack_users_refresh_lock:
+            _slack_users_refreshing = False
+
+
+def _index_users_by_username(users):
+    """Map lowercased usernames to user info, keeping the first user per name."""
+    by_username = {}
+    for user_info in users.values():
+        username = user_info.get('username')
+        if username:
+            by_username.setdefault(username.lower(), user_info)
+    return by_username
+
 # =============================================================================
 # Unread Counts
 # =============================================================================
@@ -301,38 +638,145 @@ def slack_get_unread_counts():
         logger.debug("[Slack] Skipping client.counts (not available with OAuth tokens)")
         return {'ims': [], 'channels': [], 'mpims': [], 'threads': {}}
     
+    global _slack_counts_cache
+    
+    now = time.time()
+    if _slack_counts_cache['data'] and (now - _slack_counts_cache['timestamp']) < SLACK_COUNTS_CACHE_TTL:
+        return _slack_counts_cache['data']
+    
     result = slack_api_call('client.counts', post_data={})
     
     if not result.get('ok'):
         return {'ims': [], 'channels': [], 'mpims': [], 'threads': {}}
     
-    return {
+    counts = {
         'ims': result.get('ims', []),
         'channels': result.get('channels', []),
         'mpims': result.get('mpims', []),
         'threads': result.get('threads', {})
     }
+    _slack_counts_cache = {'data': counts, 'timestamp': now}
+    return counts
 
 # =============================================================================
 # Timestamp Conversion
 # =============================================================================
 
-def slack_ts_to_iso(ts):
-    """Convert Slack timestamp to ISO format."""
-    if not ts:
-        return ''
+def _slack_ts_float(ts):
+    """Convert a Slack timestamp to a float for ordering (0.0 when missing or invalid)."""
     try:
-        # Slack ts is Unix timestamp with microseconds (e.g., 1769780915.474229)
-        ts_float = float(ts)
-        dt = datetime.fromtimestamp(ts_float)
-        return dt.isoformat()
+        return float(ts or 0)
     except (ValueError, TypeError):
-        return ''
+        return 0.0
 
 # =============================================================================
 # Conversations
 # =============================================================================
 
+def _fetch_conversation_infos(channel_ids):
+    """Call conversations.info for several channels concurrently.
+    
+    Successful responses are cached for SLACK_CONV_INFO_CACHE_TTL, so only
+    channels not seen recently hit the API.
+    
+    Returns:
+        List of (channel_id, response) tuples in the order of channel_ids
+    """
+    now = time.time()
+    responses = {}
+    futures = []
+    for channel_id in channel_ids:
+        cached = _slack_conv_info_cache.get(channel_id)
+        if cached and (now - cached[0]) < SLACK_CONV_INFO_CACHE_TTL:
+            responses[channel_id] = cached[1]
+        else:
+            futures.append(
+                (channel_id, _slack_executor.submit(slack_api_call, 'conversations.info', {'channel': channel_id}))
+            )
+    
+    for channel_id, future in futures:
+        info = future.result()
+        if info.get('ok'):
+            _slack_conv_info_cache[channel_id] = (now, info)
+        responses[channel_id] = info
+    
+    return [(channel_id, responses[channel_id]) for channel_id in channel_ids]
+
+
+def _list_conversations(types, limit):
+    """Return the first page of conversations.list for the given types ([] on error)."""
+    result = slack_api_call('conversations.list', {
+        'types': types,
+        'limit': limit,
+        'exclude_archived': 'true'
+    })
+    if not result.get('ok'):
+        return []
+    return result.get('channels', [])
+
+
+def _resolve_conversations(channel_ids, chan_map):
+    """Look up channel objects locally, falling back to conversations.info for misses.
+    
+    Returns:
+        List of (channel_id, channel) tuples in the order of channel_ids,
+        skipping channels that could not be resolved
+    """
+    missing = [channel_id for channel_id in channel_ids if channel_id not in chan_map]
+    fetched = {
+        channel_id: info.get('channel', {})
+        for channel_id, info in _fetch_conversation_infos(missing)
+        if info.get('ok')
+    }
+    resolved = []
+    for channel_id in channel_ids:
+        if channel_id in chan_map:
+            resolved.append((channel_id, chan_map[channel_id]))
+        elif channel_id in fetched:
+            resolved.append((channel_id, fetched[channel_id]))
+    return resolved
+
+
+def _conversation_entry(conv_id, conv, unread_info, users, is_channel=False):
+    """Build a conversation list entry from a channel object and its client.counts info.
+    
+    Returns:
+        Tuple of (entry, raw latest Slack timestamp for sorting)
+    """
+    unread = unread_info.get('mention_count', 0) or (1 if unread_info.get('has_unreads') else 0)
+    latest_ts = unread_info.get('latest', '')
+    if not latest_ts:
+        updated = conv.get('updated', 0)
+        if updated:
+            latest_ts = str(updated / 1000 if updated > 1e12 else updated)
+    
+    username = ''
+    if is_channel:
+        name = f"#{conv.get('name', conv_id)}"
+        conv_type = icon = 'channel'
+    elif conv.get('is_im'):
+        user_id = conv.get('user', '')
+        user_info = users.get(user_id, _EMPTY)
+        name = user_info.get('real_name') or user_info.get('name') or user_id
+        username = user_info.get('name', '')
+        conv_type, icon = 'dm', 'dm'
+    else:
+        name = _clean_mpdm_name(conv.get('name', ''))
+        conv_type, icon = 'group_dm', 'group'
+    
+    return {
+        'channel_id': conv_id,
+        'name': name,
+        'username': username,
+        'type': conv_type,
+        'unread_count': unread,
+        'is_member': conv.get('is_member', True) if is_channel else True,
+        'latest_ts': slack_ts_to_iso(latest_ts) if latest_ts else '',
+        'latest_message': '',
+        'icon': icon
+    }, latest_ts
+
+
 def slack_get_conversations_fast(limit=20, unread_only=False):
     """Get conversations sorted by date descending.
     
@@ -343,9 +787,36 @@ def slack_get_conversations_fast(limit=20, unread_only=False):
     Returns:
         List of conversations sorted by date descending
     """
-    conversations = []
-    users = slack_get_users()  # Cached
-    seen_ids = set()
+    # Conversations keyed by channel ID; the first section to add an ID wins.
+    # Raw Slack timestamps are kept alongside as floats for sorting.
+    by_id = {}
+    sort_ts = {}
+    
+    def _put(entry, ts):
+        conv_id = entry['channel_id']
+        if conv_id not in by_id:
+            by_id[conv_id] = entry
+            sort_ts[conv_id] = _slack_ts_float(ts)
+    
+    # Users, client.counts and the conversations.list calls are independent,
+    # so users and the lists run on the pool while client.counts is fetched here.
+    # Unread mode only needs users when a 1:1 DM has unreads, so it waits until
+    # that is known instead of prefetching.
+    users_future = None if unread_only else _slack_executor.submit(slack_get_users)  # Cached
+    
+    # Channel objects from conversations.list resolve unread IDs without a
+    # conversations.info round-trip each. Recent mode needs these lists anyway;
+    # unread mode makes one wide call instead.
+    if unread_only:
+        list_futures = [
+            _slack_executor.submit(_list_conversations, 'im,mpim,public_channel,private_channel', 200),
+        ]
+    else:
+        list_futures = [
+            _slack_executor.submit(_list_conversations, 'im', 30),
+            _slack_executor.submit(_list_conversations, 'mpim', 30),
+            _slack_executor.submit(_list_conversations, 'public_channel,private_channel', 30),
+        ]
     
     # Get unread info from client.counts
     counts_data = slack_get_unread_counts()
@@ -354,6 +825,18 @@ def slack_get_conversations_fast(limit=20, unread_only=False):
     all_ims = {im['id']: im for im in counts_data.get('ims', [])}
     all_mpims = {m['id']: m for m in counts_data.get('mpims', [])}
     all_channels = {ch['id']: ch for ch in counts_data.get('channels', [])}
+    # IDs are disjoint across the three buckets, so one map serves every lookup
+    counts_by_id = {**all_ims, **all_mpims, **all_channels}
+    
+    listed_by_type = [future.result() for future in list_futures]
+    if unread_only:
+        recent_dms = recent_channels = []
+        listed = listed_by_type[0]
+    else:
+        recent_dms = listed_by_type[0] + listed_by_type[1]
+        recent_channels = listed_by_type[2]
+        listed = recent_dms + recent_channels
+    chan_map = {conv.get('id', ''): conv for conv in listed}
     
     # 1. Add Threads
     threads = counts_data.get('threads', {})
@@ -363,7 +846,7 @@ def slack_get_conversations_fast(limit=20, unread_only=False):
     # Only add threads if it has unreads OR we're in recent mode
     if thread_unreads > 0 or not unread_only:
         if thread_unreads > 0 or thread_ts:  # Has activity
-            conversations.append({
+            _put({
                 'channel_id': 'threads',
                 'name': 'Threads',
                 'username': '',
@@ -373,8 +856,7 @@ def slack_get_conversations_fast(limit=20, unread_only=False):
                 'latest_ts': slack_ts_to_iso(thread_ts) if thread_ts else '',
                 'latest_message': f'{thread_unreads} unread replies' if thread_unreads > 0 else '',
                 'icon': 'thread'
-            })
-            seen_ids.add('threads')
+            }, thread_ts)
     
     # 2. Get DMs with unreads (these might not be in conversations.list)
     unread_dm_ids = [id for id, info in all_ims.items() 
@@ -382,177 +864,49 @@ def slack_get_conversations_fast(limit=20, unread_only=False):
     unread_dm_ids += [id for id, info in all_mpims.items() 
                      if info.get('has_unreads') or info.get('mention_count', 0) > 0]
     
-    for dm_id in unread_dm_ids[:20]:
-        if dm_id in seen_ids:
-            continue
-        
-        info = slack_api_call('conversations.info', {'channel': dm_id})
-        if not info.get('ok'):
-            continue
-        
-        ch = info.get('channel', {})
-        seen_ids.add(dm_id)
-        
-        # Get unread info
-        unread_info = all_ims.get(dm_id) or all_mpims.get(dm_id) or {}
-        unread = unread_info.get('mention_count', 0) or (1 if unread_info.get('has_unreads') else 0)
-        latest_ts = unread_info.get('latest', '')
-        
-        if not latest_ts:
-            updated = ch.get('updated', 0)
-            if updated:
-                latest_ts = str(updated / 1000 if updated > 1e12 else updated)
-        
-        # Determine type and name
-        if ch.get('is_im'):
-            user_id = ch.get('user', '')
-            user_info = users.get(user_id, {})
-            name = user_info.get('real_name') or user_info.get('name') or user_id
-            conv_type = 'dm'
-        elif ch.get('is_mpim'):
-            name = ch.get('name', '').replace('mpdm-', '').replace('-1', '')
-            conv_type = 'group_dm'
-        else:
-            continue
-        
-        conversations.append({
-            'channel_id': dm_id,
-            'name': name,
-            'username': users.get(ch.get('user', ''), {}).get('name', '') if ch.get('is_im') else '',
-            'type': conv_type,
-            'unread_count': unread,
-            'is_member': True,
-            'latest_ts': slack_ts_to_iso(latest_ts) if latest_ts else '',
-            'latest_message': '',
-            'icon': 'dm' if conv_type == 'dm' else 'group'
-        })
-    
-    # 3. Get recent DMs from conversations.list (for recent activity without unreads)
-    if not unread_only:
-        for conv_type_str in ['im', 'mpim']:
-            result = slack_api_call('conversations.list', {
-                'types': conv_type_str,
-                'limit': 30,
-                'exclude_archived': 'true'
-            })
-            if not result.get('ok'):
-                continue
-            
-            for conv in result.get('channels', []):
-                conv_id = conv.get('id', '')
-                if conv_id in seen_ids:
-                    continue
-                seen_ids.add(conv_id)
-                
-                # Get unread info
-                unread_info = all_ims.get(conv_id) or all_mpims.get(conv_id) or {}
-                unread = unread_info.get('mention_count', 0) or (1 if unread_info.get('has_unreads') else 0)
-                
-                # Get timestamp
-                latest_ts = unread_info.get('latest', '')
-                if not latest_ts:
-                    updated = conv.get('updated', 0)
-                    if updated:
-                        latest_ts = str(updated / 1000 if updated > 1e12 else updated)
-                
-                # Determine name
-                if conv.get('is_im'):
-                    user_id = conv.get('user', '')
-                    user_info = users.get(user_id, {})
-                    name = user_info.get('real_name') or user_info.get('name') or user_id
-                    ctype = 'dm'
-                else:
-                    name = conv.get('name', '').replace('mpdm-', '').replace('-1', '')
-                    ctype = 'group_dm'
-                
-                conversations.append({
-                    'channel_id': conv_id,
-                    'name': name,
-                    'username': users.get(conv.get('user', ''), {}).get('name', '') if conv.get('is_im') else '',
-                    'type': ctype,
-                    'unread_count': unread,
-                    'is_member': True,
-                    'latest_ts': slack_ts_to_iso(latest_ts) if latest_ts else '',
-                    'latest_message': '',
-                    'icon': 'dm' if ctype == 'dm' else 'group'
-                })
-    
-    # 4. Get channels
+    unread_dms = _resolve_conversations(
+        [dm_id for dm_id in unread_dm_ids[:20] if dm_id not in by_id], chan_map
+    )
+    
+    # Resolve DM partners missing from the users cache with users.info
+    dm_user_ids = {ch.get('user') for _, ch in unread_dms if ch.get('is_im')}
+    dm_user_ids.update(conv.get('user') for conv in recent_dms if conv.get('is_im'))
+    if users_future is not None:
+        users = users_future.result()
+    elif dm_user_ids:
+        users = slack_get_users()
+    else:
+        users = _EMPTY
+    unknown_user_ids = sorted(uid for uid in dm_user_ids if uid and uid not in users)
+    if unknown_user_ids:
+        users = ChainMap(_lookup_slack_users(unknown_user_ids), users)
+    
+    # 3. Add the unread DMs, then recent DMs from conversations.list (for
+    # recent activity without unreads), in one pass
+    dm_sources = [(dm_id, ch) for dm_id, ch in unread_dms if ch.get('is_im') or ch.get('is_mpim')]
+    dm_sources += [(conv.get('id', ''), conv) for conv in recent_dms]
+    for conv_id, conv in dm_sources:
+        _put(*_conversation_entry(conv_id, conv, counts_by_id.get(conv_id, _EMPTY), users))
+    
+    # 4. Get channels: only those with unreads, or the recent ones
     if unread_only:
-        # Only channels with unreads
         unread_channel_ids = [id for id, info in all_channels.items() 
                              if info.get('has_unreads') or info.get('mention_count', 0) > 0]
-        
-        for ch_id in unread_channel_ids[:15]:
-            if ch_id in seen_ids:
-                continue
-            
-            info = slack_api_call('conversations.info', {'channel': ch_id})
-            if not info.get('ok'):
-                continue
-            
-            ch = info.get('channel', {})
-            seen_ids.add(ch_id)
-            
-            ch_info = all_channels.get(ch_id, {})
-            unread = ch_info.get('mention_count', 0) or (1 if ch_info.get('has_unreads') else 0)
-            latest_ts = ch_info.get('latest', '')
-            
-            conversations.append({
-                'channel_id': ch_id,
-                'name': f"#{ch.get('name', ch_id)}",
-                'username': '',
-                'type': 'channel',
-                'unread_count': unread,
-                'is_member': ch.get('is_member', True),
-                'latest_ts': slack_ts_to_iso(latest_ts) if latest_ts else '',
-                'latest_message': '',
-                'icon': 'channel'
-            })
+        channel_sources = _resolve_conversations(
+            [ch_id for ch_id in unread_channel_ids[:15] if ch_id not in by_id], chan_map
+        )
     else:
-        # Recent channels
-        result = slack_api_call('conversations.list', {
-            'types': 'public_channel,private_channel',
-            'limit': 30,
-            'exclude_archived': 'true'
-        })
-        if result.get('ok'):
-            for conv in result.get('channels', []):
-                conv_id = conv.get('id', '')
-                if conv_id in seen_ids:
-                    continue
-                seen_ids.add(conv_id)
-                
-                ch_info = all_channels.get(conv_id, {})
-                unread = ch_info.get('mention_count', 0) or (1 if ch_info.get('has_unreads') else 0)
-                
-                latest_ts = ch_info.get('latest', '')
-                if not latest_ts:
-                    updated = conv.get('updated', 0)
-                    if updated:
-                        latest_ts = str(updated / 1000 if updated > 1e12 else updated)
-                
-                conversations.append({
-                    'channel_id': conv_id,
-                    'name': f"#{conv.get('name', '')}",
-                    'username': '',
-                    'type': 'channel',
-                    'unread_count': unread,
-                    'is_member': conv.get('is_member', True),
-                    'latest_ts': slack_ts_to_iso(latest_ts) if latest_ts else '',
-                    'latest_message': '',
-                    'icon': 'channel'
-                })
-    
+        channel_sources = [(conv.get('id', ''), conv) for conv in recent_channels]
+    for conv_id, conv in channel_sources:
+        _put(*_conversation_entry(conv_id, conv, counts_by_id.get(conv_id, _EMPTY), users, is_channel=True))
+
     # 5. Sort ALL by timestamp descending (most recent first)
     # But keep Threads at top if it has unreads
     def sort_key(item):
-        # Threads with unreads always first (sort key starts with 'Z' which is > 'A' for reverse=True)
-        if item.get('channel_id') == 'threads' and item.get('unread_count', 0) > 0:
-            return 'Z_9999-99-99'  # Will sort first with reverse=True
-        # Everything else by timestamp descending  
-        return 'A_' + (item.get('latest_ts', '') or '0000-00-00')
+        pinned = item['channel_id'] == 'threads' and item.get('unread_count', 0) > 0
+        return (pinned, sort_ts[item['channel_id']])
     
+    conversations = list(by_id.values())
     conversations.sort(key=sort_key, reverse=True)
     
     return conversations[:limit]
@@ -577,7 +931,8 @@ def slack_get_conversation_history_direct(channel_id, limit=30):
     Returns:
         List of messages with user info
     """
-    users = slack_get_users()
+    # Fetch users on the pool so a cold users cache overlaps the history call
+    users_future = _slack_executor.submit(slack_get_users)
     
     result = slack_api_call('conversations.history', {
         'channel': channel_id,
@@ -592,12 +947,9 @@ def slack_get_conversation_history_direct(channel_id, limit=30):
         return {'status': 'error', 'message': error}
     
     messages = []
-    my_user_id = None
-    
     # Try to get current user ID
-    auth_result = slack_api_call('auth.test')
-    if auth_result.get('ok'):
-        my_user_id = auth_result.get('user_id')
+    my_user_id = get_slack_self_user_id()
+    users = users_future.result()
     
     for msg in result.get('messages', []):
         user_id = msg.get('user', '')
@@ -697,7 +1049,15 @@ def slack_get_thread_replies(channel_id, thread_ts, limit=50):
     Returns:
         List of messages in the thread
     """
-    users = slack_get_users()
+    key = (channel_id, thread_ts, limit)
+    with _slack_thread_replies_cache_lock:
+        cached = _slack_thread_replies_cache.get(key)
+        if cached and (time.time() - cached[0]) < SLACK_THREAD_REPLIES_CACHE_TTL:
+            _slack_thread_replies_cache.move_to_end(key)
+            return cached[1]
+    
+    # Fetch users on the pool so a cold users cache overlaps the replies call
+    users_future = _slack_executor.submit(slack_get_users)
     
     result = slack_api_call('conversations.replies', {
         'channel': channel_id,
@@ -711,8 +1071,8 @@ def slack_get_thread_replies(channel_id, thread_ts, limit=50):
     messages = []
     
     # Get current user ID
-    auth_result = slack_api_call('auth.test')
-    my_user_id = auth_result.get('user_id') if auth_result.get('ok') else None
+    my_user_id = get_slack_self_user_id()
+    users = users_future.result()
     
     for msg in result.get('messages', []):
         user_id = msg.get('user', '')
@@ -732,6 +1092,11 @@ def slack_get_thread_replies(channel_id, thread_ts, limit=50):
             'reply_count': msg.get('reply_count', 0)
         })
     
+    with _slack_thread_replies_cache_lock:
+        _slack_thread_replies_cache[key] = (time.time(), messages)
+        _slack_thread_replies_cache.move_to_end(key)
+        while len(_slack_thread_replies_cache) > SLACK_THREAD_REPLIES_CACHE_SIZE:
+            _slack_thread_replies_cache.popitem(last=False)
     return messages
 
 # =============================================================================
@@ -762,6 +1127,14 @@ def slack_send_message_direct(channel_id, text, thread_ts=None):
     if not result.get('ok'):
         return {'success': False, 'error': result.get('error', 'Failed to send message')}
     
+    # Posting marks the conversation read on Slack's side
+    reset_slack_counts()
+    if thread_ts:
+        # Let the next replies fetch include this message
+        with _slack_thread_replies_cache_lock:
+            for key in [key for key in _slack_thread_replies_cache if key[:2] == (channel_id, thread_ts)]:
+                del _slack_thread_replies_cache[key]
+    
     return {
         'success': True,
         'ts': result.get('ts'),
@@ -799,13 +1172,14 @@ def slack_find_user_by_username(username):
         User info dict or None
     """
     users = slack_get_users()
-    username_lower = username.lower().lstrip('@')
     
-    for user_id, user_info in users.items():
-        if user_info.get('username', '').lower() == username_lower:
-            return user_info
+    # Use the index built alongside the users cache when it matches this map
+    cache = _slack_users_cache
+    by_username = cache.get('by_username')
+    if by_username is None or cache.get('data') is not users:
+        by_username = _index_users_by_username(users)
     
-    return None
+    return by_username.get(username.lower().lstrip('@'))
 
 
 def slack_mark_conversation_read(channel_id, ts):
@@ -823,4 +1197,8 @@ def slack_mark_conversation_read(channel_id, ts):
         'ts': ts
     })
     
+    if result.get('ok'):
+        # Unread badges must reflect the read marker on the next render
+        reset_slack_counts()
+    
     return {'success': result.get('ok', False)}
@@ -2,11 +2,26 @@
 
 import json
 import os
+import re
 import shutil
 import tempfile
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Characters that matter when matching the end of a JSON array; everything
+# else is skipped by the regex engine instead of a per-character Python loop.
+_JSON_ARRAY_TOKEN_RE = re.compile(r'[\[\]"\\]')
+
+# CLI/MCP status lines that may contain brackets but never start the JSON output
+_JSON_STATUS_LINE_RE = re.compile(r'MCP tool|Connecting to|connected|✓ Output|Warning:')
+
 
 def extract_json_array(text):
     """
@@ -16,56 +31,57 @@ def extract_json_array(text):
     """
     # Find first '[' that starts a potential JSON array (skip lines with MCP tool output markers)
     start_idx = -1
-    lines = text.split('\n')
-    char_count = 0
-    
-    for line in lines:
-        # Skip status lines that might contain brackets
-        if any(skip in line for skip in ['MCP tool', 'Connecting to', 'connected', '✓ Output', 'Warning:']):
-            char_count += len(line) + 1
-            continue
-        
-        # Look for line starting with '[' (JSON array start)
-        stripped = line.strip()
-        if stripped.startswith('['):
-            start_idx = char_count + line.index('[')
+    pos = 0
+    n = len(text)
+    while pos <= n:
+        nl = text.find('\n', pos)
+        line_end = n if nl == -1 else nl
+        line = text[pos:line_end]
+        # Look for line starting with '[' (JSON array start), skipping status
+        # lines that might contain brackets
+        if line.lstrip().startswith('[') and not _JSON_STATUS_LINE_RE.search(line):
+            start_idx = pos + line.index('[')
             break
-        char_count += len(line) + 1
-    
+        pos = line_end + 1
+
     if start_idx == -1:
         return None
-    
-    # Now find the matching closing bracket using bracket counting
+
+    # Now find the matching closing bracket, jumping between structural characters
     bracket_count = 0
     in_string = False
-    escape_next = False
-    end_idx = start_idx
-    
-    for i, char in enumerate(text[start_idx:], start=start_idx):
-        if escape_next:
-            escape_next = False
-            continue
+    end_idx = -1
+    search = _JSON_ARRAY_TOKEN_RE.search
+    i = start_idx
+    while True:
+        m = search(text, i)
+        if m is None:
+            break
+        j = m.start()
+        char = text[j]
         if char == '\\':
-            escape_next = True
+            i = j + 2
             continue
-        if char == '"' and not escape_next:
+        i = j + 1
+        if char == '"':
             in_string = not in_string
+        elif in_string:
             continue
-        if in_string:
-            continue
-        if char == '[':
+        elif char == '[':
             bracket_count += 1
-        elif char == ']':
+        else:
             bracket_count -= 1
             if bracket_count == 0:
-                end_idx = i + 1
+                end_idx = i
                 break
-    
-    if bracket_count != 0:
+
+    if end_idx == -1:
         return None
-    
+
     json_str = text[start_idx:end_idx]
     try:
+        if orjson is not None:
+            return orjson.loads(json_str)
         return json.loads(json_str)
     except json.JSONDecodeError:
         return None
@@ -83,18 +99,16 @@ def copy_db(src):
         base_name = os.path.basename(src)
         tmp_path = os.path.join(tmp_dir, base_name)
         
-        # Copy main database
-        shutil.copy2(src, tmp_path)
-        
-        # Copy WAL file if exists (contains recent uncommitted changes)
-        wal_src = src + "-wal"
-        if os.path.exists(wal_src):
-            shutil.copy2(wal_src, tmp_path + "-wal")
+        # Copy main database. copyfile skips the metadata copy2 also does and
+        # uses the kernel copy fast path (fcopyfile/sendfile) where available.
+        shutil.copyfile(src, tmp_path)
         
-        # Copy SHM file if exists (shared memory index)
-        shm_src = src + "-shm"
-        if os.path.exists(shm_src):
-            shutil.copy2(shm_src, tmp_path + "-shm")
+        # Copy WAL (recent uncommitted changes) and SHM (shared memory index) if they exist
+        for suffix in ("-wal", "-shm"):
+            try:
+                shutil.copyfile(src + suffix, tmp_path + suffix)
+            except FileNotFoundError:
+                pass
         
         return tmp_path
     except Exception as e:
@@ -114,11 +128,16 @@ def slack_ts_to_iso(ts):
     """Convert Slack timestamp (e.g., '1682441907.012379') to ISO format."""
     if not ts:
         return ''
+    return _slack_ts_to_iso(str(ts))
+
+
+@lru_cache(maxsize=4096)
+def _slack_ts_to_iso(ts):
+    """Memoized body of slack_ts_to_iso; the same timestamps recur across views."""
     try:
         # Slack timestamps are Unix timestamps with microseconds after the dot
-        timestamp = float(str(ts).split('.')[0])
-        return datetime.fromtimestamp(timestamp).isoformat()
-    except (ValueError, TypeError):
+        return datetime.fromtimestamp(float(ts)).isoformat()
+    except (ValueError, TypeError, OverflowError, OSError):
         return ''
 
 
@@ -128,8 +147,9 @@ def is_night_hours():
     return hour >= 22 or hour < 6
 
 
+@lru_cache(maxsize=4096)
 def extract_domain(url):
-    """Extract domain from URL for matching."""
+    """Extract domain from URL for matching (memoized; bookmarks share hosts)."""
     try:
         parsed = urlparse(url)
         return parsed.netloc.lower().replace('www.', '')
@@ -137,24 +157,29 @@ def extract_domain(url):
         return ''
 
 
-def score_result(result, query, query_words):
-    """Score a search result based on relevance to the query."""
+def _score_lowered(result, title, url, query_lower, query_words):
+    """Score a result whose title/url and query are already lowercased.
+    
+    Runs once per candidate, so the word checks are plain loops rather than
+    all()/sum() over generator expressions, which cost a generator frame each.
+    """
     score = 0
-    title = result.get('title', '').lower()
-    url = result.get('url', '').lower()
-    query_lower = query.lower()
     
     # Exact match in title
     if query_lower in title:
         score += 100
     
     # All words present in title
-    if all(word in title for word in query_words):
+    for word in query_words:
+        if word not in title:
+            break
+    else:
         score += 50
     
     # Words in URL
-    words_in_url = sum(1 for word in query_words if word in url)
-    score += words_in_url * 10
+    for word in query_words:
+        if word in url:
+            score += 10
     
     # Visit count boost
     visit_count = result.get('visit_count', 0)
@@ -177,6 +202,54 @@ def score_result(result, query, query_words):
     return score
 
 
+def score_result(result, query, query_words):
+    """Score a search result based on relevance to the query."""
+    return _score_lowered(
+        result,
+        result.get('title', '').lower(),
+        result.get('url', '').lower(),
+        query.lower(),
+        query_words,
+    )
+
+
+def max_score(query_words, visit_counts=True, timestamps=False):
+    """
+    Upper bound of score_result for a query.
+    
+    Args:
+        query_words: Query words passed to score_result
+        visit_counts: Whether results may carry a visit_count boost
+        timestamps: Whether results may carry a timestamp recency boost
+    """
+    best = 100 + 50 + 10 * len(query_words)
+    if visit_counts:
+        best += 50
+    if timestamps:
+        best += 20
+    return best
+
+
+def score_results(results, query, query_words):
+    """
+    Score many search results against one query.
+    
+    Same scoring as score_result, but the per-query state (lowercased query,
+    word tuple) is computed once instead of once per result. Words are
+    checked longest first: longer words are rarer, so the all-words title
+    check usually fails on its first substring search.
+    
+    Yields:
+        (score, result) tuples in input order
+    """
+    query_lower = query.lower()
+    query_words = tuple(sorted(query_words, key=len, reverse=True))
+    for r in results:
+        title = r.get('title', '').lower()
+        url = r.get('url', '').lower()
+        yield _score_lowered(r, title, url, query_lower, query_words), r
+
+
 def format_time_ago(timestamp):
     """Format a timestamp as a human-readable 'time ago' string."""
     if not timestamp:
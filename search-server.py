@@ -9,15 +9,20 @@ import os
 import re
 import sys
 import time
-import pickle
 import urllib.request
 import urllib.error
 import traceback
-from datetime import datetime, timedelta
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from socketserver import ThreadingMixIn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add lib to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -27,7 +32,8 @@ from lib.config import (
     SAFARI_HISTORY, SAFARI_BOOKMARKS, CHROME_HISTORY, CHROME_BOOKMARKS,
     HELIUM_HISTORY, HELIUM_BOOKMARKS, DIA_HISTORY, DIA_BOOKMARKS,
     SCOPES, GOOGLE_API_AVAILABLE, CACHE_TTL, PREP_CACHE_TTL,
-    Request, Credentials, InstalledAppFlow, build,
+    GOOGLE_DRIVE_BASE,
+    Request, Credentials, InstalledAppFlow, update_user_config,
 )
 
 from lib.utils import (
@@ -35,13 +41,13 @@ from lib.utils import (
 )
 
 from lib.cache import (
-    _calendar_cache,
+    _calendar_cache, _calendar_refresh_lock, calendar_cache_ttl,
     load_custom_prompts, save_custom_prompts,
     get_prompt, set_custom_prompt, reset_prompt, get_all_prompts,
     load_prep_cache_from_disk, save_prep_cache_to_disk,
     get_meeting_cache, set_meeting_cache,
     is_cache_valid, has_cached_data, get_cached_data,
-    set_meeting_info, get_meeting_info,
+    set_meeting_info, get_meeting_info, record_source_hit,
 )
 
 from lib.slack import (
@@ -59,7 +65,7 @@ from lib.google_services import (
     authenticate_google, get_meeting_by_id, search_google_drive,
     get_oauth_url, handle_oauth_callback,
     has_oauth_credentials, is_google_authenticated, disconnect_google,
-    get_granted_scopes,
+    get_granted_scopes, load_google_token, save_google_token, calendar_service,
 )
 
 from lib.cli import (
@@ -81,6 +87,139 @@ from lib.history import (
     search_dia_history, search_safari_history,
 )
 
+# Partial-response projection for the hub calendar: only the event fields read below
+CALENDAR_LIST_FIELDS = (
+    'items(id,summary,start,end,location,description,hangoutLink,'
+    'conferenceData(entryPoints(entryPointType,uri)),'
+    'attendees(email,displayName,self))'
+)
+
+# Meeting links looked for in event text when there is no video entry point,
+# in priority order
+MEETING_LINK_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'https://meet\.google\.com/[a-z-]+',
+    r'https://zoom\.us/j/\d+[^\s]*',
+    r'https://[a-z0-9]+\.zoom\.us/j/\d+[^\s]*',
+    r'https://teams\.microsoft\.com/l/meetup-join/[^\s<>]+',
+))
+
+# AI search prompt fragments per source, built once. Instructions are
+# emitted in this dict order regardless of the order sources were requested.
+_AI_SEARCH_DRIVE_PATH = GOOGLE_DRIVE_BASE or "~/Library/CloudStorage/GoogleDrive-*"
+
+AI_SEARCH_INSTRUCTIONS = {
+    'slack': """
+SLACK SEARCH INSTRUCTIONS:
+When searching for conversations with a specific person:
+1. FIRST use channels_list with channel_types: "im" to find their 1:1 DM channel
+2. THEN use conversations_history with that channel_id to get recent messages
+3. ALSO use conversations_search_messages for broader searches in channels
+ALWAYS check 1:1 DMs when searching for discussions with specific people.
+""",
+    'jira': """
+JIRA SEARCH INSTRUCTIONS:
+1. FIRST call "Get Accessible Atlassian Resources" to get the cloudId - do NOT ask the user for it
+2. THEN use that cloudId for all Jira searches (e.g., "Search Jira issues using JQL")
+3. Use JQL queries like: text ~ "keyword" OR summary ~ "keyword" ORDER BY updated DESC
+4. NEVER ask the user for cloudId or site URL - discover it automatically with step 1
+""",
+    'confluence': """
+CONFLUENCE SEARCH INSTRUCTIONS:
+1. FIRST call "Get Accessible Atlassian Resources" to get the cloudId - do NOT ask the user for it
+2. THEN use that cloudId for all Confluence searches (e.g., "Search Confluence Using CQL")
+3. Use CQL queries like: text ~ "keyword" OR title ~ "keyword" ORDER BY lastmodified DESC
+4. NEVER ask the user for cloudId or site URL - discover it automatically with step 1
+""",
+    'drive': f"""
+GOOGLE DRIVE SEARCH INSTRUCTIONS:
+1. Use find_files or search_files to search for documents in the local Google Drive folder
+2. Search path: {_AI_SEARCH_DRIVE_PATH}/My Drive/
+3. Use patterns like: {_AI_SEARCH_DRIVE_PATH}/My Drive/**/*keyword* to find files matching keywords
+4. For links, convert filenames to Google Drive search URLs:
+   - Extract just the filename (without path and extension)
+   - URL encode spaces as +
+   - Return as: https://drive.google.com/drive/search?q=FILENAME
+   - Example: "My Document.gdoc" -> https://drive.google.com/drive/search?q=My+Document
+""",
+}
+
+AI_SEARCH_STREAM_INSTRUCTIONS = {
+    'slack': "\nSLACK: Use channels_list with channel_types: 'im' to find DMs, then conversations_history for messages.",
+    'jira': "\nJIRA: FIRST call 'Get Accessible Atlassian Resources' for cloudId, THEN search.",
+    'confluence': "\nCONFLUENCE: FIRST call 'Get Accessible Atlassian Resources' for cloudId, THEN search.",
+    'drive': f"\nDRIVE: Search files in {_AI_SEARCH_DRIVE_PATH}/My Drive/",
+    'github': """
+GITHUB SEARCH INSTRUCTIONS:
+1. Search code, issues, and PRs in PARALLEL (call all three simultaneously)
+2. Use search qualifiers: language:, path:, is:open, repo:owner/name
+3. For results, include rich detail:
+   - PRs: link as [PR #N: Title](url), include status (open/merged), author, description
+   - Issues: link as [Issue #N: Title](url), include status, labels
+   - Code: link as [repo/path/file.ts](url), describe what the code does, show key snippets
+   - Repos: link as [owner/repo](url)
+4. Show relevant code snippets in fenced code blocks when they help answer the question
+5. Always use full GitHub URLs: https://github.com/owner/repo/...
+""",
+}
+
+AI_SEARCH_SOURCE_NAMES = {
+    source: source.title()
+    for source in ('slack', 'jira', 'confluence', 'gmail', 'drive', 'github')
+}
+
+
+def _ai_search_prompt_parts(sources, instructions):
+    """Return (source names, instruction block) for an AI search prompt."""
+    source_names = ', '.join([AI_SEARCH_SOURCE_NAMES.get(s) or s.title() for s in sources])
+    wanted = frozenset(sources)
+    source_instructions = ''.join([text for source, text in instructions.items() if source in wanted])
+    return source_names, source_instructions
+
+
+def _parse_iso_utc(value):
+    """Parse an ISO 8601 time ('Z', offset or naive-as-UTC) into a naive UTC datetime."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _dump_json(data):
+    """Serialize a response body to UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(data).encode()
+
+
+def _probe_safari_history():
+    """Read one row of Safari's History.db; raises if Full Disk Access is missing.
+    
+    immutable=1 skips SQLite's locking, and SELECT 1 stops at the first row
+    instead of counting the table.
+    """
+    import sqlite3
+    conn = sqlite3.connect(f"file:{SAFARI_HISTORY}?mode=ro&immutable=1", uri=True)
+    try:
+        conn.execute("SELECT 1 FROM history_items LIMIT 1").fetchone()
+    finally:
+        conn.close()
+
+
+_SSE_EVENT_END = b"\n\n"
+
+
+@lru_cache(maxsize=64)
+def _sse_prefix(event_type):
+    """Encoded 'event: <type>' / 'data: ' header for a server-sent event type."""
+    return f"event: {event_type}\ndata: ".encode()
+
+
+# safari_enabled from config.json, keyed by the file's mtime: (mtime_ns, enabled)
+_safari_config_cache = (None, False)
+
 
 class SearchHandler(BaseHTTPRequestHandler):
     """HTTP request handler for all BriefDesk endpoints."""
@@ -89,13 +228,22 @@ class SearchHandler(BaseHTTPRequestHandler):
         """Suppress default logging."""
         pass
     
+    # Pre-encoded bodies for static responses
+    _NOT_FOUND_BODY = b'{"error":"Not found"}'
+    _EMPTY_LIST_BODY = b'[]'
+    
     def send_json(self, data):
         """Send JSON response with CORS headers."""
+        self._send_raw(_dump_json(data))
+    
+    def _send_raw(self, body):
+        """Send an already-encoded JSON body with CORS headers."""
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
@@ -105,6 +253,77 @@ class SearchHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
     
+    # GET routes by exact path; each entry calls the handler with what it needs
+    _GET_ROUTES = {
+        "/search": lambda handler, path, params: handler.handle_search(params),
+        "/calendar": lambda handler, path, params: handler.handle_calendar(params),
+        "/calendar/status": lambda handler, path, params: handler.handle_calendar_status(),
+        "/debug": lambda handler, path, params: handler.handle_debug(),
+        # Hub endpoints
+        "/hub/prep/week": lambda handler, path, params: handler.handle_prep_week(),
+        "/hub/meeting-prep": lambda handler, path, params: handler.handle_prep_meeting(params),
+        "/hub/prep/meeting": lambda handler, path, params: handler.handle_prep_meeting(params),
+        "/hub/prep/all": lambda handler, path, params: handler.handle_prep_all(params),
+        "/hub/meeting/summary": lambda handler, path, params: handler.handle_meeting_summary(params),
+        "/hub/status": lambda handler, path, params: handler.handle_hub_status(),
+        "/hub/prefetch-status": lambda handler, path, params: handler.handle_prefetch_status(),
+        "/hub/service-health": lambda handler, path, params: handler.handle_service_health(),
+        "/hub/prefetch/control": lambda handler, path, params: handler.handle_prefetch_control(params),
+        "/hub/mcp-reauth": lambda handler, path, params: handler.handle_mcp_reauth(params),
+        "/hub/restart-search-service": lambda handler, path, params: handler.handle_restart_search_service(),
+        "/hub/prompts": lambda handler, path, params: handler.handle_get_prompts(),
+        "/hub/batch": lambda handler, path, params: handler.handle_batch(params),
+        # Slack endpoints
+        "/slack/conversations": lambda handler, path, params: handler.handle_slack_conversations(params),
+        "/slack/history": lambda handler, path, params: handler.handle_slack_history(params),
+        "/slack/threads": lambda handler, path, params: handler.handle_slack_threads(params),
+        "/slack/thread": lambda handler, path, params: handler.handle_slack_thread(params),
+        "/slack/mark-read": lambda handler, path, params: handler.handle_slack_mark_read(params),
+        # Setup page
+        "/setup": lambda handler, path, params: handler.handle_setup_page(),
+        # OAuth endpoints
+        "/oauth/google/start": lambda handler, path, params: handler.handle_oauth_google_start(),
+        "/oauth/callback": lambda handler, path, params: handler.handle_oauth_callback(params),
+        "/oauth/google/status": lambda handler, path, params: handler.handle_oauth_google_status(),
+        "/oauth/google/disconnect": lambda handler, path, params: handler.handle_oauth_google_disconnect(),
+        "/oauth/slack/start": lambda handler, path, params: handler.handle_oauth_slack_start(),
+        "/oauth/slack/status": lambda handler, path, params: handler.handle_oauth_slack_status(),
+        "/oauth/slack/disconnect": lambda handler, path, params: handler.handle_oauth_slack_disconnect(),
+        "/oauth/atlassian/start": lambda handler, path, params: handler.handle_oauth_atlassian_start(),
+        "/oauth/atlassian/status": lambda handler, path, params: handler.handle_oauth_atlassian_status(),
+        "/oauth/atlassian/disconnect": lambda handler, path, params: handler.handle_oauth_atlassian_disconnect(),
+        # Installer endpoints
+        "/installer": lambda handler, path, params: handler.handle_installer_page(),
+        "/installer/check": lambda handler, path, params: handler.handle_installer_check(params),
+        "/installer/system-info": lambda handler, path, params: handler.handle_installer_system_info(),
+        "/installer/check-fda": lambda handler, path, params: handler.handle_installer_check_fda(),
+        "/slack/auto-detect": lambda handler, path, params: handler.handle_slack_auto_detect(),
+    }
+    
+    # GET routes by path prefix, checked in order when no exact route matches
+    _GET_PREFIX_ROUTES = (
+        ("/hub/prep/", lambda handler, path, params: handler.handle_prep_source(path, params)),
+        ("/oauth/slack/callback", lambda handler, path, params: handler.handle_oauth_slack_callback(params)),
+    )
+    
+    # POST routes by exact path
+    _POST_ROUTES = {
+        "/slack/send": lambda handler, path, data: handler.handle_slack_send(data),
+        "/hub/prompts": lambda handler, path, data: handler.handle_set_prompt(data),
+        "/hub/settings": lambda handler, path, data: handler.handle_hub_settings(data),
+        "/hub/ai-search": lambda handler, path, data: handler.handle_ai_search(data),
+        "/hub/ai-search-stream": lambda handler, path, data: handler.handle_ai_search_stream(data),
+        # Setup endpoints
+        "/setup/slack": lambda handler, path, data: handler.handle_setup_slack(data),
+        "/setup/github": lambda handler, path, data: handler.handle_setup_github(data),
+        "/setup/github/oauth/start": lambda handler, path, data: handler.handle_github_oauth_start(data),
+        "/setup/github/oauth/poll": lambda handler, path, data: handler.handle_github_oauth_poll(data),
+        # Settings endpoints
+        "/settings/safari": lambda handler, path, data: handler.handle_settings_safari(data),
+        # Installer endpoints
+        "/installer/install": lambda handler, path, data: handler.handle_installer_install(data),
+    }
+    
     def do_GET(self):
         """Handle GET requests."""
         parsed = urlparse(self.path)
@@ -112,91 +331,13 @@ class SearchHandler(BaseHTTPRequestHandler):
         params = parse_qs(parsed.query)
         
         # Route to appropriate handler
-        if path == "/search":
-            self.handle_search(params)
-        elif path == "/calendar":
-            self.handle_calendar(params)
-        elif path == "/calendar/status":
-            self.handle_calendar_status()
-        elif path == "/debug":
-            self.handle_debug()
-        # Hub endpoints
-        elif path == "/hub/prep/week":
-            self.handle_prep_week()
-        elif path in ("/hub/meeting-prep", "/hub/prep/meeting"):
-            self.handle_prep_meeting(params)
-        elif path == "/hub/prep/all":
-            self.handle_prep_all(params)
-        elif path.startswith("/hub/prep/"):
-            self.handle_prep_source(path, params)
-        elif path == "/hub/meeting/summary":
-            self.handle_meeting_summary(params)
-        elif path == "/hub/status":
-            self.handle_hub_status()
-        elif path == "/hub/prefetch-status":
-            self.handle_prefetch_status()
-        elif path == "/hub/service-health":
-            self.handle_service_health()
-        elif path == "/hub/prefetch/control":
-            self.handle_prefetch_control(params)
-        elif path == "/hub/mcp-reauth":
-            self.handle_mcp_reauth(params)
-        elif path == "/hub/restart-search-service":
-            self.handle_restart_search_service()
-        elif path == "/hub/prompts":
-            self.handle_get_prompts()
-        elif path == "/hub/batch":
-            self.handle_batch(params)
-        # Slack endpoints
-        elif path == "/slack/conversations":
-            self.handle_slack_conversations(params)
-        elif path == "/slack/history":
-            self.handle_slack_history(params)
-        elif path == "/slack/threads":
-            self.handle_slack_threads(params)
-        elif path == "/slack/thread":
-            self.handle_slack_thread(params)
-        elif path == "/slack/mark-read":
-            self.handle_slack_mark_read(params)
-        # Setup page
-        elif path == "/setup":
-            self.handle_setup_page()
-        # OAuth endpoints
-        elif path == "/oauth/google/start":
-            self.handle_oauth_google_start()
-        elif path == "/oauth/callback":
-            self.handle_oauth_callback(params)
-        elif path == "/oauth/google/status":
-            self.handle_oauth_google_status()
-        elif path == "/oauth/google/disconnect":
-            self.handle_oauth_google_disconnect()
-        elif path == "/oauth/slack/start":
-            self.handle_oauth_slack_start()
-        elif path.startswith("/oauth/slack/callback"):
-            self.handle_oauth_slack_callback(params)
-        elif path == "/oauth/slack/status":
-            self.handle_oauth_slack_status()
-        elif path == "/oauth/slack/disconnect":
-            self.handle_oauth_slack_disconnect()
-        elif path == "/oauth/atlassian/start":
-            self.handle_oauth_atlassian_start()
-        elif path == "/oauth/atlassian/status":
-            self.handle_oauth_atlassian_status()
-        elif path == "/oauth/atlassian/disconnect":
-            self.handle_oauth_atlassian_disconnect()
-        # Installer endpoints
-        elif path == "/installer":
-            self.handle_installer_page()
-        elif path == "/installer/check":
-            self.handle_installer_check(params)
-        elif path == "/installer/system-info":
-            self.handle_installer_system_info()
-        elif path == "/installer/check-fda":
-            self.handle_installer_check_fda()
-        elif path == "/slack/auto-detect":
-            self.handle_slack_auto_detect()
+        route = self._GET_ROUTES.get(path)
+        if route is None:
+            route = next((r for prefix, r in self._GET_PREFIX_ROUTES if path.startswith(prefix)), None)
+        if route is not None:
+            route(self, path, params)
         else:
-            self.send_json({"error": "Not found"})
+            self._send_raw(self._NOT_FOUND_BODY)
     
     def do_POST(self):
         """Handle POST requests."""
@@ -212,33 +353,11 @@ class SearchHandler(BaseHTTPRequestHandler):
         except json.JSONDecodeError:
             data = {}
         
-        if path == "/slack/send":
-            self.handle_slack_send(data)
-        elif path == "/hub/prompts":
-            self.handle_set_prompt(data)
-        elif path == "/hub/settings":
-            self.handle_hub_settings(data)
-        elif path == "/hub/ai-search":
-            self.handle_ai_search(data)
-        elif path == "/hub/ai-search-stream":
-            self.handle_ai_search_stream(data)
-        # Setup endpoints
-        elif path == "/setup/slack":
-            self.handle_setup_slack(data)
-        elif path == "/setup/github":
-            self.handle_setup_github(data)
-        elif path == "/setup/github/oauth/start":
-            self.handle_github_oauth_start(data)
-        elif path == "/setup/github/oauth/poll":
-            self.handle_github_oauth_poll(data)
-        # Settings endpoints
-        elif path == "/settings/safari":
-            self.handle_settings_safari(data)
-        # Installer endpoints
-        elif path == "/installer/install":
-            self.handle_installer_install(data)
+        route = self._POST_ROUTES.get(path)
+        if route is not None:
+            route(self, path, data)
         else:
-            self.send_json({"error": "Not found"})
+            self._send_raw(self._NOT_FOUND_BODY)
     
     def handle_hub_settings(self, data):
         """Handle hub settings update (model selection, etc)."""
@@ -252,37 +371,38 @@ class SearchHandler(BaseHTTPRequestHandler):
         self.send_json({"success": True, "model": get_hub_model()})
     
     def _is_safari_enabled(self):
-        """Check if Safari history search is enabled in config."""
+        """Check if Safari history search is enabled in config.
+        
+        The config is only re-read when its mtime changes, so /search pays
+        one stat instead of a read and JSON parse per request.
+        """
+        global _safari_config_cache
         config_path = os.path.join(CONFIG_DIR, 'config.json')
         try:
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                return config.get('safari_enabled', False)
+            mtime = os.stat(config_path).st_mtime_ns
+        except OSError:
+            return False
+        
+        cached_mtime, enabled = _safari_config_cache
+        if cached_mtime == mtime:
+            return enabled
+        
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+            enabled = config.get('safari_enabled', False)
         except Exception:
-            pass
-        return False
+            enabled = False
+        _safari_config_cache = (mtime, enabled)
+        return enabled
     
     def handle_settings_safari(self, data):
         """Handle Safari history toggle -- saves to config and checks FDA."""
         enabled = data.get('enabled', False)
-        config_path = os.path.join(CONFIG_DIR, 'config.json')
-        
-        # Read existing config
-        config = {}
-        try:
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-        except Exception:
-            pass
-        
-        config['safari_enabled'] = enabled
         
         # Save config
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            update_user_config({'safari_enabled': enabled})
         except Exception as e:
             logger.error(f"Failed to save safari setting: {e}")
             self.send_json({"error": str(e)})
@@ -292,11 +412,7 @@ class SearchHandler(BaseHTTPRequestHandler):
         fda_granted = False
         if enabled:
             try:
-                import sqlite3
-                safari_db = os.path.expanduser("~/Library/Safari/History.db")
-                conn = sqlite3.connect(f"file:{safari_db}?mode=ro", uri=True)
-                conn.execute("SELECT COUNT(*) FROM history_items LIMIT 1")
-                conn.close()
+                _probe_safari_history()
                 fda_granted = True
             except Exception:
                 fda_granted = False
@@ -319,53 +435,7 @@ class SearchHandler(BaseHTTPRequestHandler):
         logger.info(f"[AI Search] Query: '{query}' | Sources: {sources}")
         
         # Build the search prompt
-        source_names = ', '.join([s.title() for s in sources])
-        
-        # Add source-specific instructions
-        source_instructions = ""
-        
-        if 'slack' in sources:
-            source_instructions += """
-SLACK SEARCH INSTRUCTIONS:
-When searching for conversations with a specific person:
-1. FIRST use channels_list with channel_types: "im" to find their 1:1 DM channel
-2. THEN use conversations_history with that channel_id to get recent messages
-3. ALSO use conversations_search_messages for broader searches in channels
-ALWAYS check 1:1 DMs when searching for discussions with specific people.
-"""
-        
-        if 'jira' in sources:
-            source_instructions += """
-JIRA SEARCH INSTRUCTIONS:
-1. FIRST call "Get Accessible Atlassian Resources" to get the cloudId - do NOT ask the user for it
-2. THEN use that cloudId for all Jira searches (e.g., "Search Jira issues using JQL")
-3. Use JQL queries like: text ~ "keyword" OR summary ~ "keyword" ORDER BY updated DESC
-4. NEVER ask the user for cloudId or site URL - discover it automatically with step 1
-"""
-        
-        if 'confluence' in sources:
-            source_instructions += """
-CONFLUENCE SEARCH INSTRUCTIONS:
-1. FIRST call "Get Accessible Atlassian Resources" to get the cloudId - do NOT ask the user for it
-2. THEN use that cloudId for all Confluence searches (e.g., "Search Confluence Using CQL")
-3. Use CQL queries like: text ~ "keyword" OR title ~ "keyword" ORDER BY lastmodified DESC
-4. NEVER ask the user for cloudId or site URL - discover it automatically with step 1
-"""
-        
-        if 'drive' in sources:
-            from lib.config import GOOGLE_DRIVE_BASE
-            drive_path = GOOGLE_DRIVE_BASE or "~/Library/CloudStorage/GoogleDrive-*"
-            source_instructions += f"""
-GOOGLE DRIVE SEARCH INSTRUCTIONS:
-1. Use find_files or search_files to search for documents in the local Google Drive folder
-2. Search path: {drive_path}/My Drive/
-3. Use patterns like: {drive_path}/My Drive/**/*keyword* to find files matching keywords
-4. For links, convert filenames to Google Drive search URLs:
-   - Extract just the filename (without path and extension)
-   - URL encode spaces as +
-   - Return as: https://drive.google.com/drive/search?q=FILENAME
-   - Example: "My Document.gdoc" -> https://drive.google.com/drive/search?q=My+Document
-"""
+        source_names, source_instructions = _ai_search_prompt_parts(sources, AI_SEARCH_INSTRUCTIONS)
         
         prompt = f"""Search {source_names} to answer this question: {query}
 {source_instructions}
@@ -436,32 +506,7 @@ The auth middleware is implemented in [ai-companion/src/middleware/AuthMiddlewar
         logger.info(f"[AI Search Stream] Query: '{query}' | Sources: {sources}")
         
         # Build the search prompt (same as non-streaming)
-        source_names = ', '.join([s.title() for s in sources])
-        source_instructions = ""
-        
-        if 'slack' in sources:
-            source_instructions += "\nSLACK: Use channels_list with channel_types: 'im' to find DMs, then conversations_history for messages."
-        if 'jira' in sources:
-            source_instructions += "\nJIRA: FIRST call 'Get Accessible Atlassian Resources' for cloudId, THEN search."
-        if 'confluence' in sources:
-            source_instructions += "\nCONFLUENCE: FIRST call 'Get Accessible Atlassian Resources' for cloudId, THEN search."
-        if 'drive' in sources:
-            from lib.config import GOOGLE_DRIVE_BASE
-            drive_path = GOOGLE_DRIVE_BASE or "~/Library/CloudStorage/GoogleDrive-*"
-            source_instructions += f"\nDRIVE: Search files in {drive_path}/My Drive/"
-        if 'github' in sources:
-            source_instructions += """
-GITHUB SEARCH INSTRUCTIONS:
-1. Search code, issues, and PRs in PARALLEL (call all three simultaneously)
-2. Use search qualifiers: language:, path:, is:open, repo:owner/name
-3. For results, include rich detail:
-   - PRs: link as [PR #N: Title](url), include status (open/merged), author, description
-   - Issues: link as [Issue #N: Title](url), include status, labels
-   - Code: link as [repo/path/file.ts](url), describe what the code does, show key snippets
-   - Repos: link as [owner/repo](url)
-4. Show relevant code snippets in fenced code blocks when they help answer the question
-5. Always use full GitHub URLs: https://github.com/owner/repo/...
-"""
+        source_names, source_instructions = _ai_search_prompt_parts(sources, AI_SEARCH_STREAM_INSTRUCTIONS)
         
         prompt = f"""Search {source_names} for: {query}
 {source_instructions}
@@ -479,8 +524,7 @@ Add a **Sources** section at the end listing all referenced links."""
         
         def send_event(event_type, data):
             try:
-                event_str = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-                self.wfile.write(event_str.encode())
+                self.wfile.write(_sse_prefix(event_type) + _dump_json(data) + _SSE_EVENT_END)
                 self.wfile.flush()
             except Exception as e:
                 logger.error(f"[AI Search Stream] Failed to send event: {e}")
@@ -505,7 +549,7 @@ Add a **Sources** section at the end listing all referenced links."""
         """Handle browser history/bookmarks search."""
         query = params.get("q", [""])[0].lower().strip()
         if not query:
-            self.send_json([])
+            self._send_raw(self._EMPTY_LIST_BODY)
             return
         
         limit = int(params.get("limit", ["10"])[0])
@@ -525,20 +569,30 @@ Add a **Sources** section at the end listing all referenced links."""
         
         now = time.time()
         # Return cached data if fresh enough (unless force refresh)
-        if not force_refresh and _calendar_cache["data"] and (now - _calendar_cache["timestamp"]) < CACHE_TTL:
+        if not force_refresh and _calendar_cache["data"] and (now - _calendar_cache["timestamp"]) < _calendar_cache.get("ttl", CACHE_TTL):
             self.send_json(_calendar_cache["data"])
             return
         
         try:
-            events = self.get_upcoming_events_google(minutes, limit)
-            # Check if the response contains an auth error
-            if events.get("error"):
-                error = events["error"]
-                if error in ("not_authenticated", "invalid_token", "auth_failed") or "401" in str(events.get("detail", "")).lower():
-                    self.send_json({"events": [], "in_meeting": False, "current_meeting": None, "auth_error": True, "error": "Calendar authentication expired. Please re-authenticate."})
-                    return
-            _calendar_cache["data"] = events
-            _calendar_cache["timestamp"] = now
+            auth_error = False
+            # Single-flight: concurrent misses wait for one fetch instead of each calling Google
+            with _calendar_refresh_lock:
+                cached = _calendar_cache["data"]
+                if cached and _calendar_cache["timestamp"] >= now:
+                    # Another request refreshed the cache while we waited
+                    events = cached
+                else:
+                    events = self.get_upcoming_events_google(minutes, limit)
+                    # Check if the response contains an auth error
+                    error = events.get("error")
+                    auth_error = bool(error) and (error in ("not_authenticated", "invalid_token", "auth_failed") or "401" in str(events.get("detail", "")).lower())
+                    if not auth_error:
+                        _calendar_cache["data"] = events
+                        _calendar_cache["timestamp"] = time.time()
+                        _calendar_cache["ttl"] = calendar_cache_ttl(events)
+            if auth_error:
+                self.send_json({"events": [], "in_meeting": False, "current_meeting": None, "auth_error": True, "error": "Calendar authentication expired. Please re-authenticate."})
+                return
             self.send_json(events)
         except Exception as e:
             error_str = str(e).lower()
@@ -561,8 +615,8 @@ Add a **Sources** section at the end listing all referenced links."""
         else:
             self.send_json({"status": "ready"})
     
-    def get_google_calendar_service(self):
-        """Get authenticated Google Calendar service."""
+    def get_google_calendar_creds(self):
+        """Get valid Google Calendar credentials, refreshing them if expired."""
         if not GOOGLE_API_AVAILABLE:
             return None, "missing_libraries"
         
@@ -570,25 +624,22 @@ Add a **Sources** section at the end listing all referenced links."""
             return None, "not_authenticated"
         
         try:
-            with open(TOKEN_PATH, 'rb') as token:
-                creds = pickle.load(token)
+            creds = load_google_token()
         except Exception:
             return None, "invalid_token"
         
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 creds.refresh(Request())
-                with open(TOKEN_PATH, 'wb') as token:
-                    pickle.dump(creds, token)
+                save_google_token(creds)
             else:
                 return None, "not_authenticated"
         
-        service = build('calendar', 'v3', credentials=creds)
-        return service, None
+        return creds, None
     
     def get_upcoming_events_google(self, minutes_ahead=180, limit=3):
         """Get upcoming events from Google Calendar API."""
-        service, error = self.get_google_calendar_service()
+        creds, error = self.get_google_calendar_creds()
         if error:
             return {"error": error}
         
@@ -600,14 +651,16 @@ Add a **Sources** section at the end listing all referenced links."""
             time_max = (now + timedelta(minutes=minutes_ahead)).isoformat() + 'Z'
             
             # Request more events than needed since we filter out ended ones
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max(20, limit * 3),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            with calendar_service(creds) as service:
+                events_result = service.events().list(
+                    calendarId='primary',
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    maxResults=max(20, limit * 3),
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=CALENDAR_LIST_FIELDS
+                ).execute()
             
             raw_events = events_result.get('items', [])
             
@@ -618,33 +671,23 @@ Add a **Sources** section at the end listing all referenced links."""
             in_meeting = False
             current_meetings = []
             
+            # Offset for converting UTC to local time for display
+            tz_delta = local_now - now
+            
             for event in raw_events:
                 start = event['start'].get('dateTime', event['start'].get('date'))
                 if 'T' not in start:
                     continue  # Skip all-day events
                 
                 # Parse times - Google returns ISO format with timezone
-                # Convert to UTC naive datetime for consistent comparison
-                if start.endswith('Z'):
-                    start_utc = datetime.fromisoformat(start.replace('Z', ''))
-                elif '+' in start or (start.count('-') > 2):
-                    # Has timezone offset like +00:00 or -05:00
-                    start_parsed = datetime.fromisoformat(start)
-                    # Convert to UTC by subtracting offset
-                    start_utc = start_parsed.replace(tzinfo=None) - start_parsed.utcoffset()
-                else:
-                    start_utc = datetime.fromisoformat(start)
-                
+                # Convert to UTC naive datetime for consistent comparison.
+                # End first, so events that already ended cost a single parse.
                 end = event['end'].get('dateTime', event['end'].get('date'))
-                end_utc = None
-                if end and 'T' in end:
-                    if end.endswith('Z'):
-                        end_utc = datetime.fromisoformat(end.replace('Z', ''))
-                    elif '+' in end or (end.count('-') > 2):
-                        end_parsed = datetime.fromisoformat(end)
-                        end_utc = end_parsed.replace(tzinfo=None) - end_parsed.utcoffset()
-                    else:
-                        end_utc = datetime.fromisoformat(end)
+                end_utc = _parse_iso_utc(end) if end and 'T' in end else None
+                if end_utc and end_utc < now:
+                    continue
+                
+                start_utc = _parse_iso_utc(start)
                 
                 # Compare in UTC
                 minutes_until = int((start_utc - now).total_seconds() / 60)
@@ -660,9 +703,6 @@ Add a **Sources** section at the end listing all referenced links."""
                         if minutes_until >= -10:
                             in_grace_period = True
                 
-                if end_utc and (end_utc - now).total_seconds() < 0:
-                    continue
-                
                 # Extract meeting link
                 meet_link = None
                 if 'conferenceData' in event:
@@ -677,14 +717,8 @@ Add a **Sources** section at the end listing all referenced links."""
                         event.get('location', ''),
                         event.get('hangoutLink', '')
                     ]))
-                    patterns = [
-                        r'https://meet\.google\.com/[a-z-]+',
-                        r'https://zoom\.us/j/\d+[^\s]*',
-                        r'https://[a-z0-9]+\.zoom\.us/j/\d+[^\s]*',
-                        r'https://teams\.microsoft\.com/l/meetup-join/[^\s<>]+',
-                    ]
-                    for pattern in patterns:
-                        match = re.search(pattern, search_text, re.IGNORECASE)
+                    for pattern in MEETING_LINK_PATTERNS:
+                        match = pattern.search(search_text)
                         if match:
                             meet_link = match.group(0)
                             break
@@ -698,8 +732,8 @@ Add a **Sources** section at the end listing all referenced links."""
                     })
                 
                 # Convert UTC to local time for display
-                start_local = start_utc + (local_now - now)
-                end_local = end_utc + (local_now - now) if end_utc else None
+                start_local = start_utc + tz_delta
+                end_local = end_utc + tz_delta if end_utc else None
                 
                 evt_data = {
                     'id': event.get('id', ''),
@@ -839,6 +873,8 @@ Add a **Sources** section at the end listing all referenced links."""
                     result[source] = cached.get('summary', '') or None
                 else:
                     result[source] = cached or []
+                if cached is not None:
+                    record_source_hit(source)
             else:
                 result[source] = None
                 result['all_cached'] = False
@@ -865,6 +901,8 @@ Add a **Sources** section at the end listing all referenced links."""
         # Check cache first (unless refresh requested)
         if not refresh and has_cached_data(meeting_id, source):
             cached = get_cached_data(meeting_id, source)
+            if cached is not None:
+                record_source_hit(source)
             # Return array directly for sources, or string for summary
             if source == 'summary':
                 self.send_json(cached or '')
@@ -904,11 +942,13 @@ Add a **Sources** section at the end listing all referenced links."""
             # Cache and return in expected format: {"summary": "...", "status": "..."}
             response = {"summary": summary_text or '', "status": status if summary_text else 'empty'}
             set_meeting_cache(meeting_id, source, response)
+            record_source_hit(source)
             self.send_json(response)
         else:
             items = call_cli_for_source(source, title, attendees_str, description, attendee_emails=attendee_emails)
             # Cache the result
             set_meeting_cache(meeting_id, source, items if items else [])
+            record_source_hit(source)
             # Return array directly (frontend expects array, not {items: []})
             self.send_json(items or [])
     
@@ -953,15 +993,15 @@ Add a **Sources** section at the end listing all referenced links."""
             status = get_prefetch_status()
             auth_status = check_services_auth()
 
-            # Actually test calendar credentials by trying to get the service
+            # Actually test calendar credentials by loading (and refreshing) them
             calendar_configured = os.path.exists(CREDENTIALS_PATH)
             calendar_authenticated = False
             calendar_error = None
 
             if os.path.exists(TOKEN_PATH):
                 try:
-                    service, error = self.get_google_calendar_service()
-                    if service:
+                    creds, error = self.get_google_calendar_creds()
+                    if creds:
                         calendar_authenticated = True
                     else:
                         calendar_error = error or "auth_failed"
@@ -1572,13 +1612,8 @@ Add a **Sources** section at the end listing all referenced links."""
         
         # Test Python FDA by trying to read Safari history
         try:
-            safari_history = os.path.expanduser("~/Library/Safari/History.db")
-            if os.path.exists(safari_history):
-                conn = sqlite3.connect(f"file:{safari_history}?mode=ro", uri=True)
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM history_items LIMIT 1")
-                cursor.fetchone()
-                conn.close()
+            if os.path.exists(SAFARI_HISTORY):
+                _probe_safari_history()
                 python_fda = True
         except (sqlite3.OperationalError, PermissionError) as e:
             logger.info(f"[FDA Check] Python FDA not granted: {e}")
@@ -1686,15 +1721,8 @@ Add a **Sources** section at the end listing all referenced links."""
 
     def _save_config_value(self, key, value):
         """Save a key-value pair to config.json."""
-        config_path = os.path.join(CONFIG_DIR, 'config.json')
         try:
-            config = {}
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-            config[key] = value
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            update_user_config({key: value})
             logger.info(f"[Config] Saved {key}={value}")
         except Exception as e:
             logger.error(f"[Config] Failed to save {key}: {e}")
@@ -8,6 +8,7 @@ These tests cover:
 
 Run with: pytest tests/test_cli_calendar.py -v
 """
+import json
 import sys
 import os
 import pytest
@@ -1908,6 +1909,14 @@ MCP tool [started]
         result = extract_json_array(text)
         assert result == [{"actual": "data"}]
 
+    def test_skips_bracketed_status_lines(self):
+        """Test that status lines starting with a bracket are not taken as the array."""
+        from search_server_funcs import extract_json_array
+        
+        text = '[Warning: cache miss]\n  [MCP tool] connected\n[{"actual": "data"}]'
+        result = extract_json_array(text)
+        assert result == [{"actual": "data"}]
+
     def test_handles_unicode_content(self):
         """Test handling of unicode in JSON."""
         from search_server_funcs import extract_json_array
@@ -1916,6 +1925,39 @@ MCP tool [started]
         result = extract_json_array(text)
         assert result == [{"emoji": "🎉", "text": "café"}]
 
+    def test_ignores_brackets_inside_strings(self):
+        """Test that brackets and escaped quotes inside strings don't end the array."""
+        from search_server_funcs import extract_json_array
+        
+        text = '[{"text": "a ] b [", "quote": "say \\"]\\" now"}]\ntrailing ]'
+        result = extract_json_array(text)
+        assert result == [{"text": "a ] b [", "quote": 'say "]" now'}]
+
+    def test_returns_none_for_unclosed_array(self):
+        """Test that an array without a matching close bracket returns None."""
+        from search_server_funcs import extract_json_array
+        
+        text = 'MCP tool ready\n[{"id": 1}, {"id": 2}'
+        result = extract_json_array(text)
+        assert result is None
+
+    def test_returns_none_for_malformed_array(self):
+        """Test that a balanced but malformed array returns None."""
+        from search_server_funcs import extract_json_array
+        
+        text = '[{"id": 1,}, {id: 2}]'
+        result = extract_json_array(text)
+        assert result is None
+
+    def test_handles_large_output(self):
+        """Test extraction from a large dump with a long preamble."""
+        from search_server_funcs import extract_json_array
+        
+        items = [{"id": i, "text": "x" * 50} for i in range(2000)]
+        text = 'Warning: [slow]\n' * 500 + json.dumps(items) + '\nDone'
+        result = extract_json_array(text)
+        assert result == items
+
 
 # =============================================================================
 # Additional helper function tests
@@ -8,6 +8,7 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock, mock_open, PropertyMock
 from datetime import datetime, timedelta
+import json
 import pickle
 
 # Add tests directory to path for importing the helper module
@@ -43,11 +44,11 @@ class TestAuthenticateGoogle:
             captured = capsys.readouterr()
             assert "Credentials file not found" in captured.out
     
-    @patch('lib.google_services.pickle.dump')
+    @patch('lib.google_services.save_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.InstalledAppFlow')
     @patch('lib.google_services.os.path.exists')
-    def test_successful_oauth_flow(self, mock_exists, mock_flow_class, mock_file, mock_pickle, capsys):
+    def test_successful_oauth_flow(self, mock_exists, mock_flow_class, mock_file, mock_save_token, capsys):
         """Test successful OAuth authentication flow."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             # Setup mocks
@@ -64,16 +65,16 @@ class TestAuthenticateGoogle:
             assert result is True
             mock_flow_class.from_client_secrets_file.assert_called_once()
             mock_flow.run_local_server.assert_called_once_with(port=0)
-            mock_pickle.assert_called_once()
+            mock_save_token.assert_called_once()
             captured = capsys.readouterr()
             assert "Success!" in captured.out
     
-    @patch('lib.google_services.pickle.dump')
+    @patch('lib.google_services.save_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.InstalledAppFlow')
     @patch('lib.google_services.os.path.exists')
-    def test_oauth_flow_saves_token(self, mock_exists, mock_flow_class, mock_file, mock_pickle):
-        """Test that OAuth flow saves the token to the correct path."""
+    def test_oauth_flow_saves_token(self, mock_exists, mock_flow_class, mock_file, mock_save_token):
+        """Test that OAuth flow saves the new credentials as the token."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
@@ -82,19 +83,17 @@ class TestAuthenticateGoogle:
             mock_flow_class.from_client_secrets_file.return_value = mock_flow
             
             from lib.google_services import authenticate_google
-            from lib.config import TOKEN_PATH
             
             authenticate_google()
             
             # Verify token was saved
-            mock_file.assert_called_with(TOKEN_PATH, 'wb')
-            mock_pickle.assert_called_once_with(mock_creds, mock_file())
+            mock_save_token.assert_called_once_with(mock_creds)
     
-    @patch('lib.google_services.pickle.dump')
+    @patch('lib.google_services.save_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.InstalledAppFlow')
     @patch('lib.google_services.os.path.exists')
-    def test_oauth_uses_correct_scopes(self, mock_exists, mock_flow_class, mock_file, mock_pickle):
+    def test_oauth_uses_correct_scopes(self, mock_exists, mock_flow_class, mock_file, mock_save_token):
         """Test that OAuth flow uses the correct scopes for Calendar and Drive."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -126,6 +125,157 @@ class TestAuthenticateGoogle:
             assert "Credentials file not found" in captured.out
 
 
+class _PickledCreds:
+    """Stand-in for a legacy pickled Credentials object."""
+    
+    def __init__(self, token):
+        self.token = token
+    
+    def to_json(self):
+        return json.dumps({'token': self.token})
+
+
+# =============================================================================
+# Tests for load_google_token()
+# =============================================================================
+class TestLoadGoogleToken:
+    """Tests for the load_google_token function."""
+    
+    @pytest.fixture(autouse=True)
+    def token_file(self, tmp_path):
+        """Point TOKEN_PATH at a temp file and reset the in-memory token."""
+        import lib.google_services as google_services
+        google_services._token_cache = {'mtime': None, 'creds': None}
+        self.token_path = str(tmp_path / 'google_token.pickle')
+        mock_credentials = MagicMock()
+        mock_credentials.from_authorized_user_info.side_effect = lambda info: info
+        with patch('lib.google_services.TOKEN_PATH', self.token_path), \
+             patch('lib.google_services.Credentials', mock_credentials):
+            self.mock_credentials = mock_credentials
+            yield
+        google_services._token_cache = {'mtime': None, 'creds': None}
+    
+    def _write_token(self, value, mtime):
+        with open(self.token_path, 'w') as f:
+            json.dump(value, f)
+        os.utime(self.token_path, (mtime, mtime))
+    
+    def test_reuses_token_while_file_unchanged(self):
+        """Test that the token is parsed once while its mtime is unchanged."""
+        from lib.google_services import load_google_token
+        
+        self._write_token({'token': 'a'}, 1000)
+        first = load_google_token()
+        second = load_google_token()
+        
+        assert first == {'token': 'a'}
+        assert second is first
+        assert self.mock_credentials.from_authorized_user_info.call_count == 1
+    
+    def test_reloads_token_when_file_changes(self):
+        """Test that a rewritten token file is loaded again."""
+        from lib.google_services import load_google_token
+        
+        self._write_token({'token': 'a'}, 1000)
+        assert load_google_token() == {'token': 'a'}
+        
+        self._write_token({'token': 'b'}, 2000)
+        assert load_google_token() == {'token': 'b'}
+    
+    def test_raises_when_token_missing(self):
+        """Test that a missing token file raises instead of returning a stale token."""
+        from lib.google_services import load_google_token
+        
+        self._write_token({'token': 'a'}, 1000)
+        load_google_token()
+        os.remove(self.token_path)
+        
+        with pytest.raises(FileNotFoundError):
+            load_google_token()
+    
+    def test_migrates_pickled_token_to_json(self):
+        """Test that a token pickled by an older version is loaded and rewritten as JSON."""
+        from lib.google_services import load_google_token
+        
+        with open(self.token_path, 'wb') as f:
+            pickle.dump(_PickledCreds('legacy'), f)
+        
+        creds = load_google_token()
+        
+        assert creds.token == 'legacy'
+        with open(self.token_path) as f:
+            assert json.load(f) == {'token': 'legacy'}
+        assert load_google_token() == {'token': 'legacy'}
+    
+    def test_save_writes_json_without_temp_file(self):
+        """Test that save_google_token writes the credentials' JSON in place."""
+        from lib.google_services import save_google_token
+        
+        save_google_token(_PickledCreds('fresh'))
+        
+        with open(self.token_path) as f:
+            assert json.load(f) == {'token': 'fresh'}
+        assert not os.path.exists(self.token_path + '.tmp')
+
+
+# =============================================================================
+# Tests for calendar_service()
+# =============================================================================
+class TestCalendarService:
+    """Tests for the calendar_service pool."""
+    
+    @pytest.fixture(autouse=True)
+    def empty_pool(self):
+        """Start and end each test with no idle services."""
+        import lib.google_services as google_services
+        google_services._calendar_service_pool.clear()
+        yield
+        google_services._calendar_service_pool.clear()
+    
+    @patch('lib.google_services.build')
+    def test_reuses_idle_service(self, mock_build):
+        """Test that a returned service is handed to the next caller."""
+        from lib.google_services import calendar_service
+        
+        creds = MagicMock()
+        with calendar_service(creds) as first:
+            pass
+        with calendar_service(creds) as second:
+            pass
+        
+        assert second is first
+        mock_build.assert_called_once_with('calendar', 'v3', credentials=creds, cache_discovery=False)
+    
+    @patch('lib.google_services.build')
+    def test_concurrent_callers_get_separate_services(self, mock_build):
+        """Test that a borrowed service is not shared while in use."""
+        from lib.google_services import calendar_service
+        
+        mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+        creds = MagicMock()
+        with calendar_service(creds) as first:
+            with calendar_service(creds) as second:
+                assert second is not first
+        
+        assert mock_build.call_count == 2
+    
+    @patch('lib.google_services.build')
+    def test_drops_services_for_old_credentials(self, mock_build):
+        """Test that new credentials get a new service."""
+        import lib.google_services as google_services
+        from lib.google_services import calendar_service
+        
+        mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+        old_creds, new_creds = MagicMock(), MagicMock()
+        with calendar_service(old_creds) as old_service:
+            pass
+        with calendar_service(new_creds) as new_service:
+            pass
+        
+        assert new_service is not old_service
+        assert google_services._calendar_service_pool == [(new_creds, new_service)]
+
+
 # =============================================================================
 # Tests for get_calendar_events_standalone()
 # =============================================================================
@@ -152,10 +302,10 @@ class TestGetCalendarEventsStandalone:
             assert result == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_successful_fetch_with_events(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_successful_fetch_with_events(self, mock_exists, mock_file, mock_token, mock_build):
         """Test successful calendar events fetch with events returned."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -164,7 +314,7 @@ class TestGetCalendarEventsStandalone:
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             # Mock calendar service with future events
             future_time = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
@@ -199,17 +349,17 @@ class TestGetCalendarEventsStandalone:
             assert len(result[0]['attendees']) == 2
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_returns_empty_list_when_no_events(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_returns_empty_list_when_no_events(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that function returns empty list when no events are returned."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -222,13 +372,13 @@ class TestGetCalendarEventsStandalone:
             assert result == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.dump')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services.save_google_token')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
     @patch('lib.google_services.Request')
     def test_refreshes_expired_credentials(self, mock_request_class, mock_exists, mock_file, 
-                                           mock_pickle_load, mock_pickle_dump, mock_build):
+                                           mock_read_token, mock_save_token, mock_build):
         """Test that expired credentials are refreshed."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -238,7 +388,7 @@ class TestGetCalendarEventsStandalone:
             mock_creds.expired = True
             mock_creds.refresh_token = 'refresh_token_123'
             mock_creds.valid = True  # After refresh
-            mock_pickle_load.return_value = mock_creds
+            mock_read_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -251,16 +401,16 @@ class TestGetCalendarEventsStandalone:
             # Verify credentials were refreshed
             mock_creds.refresh.assert_called_once()
             # Verify token was saved after refresh
-            mock_pickle_dump.assert_called()
+            mock_save_token.assert_called()
     
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_returns_empty_list_on_exception(self, mock_exists, mock_file, mock_pickle):
+    def test_returns_empty_list_on_exception(self, mock_exists, mock_file, mock_token):
         """Test that function returns empty list when an exception occurs."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
-            mock_pickle.side_effect = Exception("Test error")
+            mock_token.side_effect = Exception("Test error")
             
             from lib.google_services import get_calendar_events_standalone
             
@@ -269,17 +419,17 @@ class TestGetCalendarEventsStandalone:
             assert result == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_skips_all_day_events(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_skips_all_day_events(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that all-day events (without time) are skipped."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             # All-day event has date without 'T' (time component)
             mock_events = {
@@ -303,17 +453,50 @@ class TestGetCalendarEventsStandalone:
             assert result == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('lib.google_services.os.path.exists')
+    def test_extracts_zoom_and_teams_links(self, mock_exists, mock_file, mock_token, mock_build):
+        """Test that Zoom and Teams links in event text become join links."""
+        with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
+            mock_exists.return_value = True
+            mock_creds = MagicMock()
+            mock_creds.expired = False
+            mock_creds.valid = True
+            mock_token.return_value = mock_creds
+            
+            start = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
+            end = (datetime.utcnow() + timedelta(hours=2)).isoformat() + 'Z'
+            mock_service = MagicMock()
+            mock_service.events().list().execute.return_value = {'items': [
+                {'id': 'z', 'start': {'dateTime': start}, 'end': {'dateTime': end},
+                 'description': 'Join: https://acme.zoom.us/j/123?pwd=x <br>'},
+                {'id': 't', 'start': {'dateTime': start}, 'end': {'dateTime': end},
+                 'location': 'https://teams.microsoft.com/l/meetup-join/abc "Room"'},
+            ]}
+            mock_build.return_value = mock_service
+            
+            from lib.google_services import get_calendar_events_standalone
+            
+            result = get_calendar_events_standalone()
+            
+            assert [e['join_link'] for e in result] == [
+                'https://acme.zoom.us/j/123?pwd=x',
+                'https://teams.microsoft.com/l/meetup-join/abc',
+            ]
+    
+    @patch('lib.google_services.build')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_respects_limit_parameter(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_respects_limit_parameter(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that the limit parameter is passed to the API call."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -336,17 +519,43 @@ class TestGetCalendarEventsStandalone:
             pytest.fail("maxResults parameter not found in API call")
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('lib.google_services.os.path.exists')
+    def test_requests_only_consumed_fields(self, mock_exists, mock_file, mock_token, mock_build):
+        """Test that the list call asks for a partial response."""
+        with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
+            mock_exists.return_value = True
+            mock_creds = MagicMock()
+            mock_creds.expired = False
+            mock_creds.valid = True
+            mock_token.return_value = mock_creds
+            
+            mock_service = MagicMock()
+            mock_service.events().list().execute.return_value = {'items': []}
+            mock_build.return_value = mock_service
+            
+            from lib.google_services import get_calendar_events_standalone
+            
+            get_calendar_events_standalone()
+            
+            fields = mock_service.events().list.call_args.kwargs['fields']
+            assert fields.startswith('items(')
+            for key in ('id', 'summary', 'start', 'end', 'description', 'attendees(displayName,email)'):
+                assert key in fields
+    
+    @patch('lib.google_services.build')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_filters_ended_meetings(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_filters_ended_meetings(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that meetings that have already ended are filtered out."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             # Create a meeting that ended 2 hours ago
             past_start = (datetime.now() - timedelta(hours=3)).astimezone().isoformat()
@@ -378,17 +587,17 @@ class TestGetCalendarEventsStandalone:
             assert result[0]['id'] == 'future_event'
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_extracts_hangout_link(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_extracts_hangout_link(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that hangout/meet link is extracted correctly."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             future_time = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
             end_time = (datetime.utcnow() + timedelta(hours=2)).isoformat() + 'Z'
@@ -416,17 +625,17 @@ class TestGetCalendarEventsStandalone:
             assert result[0]['join_link'] == 'https://meet.google.com/abc-defg-hij'
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_falls_back_to_html_link(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_falls_back_to_html_link(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that htmlLink is used when hangoutLink is not available."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             future_time = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
             end_time = (datetime.utcnow() + timedelta(hours=2)).isoformat() + 'Z'
@@ -480,17 +689,17 @@ class TestGetMeetingById:
             assert result is None
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_successful_fetch_meeting(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_successful_fetch_meeting(self, mock_exists, mock_file, mock_token, mock_build):
         """Test successful meeting fetch by ID."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_event = {
                 'id': 'event123',
@@ -522,17 +731,17 @@ class TestGetMeetingById:
             assert result['attendees'][0]['name'] == 'Alice'
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_returns_none_when_event_not_found(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_returns_none_when_event_not_found(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that function returns None when event is not found."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             # Simulate API error when event not found
@@ -546,13 +755,13 @@ class TestGetMeetingById:
             assert result is None
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.dump')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services.save_google_token')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
     @patch('lib.google_services.Request')
     def test_refreshes_expired_credentials(self, mock_request_class, mock_exists, mock_file,
-                                           mock_pickle_load, mock_pickle_dump, mock_build):
+                                           mock_read_token, mock_save_token, mock_build):
         """Test that expired credentials are refreshed."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -561,7 +770,7 @@ class TestGetMeetingById:
             mock_creds.expired = True
             mock_creds.refresh_token = 'refresh_token_123'
             mock_creds.valid = True
-            mock_pickle_load.return_value = mock_creds
+            mock_read_token.return_value = mock_creds
             
             mock_event = {
                 'id': 'event123',
@@ -579,16 +788,16 @@ class TestGetMeetingById:
             get_meeting_by_id('event123')
             
             mock_creds.refresh.assert_called_once()
-            mock_pickle_dump.assert_called()
+            mock_save_token.assert_called()
     
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_returns_none_on_exception(self, mock_exists, mock_file, mock_pickle):
+    def test_returns_none_on_exception(self, mock_exists, mock_file, mock_token):
         """Test that function returns None when an exception occurs."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
-            mock_pickle.side_effect = Exception("Test error")
+            mock_token.side_effect = Exception("Test error")
             
             from lib.google_services import get_meeting_by_id
             
@@ -597,17 +806,17 @@ class TestGetMeetingById:
             assert result is None
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_handles_event_without_optional_fields(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_handles_event_without_optional_fields(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that function handles events with missing optional fields."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             # Minimal event without optional fields
             mock_event = {
@@ -630,17 +839,17 @@ class TestGetMeetingById:
             assert result['attendees'] == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_uses_correct_calendar_and_event_id(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_uses_correct_calendar_and_event_id(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that correct calendarId and eventId are used in API call."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().get().execute.return_value = {
@@ -650,27 +859,28 @@ class TestGetMeetingById:
             }
             mock_build.return_value = mock_service
             
-            from lib.google_services import get_meeting_by_id
+            from lib.google_services import get_meeting_by_id, CALENDAR_EVENT_FIELDS
             
             get_meeting_by_id('test_event_id')
             
             mock_service.events().get.assert_called_with(
                 calendarId='primary',
-                eventId='test_event_id'
+                eventId='test_event_id',
+                fields=CALENDAR_EVENT_FIELDS
             )
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_extracts_all_event_fields(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_extracts_all_event_fields(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that all event fields are properly extracted."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_event = {
                 'id': 'full_event',
@@ -1116,6 +1326,35 @@ class TestSearchGoogleDrive:
             
             assert len(result) == 2
     
+    @patch('lib.google_services.os.walk')
+    @patch('lib.google_services.os.stat')
+    @patch('lib.google_services.os.path.exists')
+    def test_matches_any_word_case_insensitively(self, mock_path_exists, mock_stat, mock_walk):
+        """Test that any query word matches filenames regardless of case."""
+        drive_path = '/Users/test/Library/CloudStorage/GoogleDrive-test@gmail.com/My Drive'
+        
+        with patch('lib.google_services.GOOGLE_DRIVE_PATHS', [drive_path]):
+            mock_path_exists.return_value = True
+            mock_walk.return_value = [
+                (drive_path, [], ['Q3_ROADMAP.pdf', 'Budget (final).xlsx', 'notes.txt'])
+            ]
+            mock_stat.return_value = MagicMock(st_mtime=datetime.now().timestamp())
+            
+            from lib.google_services import search_google_drive
+            
+            result = search_google_drive('roadmap (final)', max_results=10)
+            
+            assert [r['title'] for r in result] == ['Q3_ROADMAP.pdf', 'Budget (final).xlsx']
+    
+    def test_skips_missing_drive_path(self):
+        """Test that a drive path that no longer exists yields no results."""
+        with patch('lib.google_services.GOOGLE_DRIVE_PATHS', ['/nonexistent/GoogleDrive/My Drive']):
+            from lib.google_services import search_google_drive
+            
+            result = search_google_drive('document')
+            
+            assert result == []
+    
     def test_filters_short_query_words(self):
         """Test that short words in query are filtered out."""
         with patch('lib.google_services.GOOGLE_DRIVE_PATHS', ['/some/path']):
@@ -1134,10 +1373,10 @@ class TestGoogleIntegration:
     """Integration-like tests that verify multiple functions work together."""
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_credentials_not_refreshed_when_valid(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_credentials_not_refreshed_when_valid(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that valid credentials are not unnecessarily refreshed."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -1147,7 +1386,7 @@ class TestGoogleIntegration:
             mock_creds.expired = False
             mock_creds.refresh_token = 'token123'
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -1161,11 +1400,11 @@ class TestGoogleIntegration:
             mock_creds.refresh.assert_not_called()
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
     def test_credentials_not_refreshed_when_no_refresh_token(self, mock_exists, mock_file, 
-                                                              mock_pickle, mock_build):
+                                                              mock_token, mock_build):
         """Test that credentials without refresh token are not refreshed even if expired."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
@@ -1175,7 +1414,7 @@ class TestGoogleIntegration:
             mock_creds.expired = True
             mock_creds.refresh_token = None  # No refresh token
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -1189,17 +1428,17 @@ class TestGoogleIntegration:
             mock_creds.refresh.assert_not_called()
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_calendar_service_built_with_correct_api(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_calendar_service_built_with_correct_api(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that calendar service is built with correct API name and version."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.return_value = {'items': []}
@@ -1209,7 +1448,7 @@ class TestGoogleIntegration:
             
             get_calendar_events_standalone()
             
-            mock_build.assert_called_with('calendar', 'v3', credentials=mock_creds)
+            mock_build.assert_called_with('calendar', 'v3', credentials=mock_creds, cache_discovery=False)
 
 
 # =============================================================================
@@ -1219,17 +1458,17 @@ class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_handles_api_error_gracefully(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_handles_api_error_gracefully(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that API errors are handled gracefully."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             mock_service = MagicMock()
             mock_service.events().list().execute.side_effect = Exception("API Error")
@@ -1242,17 +1481,17 @@ class TestEdgeCases:
             assert result == []
     
     @patch('lib.google_services.build')
-    @patch('lib.google_services.pickle.load')
+    @patch('lib.google_services._read_google_token')
     @patch('builtins.open', new_callable=mock_open)
     @patch('lib.google_services.os.path.exists')
-    def test_handles_malformed_event_data(self, mock_exists, mock_file, mock_pickle, mock_build):
+    def test_handles_malformed_event_data(self, mock_exists, mock_file, mock_token, mock_build):
         """Test that malformed event data doesn't crash the function."""
         with patch('lib.google_services.GOOGLE_API_AVAILABLE', True):
             mock_exists.return_value = True
             mock_creds = MagicMock()
             mock_creds.expired = False
             mock_creds.valid = True
-            mock_pickle.return_value = mock_creds
+            mock_token.return_value = mock_creds
             
             # Malformed event missing required fields
             mock_events = {
@@ -0,0 +1,635 @@
+"""
+Tests for browser history and bookmark search in BriefDesk lib modules
+
+Run with: pytest tests/test_history.py -v
+"""
+import sys
+import os
+import json
+import plistlib
+import time
+import sqlite3
+import threading
+import tempfile
+import shutil
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path for lib imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from lib import history
+from lib import utils
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _chromium_bookmarks(*entries):
+    """Build a minimal Chromium Bookmarks document from (title, url) pairs."""
+    return {
+        'roots': {
+            'bookmark_bar': {
+                'type': 'folder',
+                'children': [
+                    {'type': 'url', 'name': title, 'url': url}
+                    for title, url in entries
+                ],
+            },
+        },
+    }
+
+
+@pytest.fixture
+def tmp_dir():
+    """Create and clean up a temporary directory."""
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+# ============================================================================
+# BOOKMARK SEARCH TESTS
+# ============================================================================
+
+class TestSearchChromeBookmarks:
+    """Test the search_chrome_bookmarks function."""
+
+    @pytest.fixture
+    def bookmarks_file(self, tmp_dir):
+        """Write a Chrome Bookmarks file and point the module at it."""
+        path = os.path.join(tmp_dir, 'Bookmarks')
+        with open(path, 'w') as f:
+            json.dump(_chromium_bookmarks(
+                ('GitHub Pull Requests', 'https://github.com/pulls'),
+                ('Team Wiki', 'https://www.confluence.example.com/wiki'),
+                ('Lunch Menu', 'https://food.example.com/menu'),
+            ), f)
+        with patch.object(history, 'CHROME_BOOKMARKS', path):
+            yield path
+
+    def test_matches_title_case_insensitively(self, bookmarks_file):
+        """Test that title matching ignores case."""
+        results = history.search_chrome_bookmarks('github')
+
+        assert [r['url'] for r in results] == ['https://github.com/pulls']
+        assert results[0]['type'] == 'bookmark'
+
+    def test_matches_any_query_word_in_title(self, bookmarks_file):
+        """Test that any single query word can match the title."""
+        results = history.search_chrome_bookmarks('wiki nonsense')
+
+        assert [r['title'] for r in results] == ['Team Wiki']
+
+    def test_matches_full_query_in_url(self, bookmarks_file):
+        """Test that the full query is matched against the URL."""
+        results = history.search_chrome_bookmarks('food.example')
+
+        assert [r['title'] for r in results] == ['Lunch Menu']
+
+    def test_matches_url_case_insensitively(self, bookmarks_file):
+        """Test that mixed-case queries match the lowercased URL and domain."""
+        assert [r['title'] for r in history.search_chrome_bookmarks('FOOD.Example')] == ['Lunch Menu']
+        assert [r['title'] for r in history.search_chrome_bookmarks('Confluence.EXAMPLE.com')] == ['Team Wiki']
+
+    def test_treats_query_as_literal_text(self, bookmarks_file):
+        """Test that punctuation in the query is matched literally."""
+        assert history.search_chrome_bookmarks('wiki(') == []
+
+    def test_reuses_parsed_entries_until_file_changes(self, bookmarks_file):
+        """Test that an unchanged bookmarks file is parsed only once."""
+        history.search_chrome_bookmarks('github')
+        with patch.object(history, '_load_json_file') as mock_load:
+            results = history.search_chrome_bookmarks('wiki')
+
+        mock_load.assert_not_called()
+        assert [r['title'] for r in results] == ['Team Wiki']
+
+        with open(bookmarks_file, 'w') as f:
+            json.dump(_chromium_bookmarks(('New Wiki Page', 'https://wiki.example.com/new')), f)
+
+        results = history.search_chrome_bookmarks('wiki')
+
+        assert [r['title'] for r in results] == ['New Wiki Page']
+
+    def test_returns_empty_when_file_missing(self):
+        """Test that a missing bookmarks file yields no results."""
+        with patch.object(history, 'CHROME_BOOKMARKS', '/nonexistent/Bookmarks'):
+            assert history.search_chrome_bookmarks('github') == []
+
+    def test_parses_without_orjson(self, bookmarks_file):
+        """Test that the stdlib json fallback is used when orjson is missing."""
+        with patch.object(history, 'orjson', None):
+            results = history.search_chrome_bookmarks('github')
+
+        assert [r['url'] for r in results] == ['https://github.com/pulls']
+
+    def test_logs_and_returns_empty_on_invalid_json(self, tmp_dir):
+        """Test that a corrupt bookmarks file yields no results."""
+        path = os.path.join(tmp_dir, 'Bookmarks')
+        with open(path, 'w') as f:
+            f.write('{not json')
+
+        with patch.object(history, 'CHROME_BOOKMARKS', path):
+            assert history.search_chrome_bookmarks('github') == []
+
+
+class TestSearchSafariBookmarks:
+    """Test the search_safari_bookmarks function."""
+
+    def test_matches_nested_plist_bookmarks(self, tmp_dir):
+        """Test that titles from URIDictionary or Title are matched."""
+        path = os.path.join(tmp_dir, 'Bookmarks.plist')
+        with open(path, 'wb') as f:
+            plistlib.dump({'Children': [
+                {'Title': 'Favorites', 'Children': [
+                    {'URLString': 'https://calendar.example.com', 'URIDictionary': {'title': 'Team Calendar'}},
+                    {'URLString': 'https://mail.example.com', 'Title': 'Mail'},
+                ]},
+            ]}, f)
+
+        with patch.object(history, 'SAFARI_BOOKMARKS', path):
+            results = history.search_safari_bookmarks('calendar')
+
+        assert results == [{'title': 'Team Calendar', 'url': 'https://calendar.example.com', 'type': 'bookmark'}]
+
+
+class TestWalkDictTree:
+    """Test the _walk_dict_tree helper."""
+
+    def test_yields_dicts_depth_first_in_document_order(self):
+        """Test that nested dicts are yielded in recursive traversal order."""
+        tree = {'a': {'b': [{'id': 1}, {'id': 2}]}, 'c': {'id': 3}}
+
+        ids = [node['id'] for node in history._walk_dict_tree(tree) if 'id' in node]
+
+        assert ids == [1, 2, 3]
+
+
+# ============================================================================
+# HISTORY SEARCH TESTS
+# ============================================================================
+
+def _wait_for_index(db_path, timeout=5):
+    """Wait for the background FTS build of a history snapshot to finish."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        entry = history._history_snapshots.get(db_path)
+        if entry and entry['indexed']:
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture(autouse=True)
+def reset_history_snapshots():
+    """Drop cached snapshots, bookmark entries and search results between tests."""
+    yield
+    history._bookmark_index.clear()
+    history._search_result_cache.clear()
+    for entry in history._history_snapshots.values():
+        if entry['conn'] is not None:
+            entry['conn'].close()
+        utils.cleanup_db(entry['path'])
+    history._history_snapshots.clear()
+
+
+class TestSearchChromiumHistory:
+    """Test the Chromium history search (Chrome, Helium, Dia)."""
+
+    @pytest.fixture
+    def history_db(self, tmp_dir):
+        """Create a minimal Chromium History database."""
+        path = os.path.join(tmp_dir, 'History')
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, title TEXT,
+                               visit_count INTEGER, last_visit_time INTEGER)
+        """)
+        conn.executemany(
+            "INSERT INTO urls (url, title, visit_count, last_visit_time) VALUES (?, ?, ?, ?)",
+            [
+                ('https://github.com/org/repo/pulls', 'Pull requests · org/repo', 12, 3),
+                ('https://jira.example.com/browse/PROJ-1', 'PROJ-1 Login bug', 4, 2),
+                ('https://example.com/', 'Example Domain', 1, 1),
+            ],
+        )
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_matches_substring_before_index_is_built(self, history_db):
+        """Test that the first search falls back to a LIKE scan."""
+        with patch.object(history, '_fts_supported', False):
+            results = history._search_chromium_history(history_db, 'login')
+
+        assert [r['url'] for r in results] == ['https://jira.example.com/browse/PROJ-1']
+        assert results[0]['type'] == 'history'
+        assert results[0]['visit_count'] == 4
+
+    def test_snapshot_connection_is_tuned_and_read_only(self, history_db):
+        """Test that the cached snapshot connection gets its pragmas."""
+        with patch.object(history, '_fts_supported', False):
+            history._search_chromium_history(history_db, 'login')
+
+        conn = history._history_snapshots[history_db]['conn']
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -history.HISTORY_CACHE_SIZE_KB
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM urls")
+
+    def test_indexed_search_matches_like_search(self, history_db):
+        """Test that indexed and unindexed searches return the same rows."""
+        unindexed = history._search_chromium_history(history_db, 'org repo')
+        assert _wait_for_index(history_db)
+
+        indexed = history._search_chromium_history(history_db, 'org repo')
+
+        assert indexed == unindexed
+        assert [r['url'] for r in indexed] == ['https://github.com/org/repo/pulls']
+
+    def test_short_terms_fall_back_to_like(self, history_db):
+        """Test that terms shorter than a trigram still match."""
+        history._search_chromium_history(history_db, 'example')
+        assert _wait_for_index(history_db)
+
+        results = history._search_chromium_history(history_db, 'pr')
+
+        assert [r['url'] for r in results] == ['https://jira.example.com/browse/PROJ-1']
+
+    def test_resnapshots_when_source_changes(self, history_db):
+        """Test that new rows are visible after the source database changes."""
+        assert history._search_chromium_history(history_db, 'newpage') == []
+
+        conn = sqlite3.connect(history_db)
+        conn.execute(
+            "INSERT INTO urls (url, title, visit_count, last_visit_time) VALUES (?, ?, ?, ?)",
+            ('https://newpage.example.com/', 'Brand new page', 1, 4),
+        )
+        conn.commit()
+        conn.close()
+        os.utime(history_db, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+        results = history._search_chromium_history(history_db, 'newpage')
+
+        assert [r['title'] for r in results] == ['Brand new page']
+
+    def test_reuses_snapshot_until_source_changes(self, history_db):
+        """Test that repeat searches do not copy the database again."""
+        with patch.object(history, '_fts_supported', False):
+            history._search_chromium_history(history_db, 'github')
+            with patch.object(history, 'copy_db') as mock_copy:
+                results = history._search_chromium_history(history_db, 'github')
+
+        mock_copy.assert_not_called()
+        assert [r['url'] for r in results] == ['https://github.com/org/repo/pulls']
+
+    def test_returns_empty_for_missing_database(self):
+        """Test that a missing database yields no results."""
+        assert history._search_chromium_history('/nonexistent/History', 'github') == []
+
+    def test_cleanup_removes_snapshot_copies(self, history_db):
+        """Test that the exit handler closes snapshot connections and deletes their copies."""
+        with patch.object(history, '_fts_supported', False):
+            history._search_chromium_history(history_db, 'github')
+        snapshot_path = history._history_snapshots[history_db]['path']
+        assert os.path.exists(snapshot_path)
+
+        history._cleanup_history_snapshots()
+
+        entry = history._history_snapshots[history_db]
+        assert entry['conn'] is None
+        assert not os.path.exists(snapshot_path)
+
+    def test_rapid_source_changes_run_one_index_build_at_a_time(self, history_db):
+        """Test that changes during a build queue one follow-up build instead of overlapping ones."""
+        release = threading.Event()
+        started = []
+        real_build = history._build_history_index
+
+        def blocking_build(db_path, signature, fts_sql):
+            started.append(signature)
+            release.wait(5)
+            real_build(db_path, signature, fts_sql)
+
+        with patch.object(history, '_build_history_index', blocking_build):
+            history._search_chromium_history(history_db, 'github')
+            for i in range(3):
+                conn = sqlite3.connect(history_db)
+                conn.execute(
+                    "INSERT INTO urls (url, title, visit_count, last_visit_time) VALUES (?, ?, ?, ?)",
+                    (f'https://page{i}.example.com/', f'Page {i}', 1, 10 + i),
+                )
+                conn.commit()
+                conn.close()
+                os.utime(history_db, ns=(time.time_ns(), time.time_ns() + (i + 1) * 1_000_000_000))
+                history._search_chromium_history(history_db, 'github')
+
+            assert len(started) == 1
+            release.set()
+            assert _wait_for_index(history_db)
+
+        latest = history._history_snapshots[history_db]['signature']
+        assert len(started) == 2
+        assert started[1] == latest
+
+
+class TestSearchSafariHistory:
+    """Test the search_safari_history function."""
+
+    @pytest.fixture
+    def history_db(self, tmp_dir):
+        """Create a minimal Safari History.db and point the module at it."""
+        path = os.path.join(tmp_dir, 'History.db')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE history_items (id INTEGER PRIMARY KEY, url TEXT, visit_count INTEGER)")
+        conn.execute("CREATE TABLE history_visits (id INTEGER PRIMARY KEY, history_item INTEGER, title TEXT, visit_time REAL)")
+        conn.executemany("INSERT INTO history_items VALUES (?, ?, ?)", [
+            (1, 'https://docs.python.org/3/library/sqlite3.html', 7),
+            (2, 'https://news.example.com/', 2),
+        ])
+        conn.executemany("INSERT INTO history_visits VALUES (?, ?, ?, ?)", [
+            (1, 1, 'sqlite3 — DB-API 2.0 interface', 10.0),
+            (2, 1, 'sqlite3 — DB-API 2.0 interface', 20.0),
+            (3, 2, 'Morning News', 15.0),
+        ])
+        conn.commit()
+        conn.close()
+        with patch.object(history, 'SAFARI_HISTORY', path):
+            yield path
+
+    def test_indexed_search_matches_like_search(self, history_db):
+        """Test that indexed and unindexed Safari searches agree."""
+        unindexed = history.search_safari_history('sqlite interface')
+        assert _wait_for_index(history_db)
+
+        indexed = history.search_safari_history('sqlite interface')
+
+        assert indexed == unindexed
+        assert [r['url'] for r in indexed] == ['https://docs.python.org/3/library/sqlite3.html']
+        assert indexed[0]['visit_count'] == 7
+
+
+class TestHistoryStatement:
+    """Test the _history_statement SQL cache."""
+
+    def test_reuses_sql_for_same_term_count(self):
+        """Test that queries with the same shape share one SQL string."""
+        sql1, params1 = history._history_statement('chromium', ['alpha', 'beta'], False)
+        sql2, params2 = history._history_statement('chromium', ['gamma', 'delta'], False)
+
+        assert sql1 is sql2
+        assert params1 == ['%alpha%', '%alpha%', '%beta%', '%beta%']
+        assert params2 == ['%gamma%', '%gamma%', '%delta%', '%delta%']
+
+    def test_uses_single_match_parameter_when_indexed(self):
+        """Test that indexed queries bind one FTS expression."""
+        sql, params = history._history_statement('safari', ['alpha', 'be"ta'], True)
+
+        assert 'MATCH ?' in sql
+        assert params == ('"alpha" AND "be""ta"',)
+
+
+# ============================================================================
+# COMBINED SEARCH TESTS
+# ============================================================================
+
+class TestSearchHistory:
+    """Test the search_history function."""
+
+    def test_runs_sources_concurrently(self):
+        """Test that slow sources are searched in parallel."""
+        barrier = threading.Barrier(2, timeout=2)
+
+        def slow_bookmarks(query):
+            barrier.wait()
+            return [{'title': 'Wiki bookmark', 'url': 'https://wiki.example.com', 'type': 'bookmark'}]
+
+        def slow_history(query):
+            barrier.wait()
+            return [{'title': 'Wiki history', 'url': 'https://wiki.example.com/h', 'type': 'history', 'visit_count': 1}]
+
+        empty = lambda query: []
+        with patch.object(history, 'search_chrome_bookmarks', slow_bookmarks), \
+             patch.object(history, 'search_chrome_history', slow_history), \
+             patch.object(history, 'search_helium_bookmarks', empty), \
+             patch.object(history, 'search_dia_bookmarks', empty), \
+             patch.object(history, 'search_helium_history', empty), \
+             patch.object(history, 'search_dia_history', empty):
+            results = history.search_history('wiki')
+
+        assert {r['url'] for r in results} == {'https://wiki.example.com', 'https://wiki.example.com/h'}
+
+    def test_failing_source_does_not_break_search(self):
+        """Test that an exception in one source is logged and skipped."""
+        def broken(query):
+            raise RuntimeError('boom')
+
+        ok = lambda query: [{'title': 'Wiki', 'url': 'https://wiki.example.com', 'type': 'bookmark'}]
+        empty = lambda query: []
+        with patch.object(history, 'search_chrome_bookmarks', ok), \
+             patch.object(history, 'search_chrome_history', broken), \
+             patch.object(history, 'search_helium_bookmarks', empty), \
+             patch.object(history, 'search_dia_bookmarks', empty), \
+             patch.object(history, 'search_helium_history', empty), \
+             patch.object(history, 'search_dia_history', empty):
+            results = history.search_history('wiki')
+
+        assert [r['url'] for r in results] == ['https://wiki.example.com']
+
+
+class TestSearchBookmarksAndBrowserHistory:
+    """Test the search_bookmarks and search_browser_history functions."""
+
+    def test_search_bookmarks_runs_sources_concurrently(self):
+        """Test that bookmark sources are searched in parallel."""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def make_source(url):
+            def source(query):
+                barrier.wait()
+                return [{'title': 'Docs', 'url': url, 'type': 'bookmark'}]
+            return source
+
+        with patch.object(history, 'search_chrome_bookmarks', make_source('https://a.example.com')), \
+             patch.object(history, 'search_helium_bookmarks', make_source('https://b.example.com')), \
+             patch.object(history, 'search_dia_bookmarks', make_source('https://c.example.com')):
+            results = history.search_bookmarks('docs')
+
+        assert [r['url'] for r in results] == [
+            'https://a.example.com', 'https://b.example.com', 'https://c.example.com',
+        ]
+
+    def test_search_browser_history_skips_failing_source(self):
+        """Test that one failing history source does not hide the others."""
+        def broken(query):
+            raise RuntimeError('locked')
+
+        ok = lambda query: [{'title': 'Docs', 'url': 'https://docs.example.com', 'type': 'history', 'visit_count': 2}]
+        with patch.object(history, 'search_chrome_history', broken), \
+             patch.object(history, 'search_helium_history', ok), \
+             patch.object(history, 'search_dia_history', lambda query: []):
+            results = history.search_browser_history('docs')
+
+        assert [r['url'] for r in results] == ['https://docs.example.com']
+
+
+class TestTopResults:
+    """Test the _top_results helper."""
+
+    def test_returns_highest_scores_first_with_stable_ties(self):
+        """Test that ranking matches a stable sort by descending score."""
+        candidates = [
+            {'title': 'other page', 'url': 'https://a.example.com'},
+            {'title': 'react docs', 'url': 'https://b.example.com'},
+            {'title': 'react hooks', 'url': 'https://c.example.com'},
+            {'title': 'unrelated', 'url': 'https://react.example.com'},
+        ]
+
+        top = history._top_results(candidates, 'react', ['react'], 3)
+
+        assert [r['url'] for r in top] == [
+            'https://b.example.com', 'https://c.example.com', 'https://react.example.com',
+        ]
+        assert all('_score' not in r for r in candidates)
+
+
+class TestSearchResultCache:
+    """Test caching of aggregated search results."""
+
+    @pytest.fixture
+    def sources(self):
+        """Patch all history sources; only Chrome bookmarks returns a result."""
+        calls = []
+
+        def bookmarks(query):
+            calls.append(query)
+            return [{'title': 'Wiki', 'url': 'https://wiki.example.com', 'type': 'bookmark'}]
+
+        empty = lambda query: []
+        with patch.object(history, 'search_chrome_bookmarks', bookmarks), \
+             patch.object(history, 'search_helium_bookmarks', empty), \
+             patch.object(history, 'search_dia_bookmarks', empty), \
+             patch.object(history, 'search_chrome_history', empty), \
+             patch.object(history, 'search_helium_history', empty), \
+             patch.object(history, 'search_dia_history', empty):
+            yield calls
+
+    def test_repeat_query_is_served_from_cache(self, sources):
+        """Test that an identical search does not hit the sources again."""
+        first = history.search_history('wiki')
+        second = history.search_history('wiki')
+
+        assert first == second
+        assert sources == ['wiki']
+
+    def test_cached_results_are_copies(self, sources):
+        """Test that callers cannot mutate the cached results."""
+        history.search_history('wiki')[0]['title'] = 'changed'
+
+        assert history.search_history('wiki')[0]['title'] == 'Wiki'
+
+    def test_source_change_invalidates_cache(self, sources):
+        """Test that a changed bookmark/history file triggers a new search."""
+        history.search_history('wiki')
+        with patch.object(history, '_search_sources_signature', return_value=('changed',)):
+            history.search_history('wiki')
+
+        assert sources == ['wiki', 'wiki']
+
+    def test_failed_search_is_not_cached(self, sources):
+        """Test that partial results from a failing source are not cached."""
+        def broken(query):
+            raise RuntimeError('locked')
+
+        with patch.object(history, 'search_dia_history', broken):
+            history.search_history('wiki')
+        history.search_history('wiki')
+
+        assert sources == ['wiki', 'wiki']
+
+
+class TestRunSearches:
+    """Test the _run_searches fan-out and deduplication."""
+
+    def test_prefers_bookmarks_and_keeps_first_seen_order(self):
+        """Test that a bookmark replaces history for the same URL in place."""
+        history_source = lambda query: [
+            {'title': 'Docs (history)', 'url': 'https://docs.example.com', 'type': 'history'},
+            {'title': 'Other', 'url': 'https://other.example.com', 'type': 'history'},
+        ]
+        bookmark_source = lambda query: [
+            {'title': 'Docs', 'url': 'https://docs.example.com', 'type': 'bookmark'},
+        ]
+
+        unique, complete = history._run_searches(
+            [history_source, bookmark_source], 'docs', prefer_bookmarks=True,
+        )
+
+        assert complete is True
+        assert list(unique) == ['https://docs.example.com', 'https://other.example.com']
+        assert unique['https://docs.example.com']['type'] == 'bookmark'
+
+    def test_keeps_first_result_without_bookmark_preference(self):
+        """Test that the first result for a URL wins by default."""
+        first = lambda query: [{'title': 'First', 'url': 'https://a.example.com', 'type': 'history'}]
+        second = lambda query: [{'title': 'Second', 'url': 'https://a.example.com', 'type': 'bookmark'}]
+
+        unique, _ = history._run_searches([first, second], 'a')
+
+        assert unique['https://a.example.com']['title'] == 'First'
+
+    def test_drops_excluded_url(self):
+        """Test that the excluded URL never appears in the results."""
+        source = lambda query: [
+            {'title': 'BriefDesk', 'url': 'http://127.0.0.1:8765/start.html', 'type': 'history'},
+            {'title': 'Docs', 'url': 'https://docs.example.com', 'type': 'history'},
+        ]
+
+        unique, _ = history._run_searches(
+            [source], 'd', exclude_url='http://127.0.0.1:8765/start.html',
+        )
+
+        assert list(unique) == ['https://docs.example.com']
+
+
+class TestEarlyTermination:
+    """Test that aggregators stop once the best possible results are found."""
+
+    def test_search_bookmarks_does_not_wait_for_slow_sources(self):
+        """Test that perfect matches from the first source end the search."""
+        release = threading.Event()
+
+        def fast(query):
+            return [{'title': 'GitHub', 'url': f'https://github.com/{i}', 'type': 'bookmark'}
+                    for i in range(2)]
+
+        def slow(query):
+            release.wait(5)
+            return [{'title': 'GitHub mirror', 'url': 'https://github.example.com', 'type': 'bookmark'}]
+
+        try:
+            with patch.object(history, 'search_chrome_bookmarks', fast), \
+                 patch.object(history, 'search_helium_bookmarks', slow), \
+                 patch.object(history, 'search_dia_bookmarks', slow):
+                start = time.time()
+                results = history.search_bookmarks('github', limit=2)
+                elapsed = time.time() - start
+        finally:
+            release.set()
+
+        assert [r['url'] for r in results] == ['https://github.com/0', 'https://github.com/1']
+        assert elapsed < 2
+
+    def test_top_results_matches_stable_sort_without_bound(self):
+        """Test that ranking equals a stable descending sort by score."""
+        candidates = [
+            {'title': f'page {i % 3}', 'url': f'https://example.com/{i}', 'visit_count': i % 4}
+            for i in range(12)
+        ]
+        expected = sorted(
+            candidates, key=lambda r: -utils.score_result(r, 'page', ['page']),
+        )[:5]
+
+        assert history._top_results(candidates, 'page', ['page'], 5) == expected
@@ -12,6 +12,7 @@ import tempfile
 import shutil
 import sqlite3
 import pytest
+from concurrent.futures import Future
 from unittest.mock import patch, MagicMock, mock_open
 
 # Add parent directory to path for lib imports
@@ -37,10 +38,10 @@ class TestAddPrefetchActivity:
     def clear_status(self):
         """Clear prefetch status before each test."""
         with prefetch._prefetch_status_lock:
-            prefetch._prefetch_status['activity_log'] = []
+            prefetch._prefetch_status['activity_log'].clear()
         yield
         with prefetch._prefetch_status_lock:
-            prefetch._prefetch_status['activity_log'] = []
+            prefetch._prefetch_status['activity_log'].clear()
     
     def test_adds_activity_to_log(self):
         """Test that activity is added to the log."""
@@ -89,6 +90,15 @@ class TestAddPrefetchActivity:
         
         status = prefetch.get_prefetch_status()
         assert status['activity_log'][0]['items'] == 15
+    
+    def test_status_returns_log_snapshot(self):
+        """Test that the returned log is a list unaffected by later activity."""
+        prefetch.add_prefetch_activity('test', 'First')
+        status = prefetch.get_prefetch_status()
+        prefetch.add_prefetch_activity('test', 'Second')
+        
+        assert isinstance(status['activity_log'], list)
+        assert [e['message'] for e in status['activity_log']] == ['First']
 
 
 class TestUpdatePrefetchStatus:
@@ -225,6 +235,42 @@ class TestGetMeetingCache:
         assert len(errors) == 0
 
 
+
+class TestGetCacheState:
+    """Test the get_cache_state function."""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Clear meeting cache before each test."""
+        with cache._meeting_prep_cache_lock:
+            cache._meeting_prep_cache.clear()
+        yield
+        with cache._meeting_prep_cache_lock:
+            cache._meeting_prep_cache.clear()
+    
+    def test_matches_per_source_checks(self):
+        """Test that the snapshot agrees with is_cache_valid and has_cached_data."""
+        cache.get_meeting_cache('state-meeting')
+        with cache._meeting_prep_cache_lock:
+            entry = cache._meeting_prep_cache['state-meeting']
+            entry['jira'] = {'data': [{'key': 'A-1'}], 'timestamp': time.time()}
+            entry['slack'] = {'data': [], 'timestamp': time.time() - config.PREP_CACHE_TTL - 1}
+        sources = ['jira', 'slack', 'gmail']
+        
+        valid, present = cache.get_cache_state('state-meeting', sources)
+        
+        assert valid == {s: cache.is_cache_valid('state-meeting', s) for s in sources}
+        assert present == {s: cache.has_cached_data('state-meeting', s) for s in sources}
+        assert valid == {'jira': True, 'slack': False, 'gmail': False}
+        assert present == {'jira': True, 'slack': True, 'gmail': False}
+    
+    def test_unknown_meeting(self):
+        """Test that an unknown meeting reports nothing cached."""
+        valid, present = cache.get_cache_state('missing', ['drive'])
+        
+        assert valid == {'drive': False}
+        assert present == {'drive': False}
+
 class TestCleanupOldCaches:
     """Test the cleanup_old_caches function."""
     
@@ -288,6 +334,46 @@ class TestCleanupOldCaches:
 class TestCheckServicesAuth:
     """Test the check_services_auth function."""
     
+    @pytest.fixture(autouse=True)
+    def clear_auth_cache(self):
+        """Clear the cached auth status around each test."""
+        with prefetch._auth_status_cache_lock:
+            prefetch._auth_status_cache.update(signature=None, timestamp=0, data=None)
+        yield
+        with prefetch._auth_status_cache_lock:
+            prefetch._auth_status_cache.update(signature=None, timestamp=0, data=None)
+    
+    def test_reuses_result_while_files_unchanged(self):
+        """Test that the filesystem scan is skipped while the signature matches."""
+        scan_result = {'atlassian': True, 'slack': False, 'gmail': False, 'drive': False}
+        with patch('lib.prefetch._auth_files_signature', return_value=(1, 2)), \
+             patch('lib.prefetch._scan_services_auth', return_value=scan_result) as mock_scan:
+            first = prefetch.check_services_auth()
+            second = prefetch.check_services_auth()
+        
+        assert first == second == scan_result
+        assert mock_scan.call_count == 1
+    
+    def test_rescans_when_files_change(self):
+        """Test that a changed mtime signature triggers a new scan."""
+        with patch('lib.prefetch._auth_files_signature', side_effect=[(1,), (2,)]), \
+             patch('lib.prefetch._scan_services_auth', return_value={'atlassian': False}) as mock_scan:
+            prefetch.check_services_auth()
+            prefetch.check_services_auth()
+        
+        assert mock_scan.call_count == 2
+    
+    def test_rescans_after_ttl(self):
+        """Test that the cached result expires after AUTH_STATUS_CACHE_TTL."""
+        with patch('lib.prefetch._auth_files_signature', return_value=(1,)), \
+             patch('lib.prefetch._scan_services_auth', return_value={'atlassian': False}) as mock_scan:
+            prefetch.check_services_auth()
+            with prefetch._auth_status_cache_lock:
+                prefetch._auth_status_cache['timestamp'] -= config.AUTH_STATUS_CACHE_TTL + 1
+            prefetch.check_services_auth()
+        
+        assert mock_scan.call_count == 2
+    
     def test_returns_auth_status_dict(self):
         """Test that check_services_auth returns expected structure."""
         with patch('os.path.exists', return_value=False):
@@ -328,6 +414,69 @@ class TestCheckServicesAuth:
         assert 'slack' in result
 
 
+
+class TestCheckAtlassianAuth:
+    """Test the cached Atlassian token scan."""
+    
+    @pytest.fixture(autouse=True)
+    def auth_dir(self, tmp_path):
+        """Point the token scan at a temporary ~/.mcp-auth."""
+        token_dir = tmp_path / 'mcp-remote-0.1'
+        token_dir.mkdir()
+        with prefetch._auth_status_cache_lock:
+            prefetch._atlassian_auth_cache.update(signature=None, authenticated=False)
+        with patch('lib.prefetch.MCP_AUTH_PATH', str(tmp_path)):
+            yield token_dir
+        with prefetch._auth_status_cache_lock:
+            prefetch._atlassian_auth_cache.update(signature=None, authenticated=False)
+    
+    def test_detects_valid_token(self, auth_dir):
+        """Test that a token file with an access token counts as authenticated."""
+        (auth_dir / 'abc_tokens.json').write_text('{"access_token": "tok"}')
+        
+        assert prefetch._check_atlassian_auth() is True
+    
+    def test_stops_at_first_valid_token(self, auth_dir):
+        """Test that files after the first valid token are not read."""
+        (auth_dir / 'a_tokens.json').write_text('{"access_token": "tok"}')
+        (auth_dir / 'b_tokens.json').write_text('{"access_token": "tok"}')
+        
+        with patch('lib.prefetch._has_access_token', return_value=True) as mock_check:
+            assert prefetch._check_atlassian_auth() is True
+        
+        assert mock_check.call_count == 1
+    
+    def test_has_access_token(self, auth_dir):
+        """Test token detection for present, empty, missing and invalid tokens."""
+        cases = {
+            'valid': ('{"access_token":"tok"}', True),
+            'empty': ('{"access_token":""}', False),
+            'missing': ('{"refresh_token": "r"}', False),
+            'invalid': ('{"access_token": ', False),
+        }
+        for name, (content, expected) in cases.items():
+            path = auth_dir / f'{name}_tokens.json'
+            path.write_text(content)
+            assert prefetch._has_access_token(str(path)) is expected, name
+    
+    def test_missing_directory(self):
+        """Test that a missing ~/.mcp-auth is not authenticated."""
+        with patch('lib.prefetch.MCP_AUTH_PATH', '/nonexistent/.mcp-auth'):
+            assert prefetch._check_atlassian_auth() is False
+    
+    def test_skips_parse_when_unchanged(self, auth_dir):
+        """Test that token files are only parsed again after they change."""
+        token_file = auth_dir / 'abc_tokens.json'
+        token_file.write_text('{"access_token": ""}')
+        assert prefetch._check_atlassian_auth() is False
+        
+        with patch('builtins.open', side_effect=AssertionError('re-parsed')):
+            assert prefetch._check_atlassian_auth() is False
+        
+        token_file.write_text('{"access_token": "tok"}')
+        os.utime(token_file, ns=(0, time.time_ns() + 10**9))
+        assert prefetch._check_atlassian_auth() is True
+
 class TestPrefetchMeetingData:
     """Test the prefetch_meeting_data function."""
     
@@ -343,7 +492,7 @@ class TestPrefetchMeetingData:
         with cache._meeting_prep_cache_lock:
             cache._meeting_prep_cache.clear()
         with prefetch._prefetch_status_lock:
-            prefetch._prefetch_status['activity_log'] = []
+            prefetch._prefetch_status['activity_log'].clear()
         yield
         prefetch._prefetch_running = False
         with cache._meeting_prep_cache_lock:
@@ -415,6 +564,84 @@ class TestPrefetchMeetingData:
         
         assert meeting_info.get('title') == 'Important Meeting'
 
+    
+    @patch('lib.prefetch.check_services_auth')
+    @patch('lib.prefetch.is_cache_valid', return_value=False)
+    @patch('lib.cache.save_prep_cache_to_disk')
+    def test_fetches_sources_concurrently(self, mock_save, mock_valid, mock_auth):
+        """Test that sources are fetched in parallel, bounded by the pool size."""
+        mock_auth.return_value = {'atlassian': True, 'slack': False, 'gmail': False}
+        barrier = threading.Barrier(prefetch.PREFETCH_MAX_WORKERS, timeout=5)
+        
+        def fake_cli(source, *args, **kwargs):
+            barrier.wait()
+            return [{'source': source}]
+        
+        prefetch.configure_cli_functions(fake_cli, lambda *args, **kwargs: {'status': 'empty'})
+        
+        meeting = {'id': 'parallel-test', 'title': 'Parallel', 'attendees': [], 'description': ''}
+        prefetch.prefetch_meeting_data(meeting)
+        
+        for source in ['drive', 'jira', 'confluence']:
+            assert cache.get_cached_data('parallel-test', source) == [{'source': source}]
+    
+    @patch('lib.prefetch.check_services_auth')
+    @patch('lib.prefetch.is_cache_valid', return_value=False)
+    @patch('lib.cache.save_prep_cache_to_disk')
+    def test_writes_source_results_once(self, mock_save, mock_valid, mock_auth):
+        """Test that all fetched sources are saved to disk in one write."""
+        mock_auth.return_value = {'atlassian': True, 'slack': True, 'gmail': True}
+        prefetch.configure_cli_functions(
+            lambda source, *args, **kwargs: [{'source': source}],
+            lambda *args, **kwargs: {'status': 'success', 'summary': 'ok'}
+        )
+        
+        with patch('lib.prefetch.set_meeting_cache_batch',
+                   wraps=cache.set_meeting_cache_batch) as mock_batch:
+            prefetch.prefetch_meeting_data({'id': 'batch-test', 'title': 'Batch', 'attendees': []})
+        
+        mock_batch.assert_called_once()
+        assert set(mock_batch.call_args[0][1]) == {'drive', 'jira', 'confluence', 'slack', 'gmail'}
+        assert cache.get_cached_data('batch-test', 'gmail') == [{'source': 'gmail'}]
+    
+    @patch('lib.prefetch.check_services_auth')
+    @patch('lib.prefetch.is_cache_valid', return_value=False)
+    @patch('lib.cache.save_prep_cache_to_disk')
+    def test_fetches_most_read_sources_first(self, mock_save, mock_valid, mock_auth):
+        """Test that sources are submitted in order of cache hit count."""
+        mock_auth.return_value = {'atlassian': True, 'slack': True, 'gmail': False}
+        submitted = []
+        hits = {'slack': 9, 'confluence': 5, 'drive': 1}
+        
+        def fake_submit(fn, source, *args):
+            submitted.append(source)
+            future = Future()
+            future.set_result([])
+            return future
+        
+        with patch('lib.prefetch.get_source_hit_count', side_effect=lambda s: hits.get(s, 0)), \
+             patch.object(prefetch._fetch_pool, 'submit', side_effect=fake_submit):
+            prefetch.prefetch_meeting_data({'id': 'order-test', 'title': 'Order', 'attendees': []})
+        
+        assert submitted == ['slack', 'confluence', 'drive', 'jira']
+    
+    @patch('lib.prefetch.check_services_auth')
+    @patch('lib.prefetch.is_cache_valid')
+    @patch('lib.cache.save_prep_cache_to_disk')
+    def test_uses_validity_snapshot(self, mock_save, mock_valid, mock_auth):
+        """Test that a caller-provided validity snapshot skips cache lookups."""
+        mock_auth.return_value = {'atlassian': True, 'slack': False, 'gmail': False}
+        fetched = []
+        prefetch.configure_cli_functions(
+            lambda source, *args, **kwargs: fetched.append(source) or [],
+            lambda *args, **kwargs: {'status': 'success', 'summary': ''}
+        )
+        validity = {'drive': True, 'jira': False, 'confluence': True, 'summary': True}
+        
+        prefetch.prefetch_meeting_data({'id': 'snap', 'title': 'Snap', 'attendees': []}, validity)
+        
+        mock_valid.assert_not_called()
+        assert fetched == ['jira']
 
 class TestSetForceAggressivePrefetch:
     """Test the set_force_aggressive_prefetch function."""
@@ -443,6 +670,131 @@ class TestSetForceAggressivePrefetch:
         assert prefetch._force_aggressive_prefetch == False
 
 
+
+class TestMeetingAttendees:
+    """Test the _meeting_attendees helper."""
+    
+    def test_builds_emails_and_names(self):
+        """Test emails skip blanks and names fall back to email, capped at 5."""
+        meeting = {'attendees': [
+            {'name': 'Ann', 'email': 'ann@x.com'},
+            {'email': 'bob@x.com'},
+            {'name': 'Room'},
+            {'name': 'D', 'email': 'd@x.com'},
+            {'name': 'E', 'email': 'e@x.com'},
+            {'name': 'F', 'email': 'f@x.com'},
+        ]}
+        
+        emails, names = prefetch._meeting_attendees(meeting)
+        
+        assert emails == ['ann@x.com', 'bob@x.com', 'd@x.com', 'e@x.com', 'f@x.com']
+        assert names == 'Ann, bob@x.com, Room, D, E'
+    
+    def test_reuses_result_for_same_meeting(self):
+        """Test that the derived fields are computed once per meeting dict."""
+        meeting = {'attendees': [{'name': 'Ann', 'email': 'ann@x.com'}]}
+        first = prefetch._meeting_attendees(meeting)
+        meeting['attendees'].append({'name': 'Late', 'email': 'late@x.com'})
+        
+        assert prefetch._meeting_attendees(meeting) is first
+
+class TestMeetingPriority:
+    """Test the _meeting_priority sort key."""
+    
+    def test_orders_by_start_then_attendee_count(self):
+        """Test that sooner meetings come first, then larger ones."""
+        events = [
+            {'id': 'later', 'start': '2026-01-02T09:00:00Z', 'attendees': [{}] * 9},
+            {'id': 'small', 'start': '2026-01-01T09:00:00Z', 'attendees': [{}]},
+            {'id': 'large', 'start': '2026-01-01T09:00:00Z', 'attendees': [{}] * 4},
+        ]
+        
+        events.sort(key=prefetch._meeting_priority)
+        
+        assert [e['id'] for e in events] == ['large', 'small', 'later']
+    
+    def test_handles_missing_fields(self):
+        """Test that meetings without start or attendees still sort."""
+        assert prefetch._meeting_priority({}) == ('', 0)
+
+
+class TestCalendarCacheTtl:
+    """Test the adaptive calendar cache TTL."""
+    
+    def test_shortens_as_next_meeting_approaches(self):
+        """Test that the TTL scales with minutes until the next meeting."""
+        events = {"events": [{"minutes_until": 3}, {"minutes_until": 40}], "in_meeting": False}
+        assert cache.calendar_cache_ttl(events) == 30
+        
+        events["events"][0]["minutes_until"] = 1
+        assert cache.calendar_cache_ttl(events) == 10
+    
+    def test_uses_ceiling_when_nothing_upcoming(self):
+        """Test that a quiet calendar uses the maximum TTL."""
+        assert cache.calendar_cache_ttl({"events": [], "in_meeting": False}) == config.CALENDAR_CACHE_MAX_TTL
+    
+    def test_caps_ttl_during_current_meeting(self):
+        """Test that an in-progress meeting keeps the TTL at CACHE_TTL so its end shows promptly."""
+        events = {
+            "events": [{"minutes_until": -20, "is_current": True}],
+            "in_meeting": True,
+        }
+        assert cache.calendar_cache_ttl(events) == config.CACHE_TTL
+    
+    def test_error_response_uses_default_ttl(self):
+        """Test that error responses fall back to CACHE_TTL."""
+        assert cache.calendar_cache_ttl({"error": "boom"}) == config.CACHE_TTL
+
+
+class TestSourceHitCounts:
+    """Test source hit counting on prep cache reads."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_counts(self):
+        """Reset hit counts around each test."""
+        with cache._source_hit_counts_lock:
+            saved = dict(cache._source_hit_counts)
+            cache._source_hit_counts.clear()
+        yield
+        with cache._source_hit_counts_lock:
+            cache._source_hit_counts.clear()
+            cache._source_hit_counts.update(saved)
+    
+    def test_get_cached_data_does_not_record_hit(self):
+        """Test that reading the cache alone does not count a hit; handlers record served sources."""
+        with cache._meeting_prep_cache_lock:
+            cache._meeting_prep_cache['hit-meeting'] = {'slack': {'data': [{'id': 1}], 'timestamp': time.time()}}
+        try:
+            cache.get_cached_data('hit-meeting', 'slack')
+            cache.get_cached_data('hit-meeting', 'jira')
+        finally:
+            with cache._meeting_prep_cache_lock:
+                cache._meeting_prep_cache.pop('hit-meeting', None)
+        
+        assert cache.get_source_hit_count('slack') == 0
+        assert cache.get_source_hit_count('jira') == 0
+    
+    def test_record_source_hit_counts_per_source(self):
+        """Test that served sources are counted independently."""
+        cache.record_source_hit('slack')
+        cache.record_source_hit('slack')
+        
+        assert cache.get_source_hit_count('slack') == 2
+        assert cache.get_source_hit_count('jira') == 0
+    
+    def test_round_trips_through_disk(self, tmp_path):
+        """Test that hit counts are saved and loaded from disk."""
+        hits_file = str(tmp_path / 'source_hits.json')
+        cache.record_source_hit('gmail')
+        
+        with patch('lib.cache.SOURCE_HITS_FILE', hits_file):
+            cache.save_source_hit_counts()
+            with cache._source_hit_counts_lock:
+                cache._source_hit_counts.clear()
+            cache.load_source_hit_counts()
+        
+        assert cache.get_source_hit_count('gmail') == 1
+
 class TestBackgroundPrefetchLoop:
     """Test key paths of the background_prefetch_loop function."""
     
@@ -479,7 +831,7 @@ class TestBackgroundPrefetchLoop:
         call_count = [0]
         def stop_after_one(*args, **kwargs):
             call_count[0] += 1
-            prefetch._prefetch_running = False
+            prefetch.stop_prefetch_thread()
             return []
         
         mock_calendar.side_effect = stop_after_one
@@ -490,6 +842,32 @@ class TestBackgroundPrefetchLoop:
         thread.join(timeout=3.0)
         
         assert call_count[0] >= 1
+        assert not thread.is_alive()
+    
+    @patch('lib.prefetch.get_calendar_events_standalone', return_value=[])
+    @patch('lib.prefetch.is_google_authenticated', return_value=True)
+    def test_stop_wakes_idle_wait(self, mock_auth, mock_calendar):
+        """Test that stopping interrupts the idle wait between cycles."""
+        prefetch._prefetch_running = True
+        prefetch._prefetch_wake_event.clear()
+        
+        thread = threading.Thread(target=prefetch.background_prefetch_loop)
+        thread.start()
+        time.sleep(0.2)
+        prefetch.stop_prefetch_thread()
+        thread.join(timeout=2.0)
+        
+        assert not thread.is_alive()
+    
+    def test_force_mode_sets_wake_event(self):
+        """Test that enabling force mode wakes the loop."""
+        prefetch._prefetch_wake_event.clear()
+        try:
+            prefetch.set_force_aggressive_prefetch("on")
+            assert prefetch._prefetch_wake_event.is_set()
+        finally:
+            prefetch.set_force_aggressive_prefetch("off")
+            prefetch._prefetch_wake_event.clear()
 
 
 class TestStartPrefetchThread:
@@ -630,6 +1008,27 @@ class TestCopyDb:
                 except:
                     pass
 
+    
+    def test_copies_only_existing_sidecar_files(self):
+        """Test that a missing WAL is skipped while an existing SHM is still copied."""
+        tmp_dir = tempfile.mkdtemp()
+        src_path = os.path.join(tmp_dir, 'db.sqlite')
+        with open(src_path, 'wb') as f:
+            f.write(b'main')
+        with open(src_path + '-shm', 'wb') as f:
+            f.write(b'shm')
+        
+        try:
+            result = utils.copy_db(src_path)
+            
+            assert result is not None
+            assert not os.path.exists(result + '-wal')
+            with open(result + '-shm', 'rb') as f:
+                assert f.read() == b'shm'
+            utils.cleanup_db(result)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
 
 class TestCleanupDb:
     """Test the cleanup_db function."""
@@ -686,6 +1085,24 @@ a,b,c"""
         """Test that header-only CSV returns empty list."""
         result = slack.parse_slack_csv('header1,header2')
         assert result == []
+    
+    def test_handles_doubled_quotes_and_embedded_newlines(self):
+        """Test that escaped quotes and multi-line quoted fields survive parsing."""
+        csv_text = 'name,message\nJohn,"She said ""hi""\nthen left"\nJane,ok'
+        
+        result = slack.parse_slack_csv(csv_text)
+        
+        assert len(result) == 2
+        assert result[0]['message'] == 'She said "hi"\nthen left'
+        assert result[1] == {'name': 'Jane', 'message': 'ok'}
+    
+    def test_skips_blank_and_short_rows(self):
+        """Test that blank lines and rows missing columns are dropped."""
+        csv_text = 'Name,Message\n\nJohn\n Jane , hello \n'
+        
+        result = slack.parse_slack_csv(csv_text)
+        
+        assert result == [{'name': 'Jane', 'message': 'hello'}]
 
 
 class TestExtractMcpContent:
@@ -820,6 +1237,24 @@ class TestBuildSlackUrl:
         assert slack.build_slack_url(None, '123.456') is None
 
 
+class TestCleanMpdmName:
+    """Test the _clean_mpdm_name helper."""
+    
+    def test_strips_prefix_and_suffix(self):
+        """Test that the mpdm- prefix and -1 suffix are removed."""
+        assert slack._clean_mpdm_name('mpdm-alice--bob--carol-1') == 'alice--bob--carol'
+    
+    def test_keeps_dash_one_inside_usernames(self):
+        """Test that -1 inside a username is left alone."""
+        assert slack._clean_mpdm_name('mpdm-user-1abc--bob-1') == 'user-1abc--bob'
+    
+    def test_handles_names_without_suffix(self):
+        """Test names missing the -1 suffix or the mpdm- prefix."""
+        assert slack._clean_mpdm_name('mpdm-alice--bob') == 'alice--bob'
+        assert slack._clean_mpdm_name('team-1') == 'team-1'
+        assert slack._clean_mpdm_name('') == ''
+
+
 class TestFormatSlackMessage:
     """Test the format_slack_message function."""
     
@@ -865,6 +1300,17 @@ class TestFormatSlackMessage:
         result = slack.format_slack_message(msg)
         
         assert len(result['title']) == 100
+    
+    def test_channel_display_matches_format_slack_channel(self):
+        """Test that message formatting labels channels like format_slack_channel."""
+        for channel in ['', '#', '#general', 'D123', '#mpdm-a--b-1']:
+            msg = {'text': 'Hi', 'channel': channel, 'realname': 'Ann', 'msgid': '1.1'}
+            
+            result = slack.format_slack_message(msg)
+            
+            assert result['channel'] == slack.format_slack_channel(channel, 'Ann')
+            assert result['channel_id'] == channel.lstrip('#')
+            assert result['slack_url'] == slack.build_slack_url(channel.lstrip('#'), '1.1')
 
 
 class TestScoreResult:
@@ -884,6 +1330,33 @@ class TestScoreResult:
         
         # Should get points for both words in title
         assert score > 0
+    
+    def test_score_components(self):
+        """Test the exact score from title, all-words, URL and visit count parts."""
+        result = {'title': 'React Native Docs', 'url': 'https://react.dev/native', 'visit_count': 80}
+        
+        assert utils.score_result(result, 'react native', ['react', 'native']) == 100 + 50 + 20 + 50
+        assert utils.score_result(result, 'native react', ['native', 'react']) == 50 + 20 + 50
+        assert utils.score_result(result, 'react vue', ['react', 'vue']) == 10 + 50
+
+
+class TestScoreResults:
+    """Test the score_results batch scorer."""
+    
+    def test_matches_score_result_for_each_result(self):
+        """Test that batch scores equal individual score_result calls."""
+        results = [
+            {'title': 'React Native Docs', 'url': 'https://reactnative.dev', 'visit_count': 5},
+            {'title': 'Native plants', 'url': 'https://plants.example.com'},
+            {'title': 'Nothing', 'url': 'https://example.com/react'},
+        ]
+        
+        scored = list(utils.score_results(results, 'React Native', ['react', 'native']))
+        
+        assert [r for _, r in scored] == results
+        assert [score for score, _ in scored] == [
+            utils.score_result(r, 'React Native', ['react', 'native']) for r in results
+        ]
 
 
 class TestIsNightHours:
@@ -1133,10 +1606,10 @@ class TestActivityLog:
     def clear_status(self):
         """Clear prefetch status before each test."""
         with prefetch._prefetch_status_lock:
-            prefetch._prefetch_status['activity_log'] = []
+            prefetch._prefetch_status['activity_log'].clear()
         yield
         with prefetch._prefetch_status_lock:
-            prefetch._prefetch_status['activity_log'] = []
+            prefetch._prefetch_status['activity_log'].clear()
     
     def test_activity_log_concurrent_access(self):
         """Test thread-safe concurrent access to activity log."""
@@ -1205,6 +1678,24 @@ class TestActivityLog:
         assert 'timestamp' in entry
 
 
+class TestUpdateUserConfig:
+    """Test the atomic config.json writer."""
+    
+    def test_merges_with_file_and_replaces_atomically(self, tmp_path):
+        """Test that updates merge with the on-disk config and leave no temp file."""
+        config_file = tmp_path / 'config.json'
+        config_file.write_text('{"safariEnabled": true}')
+        
+        with patch.object(config, 'USER_CONFIG_FILE', str(config_file)), \
+             patch.dict(config.USER_CONFIG, {}, clear=True):
+            result = config.update_user_config({'hubModel': 'sonnet'})
+            assert config.USER_CONFIG == {'hubModel': 'sonnet'}
+        
+        assert result == {'safariEnabled': True, 'hubModel': 'sonnet'}
+        assert json.loads(config_file.read_text()) == result
+        assert not (tmp_path / 'config.json.tmp').exists()
+
+
 # ============================================================================
 # Run tests
 # ============================================================================
@@ -5,6 +5,7 @@ Run with: pytest tests/test_slack.py -v
 """
 import sys
 import os
+import json
 import time
 import pytest
 from unittest.mock import patch, MagicMock, PropertyMock
@@ -13,6 +14,14 @@ from unittest.mock import patch, MagicMock, PropertyMock
 sys.path.insert(0, os.path.dirname(__file__))
 
 
+def _mock_response(payload):
+    """Build a mock requests response whose body parses to payload."""
+    response = MagicMock()
+    response.content = json.dumps(payload).encode('utf-8')
+    response.json.return_value = payload
+    return response
+
+
 # =============================================================================
 # Test get_slack_tokens
 # =============================================================================
@@ -111,11 +120,16 @@ class TestSlackApiCall:
 
     @pytest.fixture(autouse=True)
     def reset_tokens(self):
-        """Reset tokens before each test."""
+        """Reset tokens and the shared HTTP session before each test."""
         import search_server_funcs as funcs
+        import lib.slack as slack_module
         funcs._slack_tokens = None
+        slack_module._slack_headers = None
+        slack_module._slack_session = None
         yield
         funcs._slack_tokens = None
+        slack_module._slack_headers = None
+        slack_module._slack_session = None
 
     @patch('lib.slack.slack_requests')
     @patch('lib.slack.get_slack_tokens')
@@ -124,15 +138,14 @@ class TestSlackApiCall:
         from search_server_funcs import slack_api_call
         
         mock_get_tokens.return_value = {'xoxc': 'test-token', 'xoxd': 'test-xoxd'}
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'ok': True, 'data': 'test'}
-        mock_requests.get.return_value = mock_response
+        mock_response = _mock_response({'ok': True, 'data': 'test'})
+        mock_requests.Session.return_value.get.return_value = mock_response
         
         result = slack_api_call('users.list', {'limit': 10})
         
         assert result == {'ok': True, 'data': 'test'}
-        mock_requests.get.assert_called_once()
-        call_args = mock_requests.get.call_args
+        mock_requests.Session.return_value.get.assert_called_once()
+        call_args = mock_requests.Session.return_value.get.call_args
         assert 'https://slack.com/api/users.list' in call_args[0]
 
     @patch('lib.slack.slack_requests')
@@ -142,14 +155,42 @@ class TestSlackApiCall:
         from search_server_funcs import slack_api_call
         
         mock_get_tokens.return_value = {'xoxc': 'test-token', 'xoxd': 'test-xoxd'}
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'ok': True, 'ts': '123.456'}
-        mock_requests.post.return_value = mock_response
+        mock_response = _mock_response({'ok': True, 'ts': '123.456'})
+        mock_requests.Session.return_value.post.return_value = mock_response
         
         result = slack_api_call('chat.postMessage', post_data={'channel': 'C123', 'text': 'Hello'})
         
         assert result == {'ok': True, 'ts': '123.456'}
-        mock_requests.post.assert_called_once()
+        mock_requests.Session.return_value.post.assert_called_once()
+
+    @patch('lib.slack.slack_requests')
+    @patch('lib.slack.get_slack_tokens')
+    def test_builds_headers_once(self, mock_get_tokens, mock_requests):
+        """Test that token headers are built on the first call and reused."""
+        from search_server_funcs import slack_api_call
+        
+        mock_get_tokens.return_value = {'xoxp': 'xoxp-token'}
+        mock_requests.Session.return_value.get.return_value = _mock_response({'ok': True})
+        
+        slack_api_call('users.list')
+        slack_api_call('conversations.list')
+        
+        assert mock_get_tokens.call_count == 1
+        calls = mock_requests.Session.return_value.get.call_args_list
+        assert calls[0][1]['headers'] is calls[1][1]['headers']
+        assert calls[0][1]['headers']['Authorization'] == 'Bearer xoxp-token'
+
+    @patch('lib.slack.slack_requests')
+    def test_reset_tokens_clears_headers(self, mock_requests):
+        """Test that resetting tokens forces headers to be rebuilt."""
+        import lib.slack as slack_module
+        from search_server_funcs import reset_slack_tokens
+        
+        slack_module._slack_headers = {'Authorization': 'Bearer old'}
+        
+        reset_slack_tokens()
+        
+        assert slack_module._slack_headers is None
 
     @patch('lib.slack.get_slack_tokens')
     def test_returns_error_when_no_token(self, mock_get_tokens):
@@ -185,7 +226,7 @@ class TestSlackApiCall:
         
         mock_requests.exceptions.HTTPError = MockHTTPError
         mock_requests.exceptions.RequestException = MockRequestException
-        mock_requests.get.return_value.raise_for_status.side_effect = MockHTTPError(mock_response)
+        mock_requests.Session.return_value.get.return_value.raise_for_status.side_effect = MockHTTPError(mock_response)
         
         result = slack_api_call('users.list')
         
@@ -199,7 +240,7 @@ class TestSlackApiCall:
         from search_server_funcs import slack_api_call
         
         mock_get_tokens.return_value = {'xoxc': 'test-token', 'xoxd': 'test-xoxd'}
-        mock_requests.get.side_effect = Exception('Connection failed')
+        mock_requests.Session.return_value.get.side_effect = Exception('Connection failed')
         mock_requests.exceptions.HTTPError = type('HTTPError', (Exception,), {})
         mock_requests.exceptions.RequestException = type('RequestException', (Exception,), {})
         
@@ -215,17 +256,101 @@ class TestSlackApiCall:
         from search_server_funcs import slack_api_call
         
         mock_get_tokens.return_value = {'xoxc': 'xoxc-token-123', 'xoxd': 'xoxd-cookie-456'}
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'ok': True}
-        mock_requests.get.return_value = mock_response
+        mock_response = _mock_response({'ok': True})
+        mock_requests.Session.return_value.get.return_value = mock_response
         
         slack_api_call('users.list')
         
-        call_kwargs = mock_requests.get.call_args[1]
+        call_kwargs = mock_requests.Session.return_value.get.call_args[1]
         headers = call_kwargs['headers']
         assert 'Bearer xoxc-token-123' in headers['Authorization']
         assert 'd=xoxd-cookie-456' in headers['Cookie']
 
+    @patch('lib.slack.slack_requests')
+    @patch('lib.slack.get_slack_tokens')
+    def test_reuses_one_session_across_calls(self, mock_get_tokens, mock_requests):
+        """Test that calls share one pooled session instead of new connections."""
+        from search_server_funcs import slack_api_call
+        
+        mock_get_tokens.return_value = {'xoxp': 'xoxp-token'}
+        mock_requests.Session.return_value.get.return_value = _mock_response({'ok': True})
+        
+        slack_api_call('users.list')
+        slack_api_call('conversations.list')
+        
+        mock_requests.Session.assert_called_once()
+        assert mock_requests.Session.return_value.get.call_count == 2
+        mock_requests.Session.return_value.mount.assert_called_once_with(
+            'https://', mock_requests.adapters.HTTPAdapter.return_value)
+
+    @patch('lib.slack.slack_requests')
+    @patch('lib.slack.get_slack_tokens')
+    def test_parses_body_with_orjson_when_available(self, mock_get_tokens, mock_requests):
+        """Test that the raw body is parsed with orjson instead of response.json()."""
+        from search_server_funcs import slack_api_call
+        
+        mock_get_tokens.return_value = {'xoxp': 'xoxp-token'}
+        mock_response = _mock_response({'ok': True, 'members': []})
+        mock_requests.Session.return_value.get.return_value = mock_response
+        fake_orjson = MagicMock()
+        fake_orjson.loads.return_value = {'ok': True, 'members': ['parsed']}
+        
+        with patch('lib.slack.orjson', fake_orjson):
+            result = slack_api_call('users.list')
+        
+        fake_orjson.loads.assert_called_once_with(mock_response.content)
+        mock_response.json.assert_not_called()
+        assert result == {'ok': True, 'members': ['parsed']}
+
+    @patch('lib.slack.slack_requests')
+    @patch('lib.slack.get_slack_tokens')
+    def test_falls_back_to_response_json(self, mock_get_tokens, mock_requests):
+        """Test that response.json() is used when orjson is not installed."""
+        from search_server_funcs import slack_api_call
+        
+        mock_get_tokens.return_value = {'xoxp': 'xoxp-token'}
+        mock_requests.Session.return_value.get.return_value = _mock_response({'ok': True, 'ts': '1.0'})
+        
+        with patch('lib.slack.orjson', None):
+            result = slack_api_call('users.list')
+        
+        assert result == {'ok': True, 'ts': '1.0'}
+
+    @patch('lib.slack.slack_requests')
+    @patch('lib.slack.get_slack_tokens')
+    def test_conditional_request_returns_etag(self, mock_get_tokens, mock_requests):
+        """Test that ETags are collected and sent back as If-None-Match."""
+        from search_server_funcs import slack_api_call
+        
+        mock_get_tokens.return_value = {'xoxp': 'xoxp-token'}
+        mock_response = _mock_response({'ok': True})
+        mock_response.headers = {'ETag': '"v1"'}
+        mock_requests.Session.return_value.get.return_value = mock_response
+        
+        result = slack_api_call('users.list', etag='')
+        
+        assert result == {'ok': True, '_etag': '"v1"'}
+        headers = mock_requests.Session.return_value.get.call_args[1]['headers']
+        assert 'If-None-Match' not in headers
+        
+        mock_response.status_code = 304
+        result = slack_api_call('users.list', etag='"v1"')
+        
+        assert result == {'ok': True, 'not_modified': True}
+        headers = mock_requests.Session.return_value.get.call_args[1]['headers']
+        assert headers['If-None-Match'] == '"v1"'
+
+    @patch('lib.slack.slack_requests')
+    def test_reset_tokens_closes_session(self, mock_requests):
+        """Test that resetting tokens drops the cached session."""
+        import lib.slack as slack_module
+        
+        session = slack_module._get_slack_session()
+        slack_module.reset_slack_tokens()
+        
+        session.close.assert_called_once()
+        assert slack_module._slack_session is None
+
 
 # =============================================================================
 # Test slack_get_users
@@ -235,12 +360,27 @@ class TestSlackGetUsers:
     """Test the slack_get_users function."""
 
     @pytest.fixture(autouse=True)
-    def reset_cache(self):
-        """Reset the users cache before each test."""
+    def reset_cache(self, tmp_path):
+        """Reset the users cache and point its disk copy at a temp file."""
         import lib.slack as slack_module
         slack_module._slack_users_cache = {"data": None, "timestamp": 0}
-        yield
+        slack_module._slack_users_refreshing = False
+        slack_module._slack_users_pages.clear()
+        self.users_file = str(tmp_path / 'slack_users.json')
+        with patch('lib.slack.SLACK_USERS_FILE', self.users_file):
+            yield
         slack_module._slack_users_cache = {"data": None, "timestamp": 0}
+        slack_module._slack_users_refreshing = False
+        slack_module._slack_users_pages.clear()
+
+    @staticmethod
+    def _wait_for_refresh():
+        """Wait for a background users refresh to finish."""
+        import lib.slack as slack_module
+        deadline = time.time() + 5
+        while slack_module._slack_users_refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        assert not slack_module._slack_users_refreshing
 
     @patch('lib.slack.slack_api_call')
     def test_returns_users_map(self, mock_api_call):
@@ -263,9 +403,25 @@ class TestSlackGetUsers:
         assert result['U123']['username'] == 'john'
         assert 'U456' in result
 
+    @patch('lib.slack.slack_api_call')
+    def test_builds_username_index(self, mock_api_call):
+        """Test that a lowercased username index is cached with the users."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_users
+        
+        mock_api_call.return_value = {
+            'ok': True,
+            'members': [{'id': 'U1', 'name': 'JDoe', 'real_name': 'John', 'profile': {}}],
+            'response_metadata': {}
+        }
+        
+        result = slack_get_users()
+        
+        assert slack_module._slack_users_cache['by_username'] == {'jdoe': result['U1']}
+
     @patch('lib.slack.slack_api_call')
     def test_handles_pagination(self, mock_api_call):
-        """Test that pagination is handled correctly."""
+        """Test that the first page is returned and later pages fill in the background."""
         from search_server_funcs import slack_get_users
         
         # First call returns cursor for next page
@@ -283,10 +439,34 @@ class TestSlackGetUsers:
         ]
         
         result = slack_get_users()
+        self._wait_for_refresh()
         
-        assert 'U1' in result
-        assert 'U2' in result
+        assert list(result) == ['U1']
         assert mock_api_call.call_count == 2
+        assert mock_api_call.call_args[0][1]['cursor'] == 'cursor123'
+        assert sorted(slack_get_users()) == ['U1', 'U2']
+
+    @patch('lib.slack.slack_api_call')
+    def test_reset_tokens_drops_cached_and_saved_users(self, mock_api_call):
+        """Test that after a token reset the old workspace's users are not served."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_users
+        
+        old_users = {'UOLD': {'id': 'UOLD', 'name': 'Old User'}}
+        slack_module._store_slack_users(old_users, time.time())
+        slack_module._save_slack_users_to_disk(old_users, time.time())
+        mock_api_call.return_value = {
+            'ok': True,
+            'members': [{'id': 'UNEW', 'name': 'new', 'real_name': 'New User', 'profile': {}}],
+            'response_metadata': {}
+        }
+        
+        slack_module.reset_slack_tokens()
+        result = slack_get_users()
+        
+        assert list(result) == ['UNEW']
+        with open(self.users_file) as f:
+            assert list(json.load(f)['users']) == ['UNEW']
 
     @patch('lib.slack.slack_api_call')
     def test_returns_cached_data_within_ttl(self, mock_api_call):
@@ -308,7 +488,7 @@ class TestSlackGetUsers:
 
     @patch('lib.slack.slack_api_call')
     def test_refreshes_expired_cache(self, mock_api_call):
-        """Test that expired cache is refreshed."""
+        """Test that expired cache is served stale and refreshed in the background."""
         import lib.slack as slack_module
         from search_server_funcs import slack_get_users
         
@@ -325,9 +505,123 @@ class TestSlackGetUsers:
         }
         
         result = slack_get_users()
+        self._wait_for_refresh()
         
+        assert 'U999' in result
         mock_api_call.assert_called()
-        assert 'U1' in result
+        assert 'U1' in slack_get_users()
+
+    @patch('lib.slack.slack_api_call')
+    def test_skips_refresh_when_one_is_running(self, mock_api_call):
+        """Test that only one background refresh runs at a time."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_users
+        
+        slack_module._slack_users_cache = {
+            'data': {'U999': {'id': 'U999', 'name': 'Old User'}},
+            'timestamp': time.time() - 1000
+        }
+        slack_module._slack_users_refreshing = True
+        
+        result = slack_get_users()
+        
+        assert 'U999' in result
+        mock_api_call.assert_not_called()
+
+    @patch('lib.slack.slack_api_call')
+    def test_keeps_stale_users_when_refresh_fails(self, mock_api_call):
+        """Test that a failed background refresh does not wipe the cached users."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_users
+        
+        slack_module._slack_users_cache = {
+            'data': {'U999': {'id': 'U999', 'name': 'Old User'}},
+            'timestamp': time.time() - 1000
+        }
+        mock_api_call.return_value = {'ok': False, 'error': 'ratelimited'}
+        
+        slack_get_users()
+        self._wait_for_refresh()
+        
+        mock_api_call.assert_called()
+        assert 'U999' in slack_module._slack_users_cache['data']
+
+    @patch('lib.slack.slack_api_call')
+    def test_saves_complete_fetch_to_disk(self, mock_api_call):
+        """Test that a complete users fetch is written to the disk cache."""
+        from search_server_funcs import slack_get_users
+        
+        mock_api_call.return_value = {
+            'ok': True,
+            'members': [{'id': 'U1', 'name': 'ann', 'real_name': 'Ann', 'profile': {}}],
+            'response_metadata': {}
+        }
+        
+        slack_get_users()
+        
+        with open(self.users_file) as f:
+            saved = json.load(f)
+        assert list(saved['users']) == ['U1']
+        assert mock_api_call.call_args[0][1]['limit'] == 1000
+
+    @patch('lib.slack.slack_api_call')
+    def test_serves_disk_copy_after_restart(self, mock_api_call):
+        """Test that users saved to disk are returned without waiting on users.list."""
+        from search_server_funcs import slack_get_users
+        
+        with open(self.users_file, 'w') as f:
+            json.dump({'timestamp': time.time() - 3600, 'users': {'U9': {'id': 'U9', 'name': 'Saved'}}}, f)
+        mock_api_call.return_value = {
+            'ok': True,
+            'members': [{'id': 'U1', 'name': 'ann', 'real_name': 'Ann', 'profile': {}}],
+            'response_metadata': {}
+        }
+        
+        result = slack_get_users()
+        self._wait_for_refresh()
+        
+        assert list(result) == ['U9']
+        assert list(slack_get_users()) == ['U1']
+
+    @patch('lib.slack.slack_api_call')
+    def test_ignores_expired_disk_copy(self, mock_api_call):
+        """Test that a disk copy older than the disk TTL is not served."""
+        from search_server_funcs import slack_get_users
+        
+        with open(self.users_file, 'w') as f:
+            json.dump({'timestamp': time.time() - 2 * 86400, 'users': {'U9': {'id': 'U9'}}}, f)
+        mock_api_call.return_value = {
+            'ok': True,
+            'members': [{'id': 'U1', 'name': 'ann', 'real_name': 'Ann', 'profile': {}}],
+            'response_metadata': {}
+        }
+        
+        result = slack_get_users()
+        
+        assert list(result) == ['U1']
+
+    @patch('lib.slack.slack_api_call')
+    def test_reuses_unchanged_page_on_not_modified(self, mock_api_call):
+        """Test that a page answered with 304 is served from the last fetch."""
+        import lib.slack as slack_module
+        
+        mock_api_call.side_effect = [
+            {
+                'ok': True,
+                'members': [{'id': 'U1', 'name': 'ann', 'real_name': 'Ann', 'profile': {}}],
+                'response_metadata': {},
+                '_etag': '"v1"'
+            },
+            {'ok': True, 'not_modified': True}
+        ]
+        
+        first = slack_module._fetch_users_page()
+        second = slack_module._fetch_users_page()
+        
+        assert second == first
+        assert list(second[0]) == ['U1']
+        assert mock_api_call.call_args_list[0][1]['etag'] == ''
+        assert mock_api_call.call_args_list[1][1]['etag'] == '"v1"'
 
     @patch('lib.slack.slack_api_call')
     def test_handles_api_error(self, mock_api_call):
@@ -349,6 +643,15 @@ class TestSlackGetUsers:
 class TestSlackGetUnreadCounts:
     """Test the slack_get_unread_counts function."""
 
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Reset the counts cache before each test."""
+        import lib.slack as slack_module
+        slack_module._slack_counts_cache = {'data': None, 'timestamp': 0}
+        with patch('lib.slack.is_using_oauth_token', return_value=False):
+            yield
+        slack_module._slack_counts_cache = {'data': None, 'timestamp': 0}
+
     @patch('lib.slack.slack_api_call')
     def test_returns_unread_counts(self, mock_api_call):
         """Test that unread counts are returned correctly."""
@@ -391,6 +694,48 @@ class TestSlackGetUnreadCounts:
         
         mock_api_call.assert_called_once_with('client.counts', post_data={})
 
+    @patch('lib.slack.slack_api_call')
+    def test_serves_repeat_calls_from_cache(self, mock_api_call):
+        """Test that client.counts is called once within the TTL."""
+        from search_server_funcs import slack_get_unread_counts
+        
+        mock_api_call.return_value = {'ok': True, 'ims': [{'id': 'D1'}], 'channels': [], 'mpims': [], 'threads': {}}
+        
+        first = slack_get_unread_counts()
+        second = slack_get_unread_counts()
+        
+        assert first == second
+        mock_api_call.assert_called_once()
+
+    @patch('lib.slack.slack_api_call')
+    def test_refreshes_expired_cache(self, mock_api_call):
+        """Test that an expired counts cache triggers a new call."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_unread_counts
+        
+        slack_module._slack_counts_cache = {
+            'data': {'ims': [], 'channels': [], 'mpims': [], 'threads': {}},
+            'timestamp': time.time() - 60
+        }
+        mock_api_call.return_value = {'ok': True, 'ims': [{'id': 'D1'}], 'channels': [], 'mpims': [], 'threads': {}}
+        
+        result = slack_get_unread_counts()
+        
+        mock_api_call.assert_called_once()
+        assert result['ims'] == [{'id': 'D1'}]
+
+    @patch('lib.slack.slack_api_call')
+    def test_does_not_cache_failures(self, mock_api_call):
+        """Test that a failed call is retried on the next request."""
+        from search_server_funcs import slack_get_unread_counts
+        
+        mock_api_call.return_value = {'ok': False, 'error': 'ratelimited'}
+        
+        slack_get_unread_counts()
+        slack_get_unread_counts()
+        
+        assert mock_api_call.call_count == 2
+
 
 # =============================================================================
 # Test slack_ts_to_iso (edge cases)
@@ -463,6 +808,30 @@ class TestSlackTsToIso:
         result = slack_ts_to_iso("1706745600")
         assert result != ''
 
+    def test_memoizes_repeated_timestamps(self):
+        """Test that repeated timestamps are converted once."""
+        from lib import utils
+        from search_server_funcs import slack_ts_to_iso
+        
+        utils._slack_ts_to_iso.cache_clear()
+        first = slack_ts_to_iso("1706745600.000100")
+        second = slack_ts_to_iso("1706745600.000100")
+        
+        assert first == second
+        assert utils._slack_ts_to_iso.cache_info().hits == 1
+
+    def test_keeps_microseconds(self):
+        """Test that the fractional part of the timestamp is preserved."""
+        from search_server_funcs import slack_ts_to_iso
+        
+        assert slack_ts_to_iso("1706745600.250000").endswith('.250000')
+
+    def test_slack_module_shares_utils_implementation(self):
+        """Test that lib.slack and lib.utils expose the same converter."""
+        from lib import slack, utils
+        
+        assert slack.slack_ts_to_iso is utils.slack_ts_to_iso
+
 
 # =============================================================================
 # Test slack_get_conversations_fast
@@ -475,9 +844,14 @@ class TestSlackGetConversationsFast:
     def reset_caches(self):
         """Reset caches before each test."""
         import search_server_funcs as funcs
+        import lib.slack as slack_module
         funcs._slack_users_cache = {"data": None, "timestamp": 0}
+        slack_module._slack_conv_info_cache.clear()
+        slack_module._slack_user_info_cache.clear()
         yield
         funcs._slack_users_cache = {"data": None, "timestamp": 0}
+        slack_module._slack_conv_info_cache.clear()
+        slack_module._slack_user_info_cache.clear()
 
     @patch('lib.slack.slack_api_call')
     @patch('lib.slack.slack_get_users')
@@ -567,6 +941,308 @@ class TestSlackGetConversationsFast:
             assert item.get('unread_count', 0) >= 0
 
 
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_fetches_unread_channel_info_concurrently(self, mock_unread, mock_users):
+        """Test that conversations.info lookups overlap instead of running serially."""
+        import threading
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {}
+        mock_unread.return_value = {
+            'ims': [],
+            'channels': [{'id': f'C{i}', 'has_unreads': True} for i in range(3)],
+            'mpims': [],
+            'threads': {}
+        }
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def fake_api_call(method, params=None, **kwargs):
+            if method == 'conversations.list':
+                return {'ok': True, 'channels': []}
+            barrier.wait()
+            return {'ok': True, 'channel': {'name': f"name-{params['channel']}"}}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10, unread_only=True)
+        
+        assert sorted(c['name'] for c in result) == ['#name-C0', '#name-C1', '#name-C2']
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_caches_conversation_info_between_calls(self, mock_unread, mock_users):
+        """Test that conversations.info is only called once per channel within the TTL."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {}
+        mock_unread.return_value = {
+            'ims': [],
+            'channels': [{'id': 'C1', 'has_unreads': True}],
+            'mpims': [],
+            'threads': {}
+        }
+        calls = []
+        
+        def fake_api_call(method, params=None, **kwargs):
+            calls.append(method)
+            if method == 'conversations.list':
+                return {'ok': True, 'channels': []}
+            return {'ok': True, 'channel': {'name': 'general'}}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            first = slack_get_conversations_fast(limit=10, unread_only=True)
+            second = slack_get_conversations_fast(limit=10, unread_only=True)
+        
+        assert first[0]['name'] == second[0]['name'] == '#general'
+        assert calls.count('conversations.info') == 1
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_resolves_unknown_dm_users_with_users_info(self, mock_unread, mock_users):
+        """Test that DM partners missing from the users cache are looked up individually."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {'U1': {'id': 'U1', 'name': 'Known'}}
+        mock_unread.return_value = {'ims': [], 'channels': [], 'mpims': [], 'threads': {}}
+        calls = []
+        
+        def fake_api_call(method, params=None, **kwargs):
+            calls.append((method, params))
+            if method == 'users.info':
+                return {'ok': True, 'user': {'id': 'U2', 'name': 'newbie', 'real_name': 'New Person'}}
+            if params.get('types') == 'im':
+                return {'ok': True, 'channels': [
+                    {'id': 'D1', 'is_im': True, 'user': 'U1'},
+                    {'id': 'D2', 'is_im': True, 'user': 'U2'},
+                ]}
+            return {'ok': True, 'channels': []}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10)
+        
+        names = {c['channel_id']: c['name'] for c in result}
+        assert names == {'D1': 'Known', 'D2': 'New Person'}
+        assert [p for m, p in calls if m == 'users.info'] == [{'user': 'U2'}]
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_caches_unresolvable_dm_users(self, mock_unread, mock_users):
+        """Test that a DM user Slack can't resolve is looked up once per TTL, not every render."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {}
+        mock_unread.return_value = {'ims': [], 'channels': [], 'mpims': [], 'threads': {}}
+        calls = []
+        
+        def fake_api_call(method, params=None, **kwargs):
+            calls.append(method)
+            if method == 'users.info':
+                return {'ok': False, 'error': 'user_not_found'}
+            if params.get('types') == 'im':
+                return {'ok': True, 'channels': [{'id': 'D9', 'is_im': True, 'user': 'UEXT'}]}
+            return {'ok': True, 'channels': []}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            first = slack_get_conversations_fast(limit=10)
+            second = slack_get_conversations_fast(limit=10)
+        
+        assert first[0]['name'] == second[0]['name'] == 'UEXT'
+        assert calls.count('users.info') == 1
+
+    def test_fetches_recent_lists_concurrently(self):
+        """Test that users, client.counts and the im, mpim and channel lists overlap."""
+        import threading
+        from search_server_funcs import slack_get_conversations_fast
+        
+        barrier = threading.Barrier(5, timeout=5)
+        
+        def fake_users():
+            barrier.wait()
+            return {}
+        
+        def fake_unread():
+            barrier.wait()
+            return {'ims': [], 'channels': [], 'mpims': [], 'threads': {}}
+        
+        def fake_api_call(method, params=None, **kwargs):
+            barrier.wait()
+            conv_id = params['types'].split(',')[0]
+            return {'ok': True, 'channels': [{'id': conv_id, 'name': conv_id}]}
+        
+        with patch('lib.slack.slack_get_users', side_effect=fake_users), \
+                patch('lib.slack.slack_get_unread_counts', side_effect=fake_unread), \
+                patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10)
+        
+        assert sorted(c['channel_id'] for c in result) == ['im', 'mpim', 'public_channel']
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_unread_dm_is_not_duplicated_by_recent_list(self, mock_unread, mock_users):
+        """Test that a DM from both the unread lookup and conversations.list appears once."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {'U1': {'id': 'U1', 'name': 'alice', 'real_name': 'Alice'}}
+        mock_unread.return_value = {
+            'ims': [{'id': 'D1', 'has_unreads': True, 'mention_count': 2, 'latest': '1706745600.0'}],
+            'channels': [],
+            'mpims': [],
+            'threads': {}
+        }
+        
+        def fake_api_call(method, params=None, **kwargs):
+            if method == 'conversations.info':
+                return {'ok': True, 'channel': {'is_im': True, 'user': 'U1'}}
+            if params.get('types') == 'im':
+                return {'ok': True, 'channels': [{'id': 'D1', 'is_im': True, 'user': 'U1'}]}
+            return {'ok': True, 'channels': []}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10)
+        
+        assert [c['channel_id'] for c in result] == ['D1']
+        assert result[0]['unread_count'] == 2
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_sorts_by_timestamp_with_unread_threads_first(self, mock_unread, mock_users):
+        """Test that unread threads lead and the rest are ordered newest first."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {}
+        mock_unread.return_value = {
+            'ims': [],
+            'channels': [
+                {'id': 'C_OLD', 'latest': '999999999.000100'},
+                {'id': 'C_NEW', 'latest': '1706745600.000100'},
+            ],
+            'mpims': [],
+            'threads': {'has_unreads': True, 'mention_count': 1, 'latest': '1.0'}
+        }
+        
+        def fake_api_call(method, params=None, **kwargs):
+            if params.get('types') == 'public_channel,private_channel':
+                return {'ok': True, 'channels': [
+                    {'id': 'C_NONE', 'name': 'quiet'},
+                    {'id': 'C_OLD', 'name': 'old'},
+                    {'id': 'C_NEW', 'name': 'new'},
+                ]}
+            return {'ok': True, 'channels': []}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10)
+        
+        assert [c['channel_id'] for c in result] == ['threads', 'C_NEW', 'C_OLD', 'C_NONE']
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_reads_group_dm_counts(self, mock_unread, mock_users):
+        """Test that group DM unread counts and timestamps come from client.counts."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {}
+        mock_unread.return_value = {
+            'ims': [],
+            'channels': [],
+            'mpims': [{'id': 'G1', 'mention_count': 4, 'latest': '1706745600.0'}],
+            'threads': {}
+        }
+        
+        def fake_api_call(method, params=None, **kwargs):
+            if params.get('types') == 'mpim':
+                return {'ok': True, 'channels': [{'id': 'G1', 'is_mpim': True, 'name': 'mpdm-a--b-1'}]}
+            return {'ok': True, 'channels': []}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10)
+        
+        assert result[0]['channel_id'] == 'G1'
+        assert result[0]['unread_count'] == 4
+        assert result[0]['latest_ts'] != ''
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_resolves_unread_ids_from_single_list_call(self, mock_unread, mock_users):
+        """Test that unread IDs are resolved from one conversations.list, with info only for misses."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {'U1': {'id': 'U1', 'name': 'alice', 'real_name': 'Alice'}}
+        mock_unread.return_value = {
+            'ims': [{'id': 'D1', 'has_unreads': True}],
+            'channels': [{'id': 'C1', 'has_unreads': True}, {'id': 'C2', 'has_unreads': True}],
+            'mpims': [],
+            'threads': {}
+        }
+        calls = []
+        
+        def fake_api_call(method, params=None, **kwargs):
+            calls.append((method, params))
+            if method == 'conversations.list':
+                return {'ok': True, 'channels': [
+                    {'id': 'D1', 'is_im': True, 'user': 'U1'},
+                    {'id': 'C1', 'name': 'general'},
+                ]}
+            return {'ok': True, 'channel': {'name': 'private'}}
+        
+        with patch('lib.slack.slack_api_call', side_effect=fake_api_call):
+            result = slack_get_conversations_fast(limit=10, unread_only=True)
+        
+        assert sorted(c['name'] for c in result) == ['#general', '#private', 'Alice']
+        assert [m for m, _ in calls].count('conversations.list') == 1
+        assert calls[0][1]['types'] == 'im,mpim,public_channel,private_channel'
+        assert [p for m, p in calls if m == 'conversations.info'] == [{'channel': 'C2'}]
+
+    @patch('lib.slack.slack_get_users')
+    @patch('lib.slack.slack_get_unread_counts')
+    def test_unread_mode_skips_users_without_unread_dms(self, mock_unread, mock_users):
+        """Test that unread mode only loads users when a 1:1 DM has unreads."""
+        from search_server_funcs import slack_get_conversations_fast
+        
+        mock_users.return_value = {'U1': {'id': 'U1', 'name': 'alice', 'real_name': 'Alice'}}
+        mock_unread.return_value = {
+            'ims': [{'id': 'D1'}],
+            'channels': [{'id': 'C1', 'has_unreads': True}],
+            'mpims': [],
+            'threads': {}
+        }
+        listed = {'ok': True, 'channels': [
+            {'id': 'D1', 'is_im': True, 'user': 'U1'},
+            {'id': 'C1', 'name': 'general'},
+        ]}
+        
+        with patch('lib.slack.slack_api_call', return_value=listed):
+            result = slack_get_conversations_fast(limit=10, unread_only=True)
+        
+        assert [c['name'] for c in result] == ['#general']
+        mock_users.assert_not_called()
+        
+        mock_unread.return_value['ims'] = [{'id': 'D1', 'has_unreads': True}]
+        with patch('lib.slack.slack_api_call', return_value=listed):
+            result = slack_get_conversations_fast(limit=10, unread_only=True)
+        
+        assert sorted(c['name'] for c in result) == ['#general', 'Alice']
+        mock_users.assert_called_once()
+
+    def test_conversation_entry_shapes(self):
+        """Test that DM, group DM and channel entries share one builder."""
+        import lib.slack as slack_module
+        
+        users = {'U1': {'id': 'U1', 'name': 'alice', 'real_name': 'Alice'}}
+        unread = {'has_unreads': True, 'latest': '1700000000.000100'}
+        
+        dm, dm_ts = slack_module._conversation_entry('D1', {'is_im': True, 'user': 'U1'}, unread, users)
+        group, _ = slack_module._conversation_entry('G1', {'is_mpim': True, 'name': 'mpdm-a--b-1'}, {}, users)
+        channel, channel_ts = slack_module._conversation_entry(
+            'C1', {'name': 'general', 'is_member': False, 'updated': 1700000000000}, {}, users, is_channel=True
+        )
+        
+        assert (dm['name'], dm['type'], dm['icon'], dm['unread_count']) == ('Alice', 'dm', 'dm', 1)
+        assert dm_ts == '1700000000.000100'
+        assert (group['type'], group['icon'], group['username']) == ('group_dm', 'group', '')
+        assert (channel['name'], channel['type'], channel['is_member']) == ('#general', 'channel', False)
+        assert float(channel_ts) == 1700000000.0
+
+
 # =============================================================================
 # Test slack_get_conversations_with_unread
 # =============================================================================
@@ -605,6 +1281,14 @@ class TestSlackGetConversationsWithUnread:
 class TestSlackGetConversationHistoryDirect:
     """Test the slack_get_conversation_history_direct function."""
 
+    @pytest.fixture(autouse=True)
+    def reset_self_user_id(self):
+        """Reset the memoized auth.test user ID before each test."""
+        import lib.slack as slack_module
+        slack_module._slack_self_user_id = None
+        yield
+        slack_module._slack_self_user_id = None
+
     @patch('lib.slack.slack_api_call')
     @patch('lib.slack.slack_get_users')
     def test_returns_messages_list(self, mock_users, mock_api_call):
@@ -681,6 +1365,59 @@ class TestSlackGetConversationHistoryDirect:
         assert my_msg['is_me'] == True
         assert other_msg['is_me'] == False
 
+    @patch('lib.slack.slack_api_call')
+    @patch('lib.slack.slack_get_users')
+    def test_calls_auth_test_once(self, mock_users, mock_api_call):
+        """Test that auth.test is memoized across history loads."""
+        from search_server_funcs import slack_get_conversation_history_direct
+        
+        mock_users.return_value = {}
+        history = {'ok': True, 'messages': [{'text': 'Hi', 'user': 'U1', 'ts': '1.0'}]}
+        mock_api_call.side_effect = [history, {'ok': True, 'user_id': 'U1'}, history]
+        
+        slack_get_conversation_history_direct('C123')
+        result = slack_get_conversation_history_direct('C123')
+        
+        methods = [c[0][0] for c in mock_api_call.call_args_list]
+        assert methods.count('auth.test') == 1
+        assert result[0]['is_me'] == True
+
+    @patch('lib.slack.slack_api_call')
+    def test_retries_auth_test_after_failure(self, mock_api_call):
+        """Test that a failed auth.test is not cached."""
+        import lib.slack as slack_module
+        
+        mock_api_call.side_effect = [{'ok': False}, {'ok': True, 'user_id': 'U7'}]
+        
+        assert slack_module.get_slack_self_user_id() is None
+        assert slack_module.get_slack_self_user_id() == 'U7'
+
+    @patch('lib.slack.slack_api_call')
+    @patch('lib.slack.slack_get_users')
+    def test_fetches_users_alongside_history(self, mock_users, mock_api_call):
+        """Test that a slow users fetch overlaps the conversations.history call."""
+        import threading
+        from search_server_funcs import slack_get_conversation_history_direct
+        
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def slow_users():
+            barrier.wait()
+            return {'U1': {'name': 'Ann'}}
+        
+        def fake_api_call(method, params=None, **kwargs):
+            if method == 'conversations.history':
+                barrier.wait()
+                return {'ok': True, 'messages': [{'text': 'Hi', 'user': 'U1', 'ts': '1.0'}]}
+            return {'ok': True, 'user_id': 'U2'}
+        
+        mock_users.side_effect = slow_users
+        mock_api_call.side_effect = fake_api_call
+        
+        result = slack_get_conversation_history_direct('C123')
+        
+        assert result[0]['user'] == 'Ann'
+
     @patch('lib.slack.slack_api_call')
     @patch('lib.slack.slack_get_users')
     def test_reverses_message_order(self, mock_users, mock_api_call):
@@ -785,6 +1522,16 @@ class TestSlackGetThreads:
 class TestSlackGetThreadReplies:
     """Test the slack_get_thread_replies function."""
 
+    @pytest.fixture(autouse=True)
+    def reset_self_user_id(self):
+        """Reset the memoized auth.test user ID and replies cache before each test."""
+        import lib.slack as slack_module
+        slack_module._slack_self_user_id = None
+        slack_module._slack_thread_replies_cache.clear()
+        yield
+        slack_module._slack_self_user_id = None
+        slack_module._slack_thread_replies_cache.clear()
+
     @patch('lib.slack.slack_api_call')
     @patch('lib.slack.slack_get_users')
     def test_returns_thread_messages(self, mock_users, mock_api_call):
@@ -842,6 +1589,56 @@ class TestSlackGetThreadReplies:
         assert root_msg['is_root'] == True
         assert reply_msg['is_root'] == False
 
+    @patch('lib.slack.slack_api_call')
+    @patch('lib.slack.slack_get_users')
+    def test_caches_replies(self, mock_users, mock_api_call):
+        """Test that a thread fetched recently is served from the cache."""
+        from search_server_funcs import slack_get_thread_replies
+        
+        mock_users.return_value = {}
+        mock_api_call.side_effect = [
+            {'ok': True, 'messages': [{'text': 'Root', 'user': 'U1', 'ts': '1.0'}]},
+            {'ok': True, 'user_id': 'U999'}
+        ]
+        
+        first = slack_get_thread_replies('C123', '1.0')
+        second = slack_get_thread_replies('C123', '1.0')
+        
+        assert second is first
+        assert mock_api_call.call_count == 2
+
+    @patch('lib.slack.slack_api_call')
+    @patch('lib.slack.slack_get_users')
+    def test_evicts_least_recently_opened_threads(self, mock_users, mock_api_call):
+        """Test that the replies cache stays bounded and drops the oldest thread first."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_get_thread_replies
+        
+        mock_users.return_value = {}
+        mock_api_call.return_value = {'ok': True, 'user_id': 'U1', 'messages': []}
+        
+        with patch('lib.slack.SLACK_THREAD_REPLIES_CACHE_SIZE', 2):
+            slack_get_thread_replies('C1', '1.0')
+            slack_get_thread_replies('C2', '2.0')
+            slack_get_thread_replies('C1', '1.0')
+            slack_get_thread_replies('C3', '3.0')
+        
+        assert list(slack_module._slack_thread_replies_cache) == [('C1', '1.0', 50), ('C3', '3.0', 50)]
+
+    @patch('lib.slack.slack_api_call')
+    @patch('lib.slack.slack_get_users')
+    def test_does_not_cache_errors(self, mock_users, mock_api_call):
+        """Test that failed fetches are retried on the next call."""
+        from search_server_funcs import slack_get_thread_replies
+        
+        mock_users.return_value = {}
+        mock_api_call.return_value = {'ok': False, 'error': 'ratelimited'}
+        
+        slack_get_thread_replies('C123', '1.0')
+        slack_get_thread_replies('C123', '1.0')
+        
+        assert mock_api_call.call_count == 2
+
 
 # =============================================================================
 # Test slack_send_message_direct
@@ -876,6 +1673,24 @@ class TestSlackSendMessageDirect:
         call_kwargs = mock_api_call.call_args[1]
         assert call_kwargs['post_data']['thread_ts'] == '123.456'
 
+    @patch('lib.slack.slack_api_call')
+    def test_thread_reply_invalidates_cached_replies(self, mock_api_call):
+        """Test that replying to a thread drops its cached replies."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_send_message_direct
+        
+        cache = slack_module._slack_thread_replies_cache
+        cache[('C123', '123.456', 50)] = (time.time(), [])
+        cache[('C123', '999.000', 50)] = (time.time(), [])
+        mock_api_call.return_value = {'ok': True, 'ts': '456.789', 'channel': 'C123'}
+        
+        try:
+            slack_send_message_direct('C123', 'Thread reply', thread_ts='123.456')
+            
+            assert list(cache) == [('C123', '999.000', 50)]
+        finally:
+            cache.clear()
+
     @patch('lib.slack.slack_api_call')
     def test_returns_error_on_failure(self, mock_api_call):
         """Test error handling on send failure."""
@@ -900,6 +1715,35 @@ class TestSlackSendMessageDirect:
         mock_api_call.assert_called_once()
         assert mock_api_call.call_args[0][0] == 'chat.postMessage'
 
+    @patch('lib.slack.slack_api_call')
+    def test_invalidates_unread_counts_cache(self, mock_api_call):
+        """Test that a sent message drops cached unread counts."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_send_message_direct
+        
+        slack_module._slack_counts_cache = {'data': {'ims': [{'id': 'C123'}]}, 'timestamp': time.time()}
+        mock_api_call.return_value = {'ok': True, 'ts': '1.0', 'channel': 'C123'}
+        
+        slack_send_message_direct('C123', 'Test')
+        
+        assert slack_module._slack_counts_cache['data'] is None
+
+    @patch('lib.slack.slack_api_call')
+    def test_keeps_counts_cache_on_failure(self, mock_api_call):
+        """Test that a failed send leaves cached unread counts alone."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_send_message_direct
+        
+        cached = {'data': {'ims': []}, 'timestamp': time.time()}
+        slack_module._slack_counts_cache = cached
+        mock_api_call.return_value = {'ok': False, 'error': 'channel_not_found'}
+        
+        try:
+            slack_send_message_direct('C123', 'Test')
+            assert slack_module._slack_counts_cache is cached
+        finally:
+            slack_module.reset_slack_counts()
+
 
 # =============================================================================
 # Test slack_get_dm_channel_for_user
@@ -1010,6 +1854,26 @@ class TestSlackFindUserByUsername:
         assert result is not None
         assert result['id'] == 'U123'
 
+    @patch('lib.slack._index_users_by_username')
+    def test_uses_cached_username_index(self, mock_index):
+        """Test that the index stored with the users cache is reused."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_find_user_by_username
+        
+        user = {'id': 'U123', 'name': 'John', 'username': 'johndoe'}
+        slack_module._slack_users_cache = {
+            'data': {'U123': user},
+            'by_username': {'johndoe': user},
+            'timestamp': time.time()
+        }
+        try:
+            result = slack_find_user_by_username('@JohnDoe')
+        finally:
+            slack_module._slack_users_cache = {'data': None, 'by_username': None, 'timestamp': 0}
+        
+        assert result is user
+        mock_index.assert_not_called()
+
 
 # =============================================================================
 # Test slack_mark_conversation_read
@@ -1054,6 +1918,19 @@ class TestSlackMarkConversationRead:
             post_data={'channel': 'C123', 'ts': '456.789'}
         )
 
+    @patch('lib.slack.slack_api_call')
+    def test_invalidates_unread_counts_cache(self, mock_api_call):
+        """Test that marking read drops cached unread counts."""
+        import lib.slack as slack_module
+        from search_server_funcs import slack_mark_conversation_read
+        
+        slack_module._slack_counts_cache = {'data': {'ims': [{'id': 'C123'}]}, 'timestamp': time.time()}
+        mock_api_call.return_value = {'ok': True}
+        
+        slack_mark_conversation_read('C123', '456.789')
+        
+        assert slack_module._slack_counts_cache['data'] is None
+
 
 # Module generation removed - handled by generate_test_module.py
 